@@ -0,0 +1,100 @@
+"""Measure p50/p99 of `get_job` with and without request hedging.
+
+Runs against an in-process HTTP server where a small fraction of requests
+stalls, mimicking a bad connection or a slow backend:
+
+    python benchmarks/bench_hedging.py [--requests 2000] [--stall-rate 0.02]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from uuid import uuid4
+
+from bsubio import ApiClient, Configuration, HedgingPolicy, JobsApi
+
+
+def _serve(stall_rate, stall, latency):
+    job = {"id": str(uuid4()), "status": "pending"}
+    payload = json.dumps({"success": True, "data": job}).encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        wbufsize = 1 << 16
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            time.sleep(stall if random.random() < stall_rate else latency)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(host, requests, concurrency, hedging):
+    config = Configuration(host=host)
+    config.hedging = hedging
+    job_id = uuid4()
+
+    def poll(_):
+        started = time.perf_counter()
+        jobs_api.get_job(job_id)
+        return time.perf_counter() - started
+
+    with ApiClient(config) as client, ThreadPoolExecutor(concurrency) as pool:
+        jobs_api = JobsApi(client)
+        return list(pool.map(poll, range(requests)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--stall-rate", type=float, default=0.02)
+    parser.add_argument("--stall", type=float, default=0.5)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    server = _serve(args.stall_rate, args.stall, args.latency)
+    host = "http://127.0.0.1:%d" % server.server_address[1]
+    try:
+        for label, hedging in (
+            ("baseline", None),
+            ("hedged", HedgingPolicy(budget_percent=5, min_samples=50)),
+        ):
+            samples = run(host, args.requests, args.concurrency, hedging)
+            extra = ""
+            if hedging is not None:
+                extra = " hedges=%d won=%d" % (hedging.hedges_sent, hedging.hedges_won)
+            print(
+                "%-8s n=%d p50=%.1fms p99=%.1fms%s" % (
+                    label,
+                    len(samples),
+                    _percentile(samples, 0.50) * 1000,
+                    _percentile(samples, 0.99) * 1000,
+                    extra,
+                )
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Compare p50/p99 latency of concurrent `get_job` polls over HTTP/1.1 and HTTP/2.
+
+Usage:
+
+    BSUB_API_KEY=... python benchmarks/bench_http2_polls.py JOB_ID \
+        [--concurrency 1000] [--rounds 3]
+
+The target host defaults to production and can be overridden with
+BSUB_BASE_URL. HTTP/2 needs the optional extra: `pip install bsubio[http2]`.
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bsubio import ApiClient, Configuration, JobsApi
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def run(job_id, concurrency, rounds, http2):
+    host = os.getenv("BSUB_BASE_URL")
+    config = Configuration(host=host) if host else Configuration()
+    config.access_token = os.environ["BSUB_API_KEY"]
+    config.http2 = http2
+    config.connection_pool_maxsize = concurrency if not http2 else 8
+
+    def poll(_):
+        started = time.perf_counter()
+        jobs_api.get_job(job_id)
+        return time.perf_counter() - started
+
+    samples = []
+    with ApiClient(config) as client, ThreadPoolExecutor(concurrency) as pool:
+        jobs_api = JobsApi(client)
+        jobs_api.get_job(job_id)  # warm up DNS, TLS and the pool
+        for _ in range(rounds):
+            samples.extend(pool.map(poll, range(concurrency)))
+
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("job_id")
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    for label, http2 in (("HTTP/1.1", False), ("HTTP/2", True)):
+        samples = run(args.job_id, args.concurrency, args.rounds, http2)
+        print(
+            "%-8s n=%d p50=%.1fms p99=%.1fms mean=%.1fms" % (
+                label,
+                len(samples),
+                _percentile(samples, 0.50) * 1000,
+                _percentile(samples, 0.99) * 1000,
+                statistics.mean(samples) * 1000,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Measure the import time and memory of the package and its API modules.
+
+Each sample imports `bsubio` in a fresh interpreter, after preloading its
+third-party dependencies so that only the package itself is measured:
+
+    python benchmarks/bench_import.py [--runs 15]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# tracemalloc slows imports down, so time and memory are separate runs
+_PROBE = """
+import json, resource, sys, time, tracemalloc
+import dateutil.parser, pydantic, typing_extensions, urllib3
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+if sys.argv[1] == 'memory':
+    tracemalloc.start()
+started = time.perf_counter()
+import bsubio
+elapsed = time.perf_counter() - started
+allocated = tracemalloc.get_traced_memory()[0]
+print(json.dumps({
+    'seconds': elapsed,
+    'allocated': allocated,
+    'rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss,
+}))
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=15)
+    args = parser.parse_args()
+
+    def sample(kind):
+        return [
+            json.loads(subprocess.check_output([sys.executable, "-c", _PROBE, kind]))
+            for _ in range(args.runs)
+        ]
+
+    timed = sample("time")
+    traced = sample("memory")
+    print("import bsubio: %.1fms (median of %d)" % (
+        1e3 * statistics.median(s["seconds"] for s in timed), args.runs
+    ))
+    print("max RSS growth: %.0f KiB" % statistics.median(s["rss"] for s in timed))
+    print("retained allocations: %.0f KiB" % (
+        statistics.median(s["allocated"] for s in traced) / 1024
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Measure the cost of building `Job` objects for status-only polling.
+
+Each variant turns the dict of one job (as found in a `get_job` or
+`list_jobs` response) into an object and reads its ``id`` and ``status``:
+
+    python benchmarks/bench_job_parsing.py [--jobs 20000]
+"""
+
+import argparse
+import time
+from uuid import uuid4
+
+from bsubio.lazyjob import job_builder
+
+
+def _time(function, items, rounds=5):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        best = min(best, (time.perf_counter() - started) / len(items))
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=20000)
+    args = parser.parse_args()
+
+    jobs = [
+        {
+            "id": str(uuid4()),
+            "status": "processing",
+            "type": "pdf-extract",
+            "user_id": "user-1",
+            "data_size": 1 << 20,
+            "claimed_by": "worker-7",
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-01-01T00:00:30Z",
+            "claimed_at": "2024-01-01T00:00:10Z",
+        }
+        for _ in range(args.jobs)
+    ]
+    variants = [
+        ("Job.from_dict", job_builder()),
+        ("fields=(id, status)", job_builder(("id", "status"))),
+        ("LazyJob", job_builder(lazy=True)),
+    ]
+
+    def poll(build):
+        def read(raw):
+            job = build(raw)
+            return job.id, job.status
+        return read
+
+    baseline = None
+    print("%-22s %10s %8s" % ("variant", "per job", "speedup"))
+    for name, build in variants:
+        seconds = _time(poll(build), jobs)
+        baseline = baseline or seconds
+        print("%-22s %8.2fus %7.1fx" % (name, seconds * 1e6, baseline / seconds))
+
+
+if __name__ == "__main__":
+    main()
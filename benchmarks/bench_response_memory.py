@@ -0,0 +1,123 @@
+"""Measure the memory used while deserializing large responses.
+
+A middleware answers `list_jobs` with a full page of jobs carrying long
+error messages and `get_job_logs` with a multi-megabyte log, read from a
+socket-like stream on every call; `list_jobs_stream` consumes the same
+page one job at a time. For each call the script reports the tracemalloc
+peak while the call runs and what is still allocated while the caller
+holds the result:
+
+    python benchmarks/bench_response_memory.py [--log-mib 16] [--message-kib 64]
+"""
+
+import argparse
+import io
+import json
+import tracemalloc
+from uuid import uuid4
+
+import urllib3
+
+from bsubio import ApiClient, Configuration, JobsApi, Middleware, OutputApi
+from bsubio.rest import RESTResponse
+
+
+class _Socket(io.RawIOBase):
+    """Returns freshly allocated bytes like a socket file (BytesIO would
+    hand back its shared buffer)."""
+
+    def __init__(self, data):
+        self._view = memoryview(data)
+        self._position = 0
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else self._position + size
+        chunk = bytes(self._view[self._position:end])
+        self._position += len(chunk)
+        return chunk
+
+    def readinto(self, buffer):
+        chunk = self.read(len(buffer))
+        buffer[:len(chunk)] = chunk
+        return len(chunk)
+
+
+class CannedResponses(Middleware):
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def handle(self, request, call_next):
+        content_type, body = self.payloads[request.operation.name]
+        return RESTResponse(urllib3.HTTPResponse(
+            body=_Socket(body), status=200, preload_content=False,
+            headers={"Content-Type": content_type, "Content-Length": str(len(body))},
+        ))
+
+
+def _measure(function):
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = function()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak - baseline, current - baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--log-mib", type=int, default=16)
+    parser.add_argument("--message-kib", type=int, default=64)
+    args = parser.parse_args()
+
+    jobs = [
+        {
+            "id": str(uuid4()),
+            "type": "pdf-extract",
+            "status": "failed",
+            "data_size": 1 << 20,
+            "error_message": "x" * (args.message_kib << 10),
+            "created_at": "2024-01-01T00:00:00Z",
+            "finished_at": "2024-01-01T00:01:00Z",
+        }
+        for _ in range(100)
+    ]
+    page = json.dumps({"success": True, "data": {"jobs": jobs, "total": len(jobs)}}).encode()
+    log = b"line of worker output\n" * ((args.log_mib << 20) // 22)
+
+    config = Configuration(host="http://bench.invalid/v1", access_token="token")
+    config.middleware = [CannedResponses({
+        "list_jobs": ("application/json", page),
+        "get_job_logs": ("text/plain; charset=utf-8", log),
+    })]
+
+    with ApiClient(config) as client:
+        jobs_api = JobsApi(client)
+        output_api = OutputApi(client)
+        calls = [
+            ("list_jobs", len(page), lambda: jobs_api.list_jobs(limit=100)),
+            (
+                "list_jobs_with_http_info", len(page),
+                lambda: jobs_api.list_jobs_with_http_info(limit=100),
+            ),
+            (
+                "list_jobs_stream", len(page),
+                lambda: sum(1 for _ in jobs_api.list_jobs_stream(limit=100)),
+            ),
+            ("get_job_logs", len(log), lambda: output_api.get_job_logs(uuid4())),
+        ]
+        print("%-26s %10s %10s %10s" % ("call", "body", "peak", "retained"))
+        for name, size, call in calls:
+            call()
+            peak, retained = _measure(call)
+            print("%-26s %8.1fMB %8.1fMB %8.1fMB" % (name, size / 1e6, peak / 1e6, retained / 1e6))
+
+
+if __name__ == "__main__":
+    main()
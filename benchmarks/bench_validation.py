@@ -0,0 +1,70 @@
+"""Measure the per-call cost of argument validation on `get_job` and `submit_job`.
+
+The network is taken out of the picture by a middleware answering every
+request with a canned response, so the numbers are the client-side CPU time
+of one call with `validate_call` (`jobs_api.get_job`) and without it
+(`jobs_api.raw.get_job`):
+
+    python benchmarks/bench_validation.py [--calls 20000]
+"""
+
+import argparse
+import json
+import time
+from uuid import uuid4
+
+import urllib3
+
+from bsubio import ApiClient, Configuration, JobsApi, Middleware
+from bsubio.rest import RESTResponse
+
+
+class CannedResponses(Middleware):
+    def __init__(self, payloads):
+        self.payloads = payloads
+
+    def handle(self, request, call_next):
+        body = self.payloads[request.operation.name]
+        return RESTResponse(urllib3.HTTPResponse(
+            body=body, status=200, headers={"Content-Type": "application/json"}
+        ))
+
+
+def _time(function, calls, rounds=5):
+    for _ in range(min(calls, 1000)):
+        function()
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(calls):
+            function()
+        best = min(best, (time.perf_counter() - started) / calls)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    job_id = uuid4()
+    job = {"id": str(job_id), "status": "pending", "type": "passthru", "data_size": 1024}
+    config = Configuration(host="http://bench.invalid/v1", access_token="token")
+    config.middleware = [CannedResponses({
+        "get_job": json.dumps({"success": True, "data": job}).encode(),
+        "submit_job": json.dumps({"success": True, "message": "submitted"}).encode(),
+    })]
+
+    with ApiClient(config) as client:
+        jobs_api = JobsApi(client)
+        print("%-12s %12s %12s %10s" % ("operation", "validated", "raw", "saved"))
+        for name in ("get_job", "submit_job"):
+            validated = _time(lambda: getattr(jobs_api, name)(job_id), args.calls)
+            raw = _time(lambda: getattr(jobs_api.raw, name)(job_id), args.calls)
+            print("%-12s %10.1fus %10.1fus %9.0f%%" % (
+                name, validated * 1e6, raw * 1e6, 100.0 * (validated - raw) / validated
+            ))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,8 @@
     REST API for batch processing compute-intensive workloads.  Submit jobs, upload data, and retrieve results through a simple API. Perfect for PDF processing, video transcoding, audio transcription, and more.  ## Authentication  All endpoints require Bearer token authentication using your API key:  ``` Authorization: Bearer <your-api-key> ```  Get your API key from the [Dashboard](/).  ## Job Lifecycle  1. **Create** a job with `POST /v1/jobs` - Returns job ID and upload token 2. **Upload** data with `POST /v1/upload/{jobId}` - Uses upload token 3. **Submit** for processing with `POST /v1/jobs/{jobId}/submit` 4. **Monitor** status with `GET /v1/jobs/{jobId}` 5. **Retrieve** output with `GET /v1/jobs/{jobId}/output`  ## Job States  - `created` - Job created, awaiting data upload - `loaded` - Data uploaded successfully - `pending` - Waiting in queue for a worker - `claimed` - Worker claimed the job - `preparing` - Worker preparing to process - `processing` - Processing started - `finished` - Processing completed successfully - `failed` - Processing failed with error 
 
     The version of the OpenAPI document: 1.0.0
-    Generated by OpenAPI Generator (https://openapi-generator.tech)
-
-    Do not edit the class manually.
+    Generated by OpenAPI Generator (https://openapi-generator.tech), since
+    maintained by hand; listed in .openapi-generator-ignore.
 """  # noqa: E501
 
 
@@ -30,6 +29,32 @@ __all__ = [
     "ApiKeyError",
     "ApiAttributeError",
     "ApiException",
+    "CircuitOpenException",
+    "AdaptiveConcurrencyLimiter",
+    "AdmissionController",
+    "CachedProcessor",
+    "CircuitBreaker",
+    "CircuitBreakerRegistry",
+    "DurationPredictor",
+    "FileTokenBucket",
+    "HedgingPolicy",
+    "JobLifecycle",
+    "JobMirror",
+    "JobTracer",
+    "LazyJob",
+    "JobWaiter",
+    "LogHistogram",
+    "MetricsRegistry",
+    "Middleware",
+    "RateLimiter",
+    "RawApi",
+    "RequestCoalescer",
+    "RequestLogger",
+    "ResultCache",
+    "TokenBucket",
+    "RetryBudget",
+    "RetryEngine",
+    "RetryPolicy",
     "CancelJob200Response",
     "CreateJob201Response",
     "CreateJobRequest",
@@ -62,6 +87,32 @@ from bsubio.exceptions import ApiValueError as ApiValueError
 from bsubio.exceptions import ApiKeyError as ApiKeyError
 from bsubio.exceptions import ApiAttributeError as ApiAttributeError
 from bsubio.exceptions import ApiException as ApiException
+from bsubio.exceptions import CircuitOpenException as CircuitOpenException
+from bsubio.admission import AdmissionController as AdmissionController
+from bsubio.analytics import JobLifecycle as JobLifecycle
+from bsubio.circuit import CircuitBreaker as CircuitBreaker
+from bsubio.circuit import CircuitBreakerRegistry as CircuitBreakerRegistry
+from bsubio.concurrency import AdaptiveConcurrencyLimiter as AdaptiveConcurrencyLimiter
+from bsubio.hedging import HedgingPolicy as HedgingPolicy
+from bsubio.lazyjob import LazyJob as LazyJob
+from bsubio.metrics import LogHistogram as LogHistogram
+from bsubio.metrics import MetricsRegistry as MetricsRegistry
+from bsubio.middleware import Middleware as Middleware
+from bsubio.mirror import JobMirror as JobMirror
+from bsubio.predictor import DurationPredictor as DurationPredictor
+from bsubio.ratelimit import FileTokenBucket as FileTokenBucket
+from bsubio.ratelimit import RateLimiter as RateLimiter
+from bsubio.ratelimit import TokenBucket as TokenBucket
+from bsubio.rawapi import RawApi as RawApi
+from bsubio.coalescing import RequestCoalescer as RequestCoalescer
+from bsubio.requestlog import RequestLogger as RequestLogger
+from bsubio.resultcache import CachedProcessor as CachedProcessor
+from bsubio.resultcache import ResultCache as ResultCache
+from bsubio.retry import RetryBudget as RetryBudget
+from bsubio.retry import RetryEngine as RetryEngine
+from bsubio.retry import RetryPolicy as RetryPolicy
+from bsubio.tracing import JobTracer as JobTracer
+from bsubio.waiter import JobWaiter as JobWaiter
 
 # import models into sdk package
 from bsubio.models.cancel_job200_response import CancelJob200Response as CancelJob200Response
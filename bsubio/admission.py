@@ -0,0 +1,162 @@
+"""Queue-depth-aware admission control for job submission.
+
+Submitting a large batch at once parks everything in ``pending`` and delays
+unrelated, latency-sensitive work queued behind it. An
+:class:`AdmissionController` samples the server-side backlog through
+``list_jobs(status='pending')`` (the ``total`` field of
+`ListJobs200ResponseData`) and holds `submit_job` calls locally while that
+backlog is at or above `max_pending`. High-priority submissions use their
+own, larger threshold so they can still get through while bulk work waits.
+
+Jobs can still be created and uploaded while held: only the submission,
+which is what puts them in the queue, is delayed.
+
+Submissions admitted locally are added to the sampled backlog until a
+sample sent after the submission completed could have counted them, and
+no submission is admitted before the first sample has arrived.
+"""
+
+import itertools
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from bsubio.api.jobs_api import JobsApi
+
+
+class AdmissionController:
+    """Holds `submit_job` calls while the pending backlog is too deep.
+
+    :param jobs_api: API used both to sample the backlog and to submit.
+    :param max_pending: backlog at which normal submissions are held.
+    :param high_priority_max_pending: backlog at which high-priority
+        submissions are held; None never holds them.
+    :param sample_interval: minimum number of seconds between two backlog
+        samples. Submissions the last sample cannot have counted yet are
+        added to the sampled value so that concurrent callers do not
+        overshoot.
+    """
+
+    def __init__(
+        self,
+        jobs_api: JobsApi,
+        max_pending: int,
+        high_priority_max_pending: Optional[int] = None,
+        sample_interval: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.jobs_api = jobs_api
+        self.max_pending = max_pending
+        self.high_priority_max_pending = high_priority_max_pending
+        self.sample_interval = sample_interval
+        self._clock = clock
+        self._sampled_pending = 0
+        # admission -> when its submission completed (None: in flight)
+        self._unsampled: Dict[int, Optional[float]] = {}
+        self._admissions = itertools.count()
+        self._sampled_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._sample_lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+
+    def sample(self) -> int:
+        """Fetches the current server-side pending count."""
+        started = self._clock()
+        response = self.jobs_api.list_jobs(status='pending', limit=1)
+        data = response.data
+        total = data.total if data is not None else None
+        if total is None:
+            total = len(data.jobs or []) if data is not None else 0
+        with self._lock:
+            self._sampled_pending = total
+            self._unsampled = {
+                admission: completed
+                for admission, completed in self._unsampled.items()
+                if completed is None or completed > started
+            }
+            self._sampled_at = self._clock()
+            self._wakeup.notify_all()
+        return total
+
+    @property
+    def estimated_pending(self) -> int:
+        """Last sampled backlog plus submissions it cannot have counted."""
+        with self._lock:
+            return self._sampled_pending + len(self._unsampled)
+
+    def _refresh(self) -> None:
+        sampled_at = self._sampled_at
+        if sampled_at is not None and self._clock() - sampled_at < self.sample_interval:
+            return
+        # one thread samples; the others keep using the previous value, or
+        # wait in `_admit` for the first one
+        if self._sample_lock.acquire(blocking=False):
+            try:
+                self.sample()
+            finally:
+                self._sample_lock.release()
+                with self._lock:
+                    self._wakeup.notify_all()
+
+    def admit(self, high_priority: bool = False, timeout: Optional[float] = None) -> None:
+        """Blocks until a submission of the given priority may proceed.
+
+        The submission is assumed to be sent right away; it is counted
+        until a backlog sample taken after this call returns.
+
+        :raises TimeoutError: if the backlog stays too deep for `timeout`
+            seconds.
+        """
+        admission = self._admit(high_priority, timeout)
+        self._submitted(admission)
+
+    def _admit(self, high_priority: bool, timeout: Optional[float]) -> Optional[int]:
+        limit = self.high_priority_max_pending if high_priority else self.max_pending
+        if limit is None:
+            # never held, so never sampling either; not counted
+            return None
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            self._refresh()
+            with self._lock:
+                pending = self._sampled_pending + len(self._unsampled)
+                sampled = self._sampled_at is not None
+                if sampled and pending < limit:
+                    admission = next(self._admissions)
+                    self._unsampled[admission] = None
+                    return admission
+                wait = self.sample_interval
+                if deadline is not None:
+                    remaining = deadline - self._clock()
+                    if remaining <= 0:
+                        if not sampled:
+                            raise TimeoutError("pending backlog was not sampled in time")
+                        raise TimeoutError(
+                            "pending backlog of %d jobs did not drop below %d"
+                            % (pending, limit)
+                        )
+                    wait = min(wait, remaining)
+                self._wakeup.wait(wait)
+
+    def _submitted(self, admission: Optional[int]) -> None:
+        if admission is None:
+            return
+        with self._lock:
+            self._unsampled[admission] = self._clock()
+
+    def submit_job(
+        self,
+        job_id,
+        high_priority: bool = False,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ):
+        """Admits and then submits `job_id`.
+
+        Extra keyword arguments are passed to `JobsApi.submit_job`.
+        """
+        admission = self._admit(high_priority, timeout)
+        try:
+            return self.jobs_api.submit_job(job_id, **kwargs)
+        finally:
+            self._submitted(admission)
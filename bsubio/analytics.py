@@ -0,0 +1,227 @@
+"""Job lifecycle latency analytics.
+
+:class:`JobLifecycle` turns the timestamps carried by `Job` objects (from
+`list_jobs` or a local mirror) into columns of durations and reports
+percentiles broken down by processing `type` and by `data_size` bucket:
+
+* ``queue_wait`` – ``created_at`` → ``claimed_at``. `Job` has no
+  submission timestamp, so this includes the time spent uploading before
+  `submit_job`;
+* ``processing`` – ``claimed_at`` → ``finished_at``;
+* ``end_to_end`` – ``created_at`` → ``finished_at``.
+
+Jobs missing a timestamp contribute NaN to the affected columns and are
+ignored by the statistics. Computations are vectorized with numpy when it
+is installed and fall back to pure Python otherwise.
+"""
+
+import bisect
+import datetime
+import importlib
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# imported by name so that type checking does not depend on numpy being
+# installed
+numpy: Any
+try:
+    numpy = importlib.import_module('numpy')
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None
+
+METRICS = ('queue_wait', 'processing', 'end_to_end')
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+
+DEFAULT_SIZE_BUCKETS = (
+    1 << 10,
+    1 << 16,
+    1 << 20,
+    1 << 24,
+    1 << 28,
+    1 << 30,
+)
+"""Upper bounds (exclusive) of the `data_size` buckets, in bytes."""
+
+
+def _format_size(size: int) -> str:
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB'):
+        if size < 1024 or unit == 'TiB':
+            return '%d%s' % (size, unit)
+        size //= 1024
+    return '%dB' % size
+
+
+def size_bucket_labels(bounds: Sequence[int] = DEFAULT_SIZE_BUCKETS) -> List[str]:
+    """Returns the label of every bucket, e.g. ``'64KiB-1MiB'``."""
+    labels = ['<' + _format_size(bounds[0])]
+    for low, high in zip(bounds, bounds[1:]):
+        labels.append('%s-%s' % (_format_size(low), _format_size(high)))
+    labels.append('>=' + _format_size(bounds[-1]))
+    return labels
+
+
+def _field(job: Any, name: str) -> Any:
+    if isinstance(job, dict):
+        return job.get(name)
+    return getattr(job, name, None)
+
+
+def _epoch(value: Any) -> float:
+    if value is None:
+        return math.nan
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    # linear interpolation, identical to numpy's default method
+    if not ordered:
+        return math.nan
+    rank = (len(ordered) - 1) * q / 100.0
+    low = math.floor(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class JobLifecycle:
+    """Lifecycle durations of many jobs, in seconds.
+
+    :param jobs: `Job` models or dicts with the same keys (datetimes or ISO
+        8601 strings).
+    :param size_buckets: upper bounds of the `data_size` buckets.
+    :param include_failed: whether failed jobs count towards the
+        statistics; jobs in other states only contribute the phases they
+        completed.
+    """
+
+    def __init__(
+        self,
+        jobs: Iterable[Any],
+        size_buckets: Sequence[int] = DEFAULT_SIZE_BUCKETS,
+        include_failed: bool = True,
+    ) -> None:
+        self.size_buckets = tuple(size_buckets)
+        self.size_labels = size_bucket_labels(self.size_buckets)
+        types: List[str] = []
+        sizes: List[str] = []
+        created: List[float] = []
+        claimed: List[float] = []
+        finished: List[float] = []
+        for job in jobs:
+            if not include_failed and _field(job, 'status') == 'failed':
+                continue
+            types.append(_field(job, 'type') or 'unknown')
+            size = _field(job, 'data_size')
+            sizes.append(
+                'unknown' if size is None
+                else self.size_labels[bisect.bisect_right(self.size_buckets, size)]
+            )
+            created.append(_epoch(_field(job, 'created_at')))
+            claimed.append(_epoch(_field(job, 'claimed_at')))
+            finished.append(_epoch(_field(job, 'finished_at')))
+        self.types = types
+        self.size_groups = sizes
+        self.finished_at = finished
+        if numpy is not None:
+            created_a = numpy.array(created, dtype=float)
+            claimed_a = numpy.array(claimed, dtype=float)
+            finished_a = numpy.array(finished, dtype=float)
+            self.columns = {
+                'queue_wait': claimed_a - created_a,
+                'processing': finished_a - claimed_a,
+                'end_to_end': finished_a - created_a,
+            }
+        else:
+            self.columns = {
+                'queue_wait': [b - a for a, b in zip(created, claimed)],
+                'processing': [b - a for a, b in zip(claimed, finished)],
+                'end_to_end': [b - a for a, b in zip(created, finished)],
+            }
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def _groups(self, by: Optional[str]) -> Dict[str, List[int]]:
+        if by is None:
+            return {'all': list(range(len(self.types)))}
+        keys = {'type': self.types, 'size': self.size_groups}.get(by)
+        if keys is None:
+            raise ValueError("by must be None, 'type' or 'size', got %r" % (by,))
+        groups: Dict[str, List[int]] = {}
+        for index, key in enumerate(keys):
+            groups.setdefault(key, []).append(index)
+        return groups
+
+    def _stats(self, column, indices: List[int], percentiles: Sequence[float]) -> Dict[str, float]:
+        if numpy is not None:
+            values = column[indices] if indices else column[:0]
+            values = values[~numpy.isnan(values)]
+            if not len(values):
+                return {'count': 0}
+            result = {'count': int(len(values)), 'mean': float(values.mean())}
+            for q, value in zip(percentiles, numpy.percentile(values, percentiles)):
+                result['p%g' % q] = float(value)
+            return result
+        values = sorted(v for v in (column[i] for i in indices) if not math.isnan(v))
+        if not values:
+            return {'count': 0}
+        result = {'count': len(values), 'mean': sum(values) / len(values)}
+        for q in percentiles:
+            result['p%g' % q] = _percentile(values, q)
+        return result
+
+    def percentiles(
+        self,
+        metric: str,
+        by: Optional[str] = None,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    ) -> Dict[str, Dict[str, float]]:
+        """Returns count, mean and percentiles of `metric` per group.
+
+        :param metric: ``'queue_wait'``, ``'processing'`` or ``'end_to_end'``.
+        :param by: None for a single ``'all'`` group, ``'type'`` or
+            ``'size'`` (`data_size` bucket).
+        """
+        column = self.columns[metric]
+        return {
+            key: self._stats(column, indices, percentiles)
+            for key, indices in sorted(self._groups(by).items())
+        }
+
+    def throughput(self, by: Optional[str] = None) -> Dict[str, float]:
+        """Returns finished jobs per second per group, measured between the
+        first and last ``finished_at`` of the group (NaN below two jobs)."""
+        result = {}
+        for key, indices in sorted(self._groups(by).items()):
+            finished = [
+                self.finished_at[i] for i in indices if not math.isnan(self.finished_at[i])
+            ]
+            span = max(finished) - min(finished) if len(finished) > 1 else 0.0
+            result[key] = (len(finished) - 1) / span if span > 0 else math.nan
+        return result
+
+    def summary(
+        self,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Returns every metric overall, by type and by size bucket."""
+        report: Dict[str, Dict[str, Any]] = {}
+        for by, name in ((None, 'overall'), ('type', 'by_type'), ('size', 'by_size')):
+            report[name] = {
+                metric: self.percentiles(metric, by, percentiles) for metric in METRICS
+            }
+            report[name]['throughput'] = self.throughput(by)
+        return report
+
+
+def lifecycle_summary(
+    jobs: Iterable[Any],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    size_buckets: Sequence[int] = DEFAULT_SIZE_BUCKETS,
+) -> Dict[str, Dict[str, Any]]:
+    """Shortcut for ``JobLifecycle(jobs, size_buckets).summary(percentiles)``."""
+    return JobLifecycle(jobs, size_buckets).summary(percentiles)
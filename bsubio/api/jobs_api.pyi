@@ -0,0 +1,272 @@
+from uuid import UUID
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from typing_extensions import Buffer
+
+from bsubio.models.cancel_job200_response import CancelJob200Response
+from bsubio.models.create_job201_response import CreateJob201Response
+from bsubio.models.create_job_request import CreateJobRequest
+from bsubio.models.job import Job
+from bsubio.models.list_jobs200_response import ListJobs200Response
+from bsubio.models.submit_job200_response import SubmitJob200Response
+from bsubio.models.upload_job_data200_response import UploadJobData200Response
+
+from bsubio.api_client import ApiClient
+from bsubio.api_response import ApiResponse
+from bsubio.lazyjob import LazyJob
+from bsubio.rawapi import RawApi
+from bsubio.rest import RESTResponseType
+from bsubio.streaming import JobStream
+
+
+class JobsApi:
+    api_client: ApiClient
+
+    def __init__(self, api_client: Optional[ApiClient] = None) -> None: ...
+
+    @property
+    def raw(self) -> RawApi: ...
+
+    def cancel_job(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> CancelJob200Response: ...
+
+    def cancel_job_with_http_info(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[CancelJob200Response]: ...
+
+    def cancel_job_without_preload_content(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def create_job(
+        self,
+        create_job_request: CreateJobRequest,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> CreateJob201Response: ...
+
+    def create_job_with_http_info(
+        self,
+        create_job_request: CreateJobRequest,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[CreateJob201Response]: ...
+
+    def create_job_without_preload_content(
+        self,
+        create_job_request: CreateJobRequest,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def delete_job(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> None: ...
+
+    def delete_job_with_http_info(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[None]: ...
+
+    def delete_job_without_preload_content(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def get_job(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> CreateJob201Response: ...
+
+    def get_job_with_http_info(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[CreateJob201Response]: ...
+
+    def get_job_without_preload_content(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def list_jobs(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ListJobs200Response: ...
+
+    def list_jobs_with_http_info(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[ListJobs200Response]: ...
+
+    def list_jobs_without_preload_content(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def submit_job(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> SubmitJob200Response: ...
+
+    def submit_job_with_http_info(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[SubmitJob200Response]: ...
+
+    def submit_job_without_preload_content(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def upload_job_data(
+        self,
+        job_id: UUID,
+        token: str,
+        file: Union[str, Tuple[str, Buffer], Buffer],
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> UploadJobData200Response: ...
+
+    def upload_job_data_with_http_info(
+        self,
+        job_id: UUID,
+        token: str,
+        file: Union[str, Tuple[str, Buffer], Buffer],
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[UploadJobData200Response]: ...
+
+    def upload_job_data_without_preload_content(
+        self,
+        job_id: UUID,
+        token: str,
+        file: Union[str, Tuple[str, Buffer], Buffer],
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def get_job_projected(
+        self,
+        job_id: UUID,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> Union[Job, LazyJob, None]: ...
+
+    def list_jobs_stream(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+        lazy: bool = False,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> JobStream: ...
@@ -0,0 +1,99 @@
+from uuid import UUID
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+from bsubio.api_client import ApiClient
+from bsubio.api_response import ApiResponse
+from bsubio.rawapi import RawApi
+from bsubio.rest import RESTResponseType
+
+
+class OutputApi:
+    api_client: ApiClient
+
+    def __init__(self, api_client: Optional[ApiClient] = None) -> None: ...
+
+    @property
+    def raw(self) -> RawApi: ...
+
+    def get_job_logs(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> str: ...
+
+    def get_job_logs_with_http_info(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[str]: ...
+
+    def get_job_logs_without_preload_content(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def get_job_output(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> bytearray: ...
+
+    def get_job_output_with_http_info(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[bytearray]: ...
+
+    def get_job_output_without_preload_content(
+        self,
+        job_id: UUID,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def get_job_output_into(
+        self,
+        job_id: UUID,
+        buffer: Any,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> int: ...
+
+    def get_job_output_mmap(
+        self,
+        job_id: UUID,
+        path: Optional[str] = None,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> memoryview: ...
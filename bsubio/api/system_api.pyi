@@ -0,0 +1,72 @@
+from typing import Any, Dict, Optional, Tuple, Union
+
+from bsubio.models.get_types200_response import GetTypes200Response
+from bsubio.models.get_version200_response import GetVersion200Response
+
+from bsubio.api_client import ApiClient
+from bsubio.api_response import ApiResponse
+from bsubio.rawapi import RawApi
+from bsubio.rest import RESTResponseType
+
+
+class SystemApi:
+    api_client: ApiClient
+
+    def __init__(self, api_client: Optional[ApiClient] = None) -> None: ...
+
+    @property
+    def raw(self) -> RawApi: ...
+
+    def get_types(
+        self,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> GetTypes200Response: ...
+
+    def get_types_with_http_info(
+        self,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[GetTypes200Response]: ...
+
+    def get_types_without_preload_content(
+        self,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
+
+    def get_version(
+        self,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> GetVersion200Response: ...
+
+    def get_version_with_http_info(
+        self,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> ApiResponse[GetVersion200Response]: ...
+
+    def get_version_without_preload_content(
+        self,
+        _request_timeout: Union[None, float, Tuple[float, float]] = None,
+        _request_auth: Optional[Dict[str, Any]] = None,
+        _content_type: Optional[str] = None,
+        _headers: Optional[Dict[str, Any]] = None,
+        _host_index: int = 0,
+    ) -> RESTResponseType: ...
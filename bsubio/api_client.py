@@ -6,12 +6,12 @@
     REST API for batch processing compute-intensive workloads.  Submit jobs, upload data, and retrieve results through a simple API. Perfect for PDF processing, video transcoding, audio transcription, and more.  ## Authentication  All endpoints require Bearer token authentication using your API key:  ``` Authorization: Bearer <your-api-key> ```  Get your API key from the [Dashboard](/).  ## Job Lifecycle  1. **Create** a job with `POST /v1/jobs` - Returns job ID and upload token 2. **Upload** data with `POST /v1/upload/{jobId}` - Uses upload token 3. **Submit** for processing with `POST /v1/jobs/{jobId}/submit` 4. **Monitor** status with `GET /v1/jobs/{jobId}` 5. **Retrieve** output with `GET /v1/jobs/{jobId}/output`  ## Job States  - `created` - Job created, awaiting data upload - `loaded` - Data uploaded successfully - `pending` - Waiting in queue for a worker - `claimed` - Worker claimed the job - `preparing` - Worker preparing to process - `processing` - Processing started - `finished` - Processing completed successfully - `failed` - Processing failed with error 
 
     The version of the OpenAPI document: 1.0.0
-    Generated by OpenAPI Generator (https://openapi-generator.tech)
-
-    Do not edit the class manually.
+    Generated by OpenAPI Generator (https://openapi-generator.tech), since
+    maintained by hand; listed in .openapi-generator-ignore.
 """  # noqa: E501
 
 
+import asyncio
 import datetime
 from dateutil.parser import parse
 from enum import Enum
@@ -21,16 +21,27 @@ import mimetypes
 import os
 import re
 import tempfile
+import time
 import uuid
 
 from urllib.parse import quote
-from typing import Tuple, Optional, List, Dict, Union
+from typing import Any, Tuple, Optional, List, Dict, Union
 from pydantic import SecretStr
 
 from bsubio.configuration import Configuration
 from bsubio.api_response import ApiResponse, T as ApiResponseT
 import bsubio.models
 from bsubio import rest
+from bsubio.coalescing import request_key, wait_timeout
+from bsubio.middleware import (
+    Request,
+    builtin_middleware,
+    compile_async_chain,
+    compile_chain,
+    compile_deserialize_chain,
+)
+from bsubio.multipart import map_file
+from bsubio.operations import resolve_operation
 from bsubio.exceptions import (
     ApiValueError,
     ApiException,
@@ -85,7 +96,23 @@ class ApiClient:
             configuration = Configuration.get_default()
         self.configuration = configuration
 
-        self.rest_client = rest.RESTClientObject(configuration)
+        self.rest_client: Union[rest.RESTClientObject, rest.HTTP2RESTClientObject]
+        if configuration.http2:
+            self.rest_client = rest.HTTP2RESTClientObject(configuration)
+        else:
+            self.rest_client = rest.RESTClientObject(configuration)
+        if configuration.metrics is not None:
+            configuration.metrics.bind_pool_manager(self.rest_client.pool_manager)
+        self.middleware = list(configuration.middleware) + builtin_middleware(configuration)
+        self._chain = None
+        self._deserialize_chain = None
+        if self.middleware:
+            self._chain = compile_chain(self.middleware, self._send)
+            self._deserialize_chain = compile_deserialize_chain(
+                self.middleware, self._response_deserialize
+            )
+        self._async_chain = compile_async_chain(self.middleware, self._send)
+        self.coalescer = configuration.coalescing
         self.default_headers = {}
         if header_name is not None:
             self.default_headers[header_name] = header_value
@@ -93,6 +120,7 @@ class ApiClient:
         # Set default User-Agent.
         self.user_agent = 'OpenAPI-Generator/1.0.0/python'
         self.client_side_validation = configuration.client_side_validation
+        self._auth_settings_cache: Optional[Tuple[Any, Dict[str, Any]]] = None
 
     def __enter__(self):
         return self
@@ -103,6 +131,8 @@ class ApiClient:
         pool_manager = getattr(self.rest_client, "pool_manager", None)
         if pool_manager and hasattr(pool_manager, "clear"):
             pool_manager.clear()
+        elif pool_manager and hasattr(pool_manager, "close"):
+            pool_manager.close()
 
     @property
     def user_agent(self):
@@ -251,6 +281,81 @@ class ApiClient:
 
         return method, url, header_params, body, post_params
 
+    def serialize_template(
+        self,
+        template,
+        path_params=None,
+        query_params=None,
+        header_params=None,
+        body=None,
+        files=None,
+        content_type=None,
+        _request_auth=None
+    ) -> RequestSerialized:
+        """Builds the HTTP request of a precompiled `RequestTemplate`.
+
+        Produces the same request as `param_serialize` but only processes
+        the per-call values.
+        :param template: `bsubio.templates.RequestTemplate` of the operation.
+        :param path_params: Path parameters in the url.
+        :param query_params: Query parameters as list of two-tuples.
+        :param header_params: Header parameters passed by the caller.
+        :param body: Request body.
+        :param files dict: key -> file, for `multipart/form-data`.
+        :param content_type: overrides the template's Content-Type.
+        :param _request_auth: overrides the auth settings of the template.
+        :return: tuple of form (http_method, url, header_params, body,
+            post_params)
+        """
+        config = self.configuration
+
+        headers = self.sanitize_for_serialization(header_params) if header_params else {}
+        if template.accept is not None and 'Accept' not in headers:
+            headers['Accept'] = template.accept
+        if content_type:
+            headers['Content-Type'] = content_type
+        elif template.content_type is not None:
+            headers['Content-Type'] = template.content_type
+        headers.update(self.default_headers)
+        if self.cookie:
+            headers['Cookie'] = self.cookie
+
+        resource_path = template.render_path(path_params, config.safe_chars_for_path_param)
+        post_params = self.files_parameters(files) if files else []
+        queries = list(query_params) if query_params else []
+
+        if _request_auth:
+            self.update_params_for_auth(
+                headers, queries, template.auth_settings, resource_path,
+                template.method, body, request_auth=_request_auth
+            )
+        elif template.auth_settings:
+            settings = self._template_auth_settings()
+            for auth in template.auth_settings:
+                auth_setting = settings.get(auth)
+                if auth_setting:
+                    self._apply_auth_params(
+                        headers, queries, resource_path, template.method, body, auth_setting
+                    )
+
+        if body:
+            body = self.sanitize_for_serialization(body)
+
+        url = config.host + resource_path
+        if queries:
+            url += "?" + self.parameters_to_url_query(
+                self.sanitize_for_serialization(queries), None
+            )
+
+        return template.method, url, headers, body, post_params
+
+    def _template_auth_settings(self):
+        # the generated auth settings only depend on the access token
+        token = self.configuration.access_token
+        cached = self._auth_settings_cache
+        if cached is None or cached[0] != token:
+            cached = self._auth_settings_cache = (token, self.configuration.auth_settings())
+        return cached[1]
 
     def call_api(
         self,
@@ -273,19 +378,78 @@ class ApiClient:
         :return: RESTResponse
         """
 
-        try:
-            # perform request and return response
-            response_data = self.rest_client.request(
-                method, url,
-                headers=header_params,
-                body=body, post_params=post_params,
-                _request_timeout=_request_timeout
-            )
+        chain = self._chain
+        if chain is None:
+            try:
+                # perform request and return response
+                response_data = self.rest_client.request(
+                    method, url,
+                    headers=header_params,
+                    body=body, post_params=post_params,
+                    _request_timeout=_request_timeout
+                )
 
-        except ApiException as e:
-            raise e
+            except ApiException as e:
+                raise e
+
+            return response_data
+
+        return chain(Request(
+            resolve_operation(method, url), method, url,
+            header_params if header_params is not None else {},
+            body, post_params, _request_timeout,
+        ))
+
+    async def call_api_async(
+        self,
+        method,
+        url,
+        header_params=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ) -> rest.RESTResponse:
+        """Makes the HTTP request from a coroutine.
+
+        Middleware implementing `handle_async` runs on the event loop; the
+        rest of the chain and the transport run on a worker thread.
+        Calls coalesced by `Configuration.coalescing` return a response
+        whose body has already been read; they are only coalesced with
+        other `call_api_async` calls, as the API methods share models.
+        Parameters are the same as for `call_api`.
+        """
+        request = Request(
+            resolve_operation(method, url), method, url,
+            header_params if header_params is not None else {},
+            body, post_params, _request_timeout,
+        )
+        coalescer = self.coalescer
+        if coalescer is None or request.operation.name not in coalescer.operations:
+            return await self._async_chain(request)
+        return await coalescer.call_async(
+            # keyed apart from the API methods, which share a model
+            ('async',) + request_key(method, url, header_params),
+            lambda: self._call_read_async(request),
+            wait_timeout(_request_timeout),
+        )
 
-        return response_data
+    async def _call_read_async(self, request: Request) -> rest.RESTResponse:
+        # coalesced responses are shared, so the body is read once up front
+        response = await self._async_chain(request)
+        await asyncio.to_thread(response.read)
+        return response
+
+    def _send(self, request: Request) -> rest.RESTResponse:
+        """Innermost handler of the middleware chain."""
+        request.sent_at = time.monotonic()
+        response = self.rest_client.request(
+            request.method, request.url,
+            headers=request.headers,
+            body=request.body, post_params=request.post_params,
+            _request_timeout=request.timeout
+        )
+        response.request = request
+        return response
 
     def response_deserialize(
         self,
@@ -298,6 +462,11 @@ class ApiClient:
         :return: ApiResponse
         """
 
+        if self._deserialize_chain is not None:
+            return self._deserialize_chain(response_data, response_types_map)
+        return self._response_deserialize(response_data, response_types_map)
+
+    def _response_deserialize(self, response_data, response_types_map):
         msg = "RESTResponse.read() must be called before passing it to response_deserialize()"
         assert response_data.data is not None, msg
 
@@ -306,6 +475,11 @@ class ApiClient:
             # if not found, look for '1XX', '2XX', etc.
             response_type = response_types_map.get(str(response_data.status)[0] + "XX", None)
 
+        # the body is released once parsed unless the caller wants raw_data;
+        # error responses keep it for the exception
+        success = 200 <= response_data.status <= 299
+        release = success and not response_data.keep_data
+
         # deserialize response data
         response_text = None
         return_data = None
@@ -321,9 +495,16 @@ class ApiClient:
                     match = re.search(r"charset=([a-zA-Z\-\d]+)[\s;]?", content_type)
                 encoding = match.group(1) if match else "utf-8"
                 response_text = response_data.data.decode(encoding)
-                return_data = self.deserialize(response_text, response_type, content_type)
+                if release:
+                    # drop each representation as soon as the next one exists,
+                    # so at most two copies of the body are alive at once
+                    response_data.data = None
+                data = self._load(response_text, content_type)
+                if release:
+                    response_text = None
+                return_data = self.__deserialize(data, response_type)
         finally:
-            if not 200 <= response_data.status <= 299:
+            if not success:
                 raise ApiException.from_response(
                     http_resp=response_data,
                     body=response_text,
@@ -334,7 +515,7 @@ class ApiClient:
             status_code = response_data.status,
             data = return_data,
             headers = response_data.getheaders(),
-            raw_data = response_data.data
+            raw_data = response_data.data if response_data.data is not None else b""
         )
 
     def sanitize_for_serialization(self, obj):
@@ -409,27 +590,29 @@ class ApiClient:
         :return: deserialized object.
         """
 
+        return self.__deserialize(self._load(response_text, content_type), response_type)
+
+    def _load(self, response_text: str, content_type: Optional[str]):
+        """Parses the text of a response according to its content type."""
+
         # fetch data from response object
         if content_type is None:
             try:
-                data = json.loads(response_text)
+                return json.loads(response_text)
             except ValueError:
-                data = response_text
+                return response_text
         elif re.match(r'^application/(json|[\w!#$&.+\-^_]+\+json)\s*(;|$)', content_type, re.IGNORECASE):
             if response_text == "":
-                data = ""
-            else:
-                data = json.loads(response_text)
+                return ""
+            return json.loads(response_text)
         elif re.match(r'^text\/[a-z.+-]+\s*(;|$)', content_type, re.IGNORECASE):
-            data = response_text
+            return response_text
         else:
             raise ApiException(
                 status=0,
                 reason="Unsupported content type: {0}".format(content_type)
             )
 
-        return self.__deserialize(data, response_type)
-
     def __deserialize(self, data, klass):
         """Deserializes dict, list, str into an object.
 
@@ -552,18 +735,17 @@ class ApiClient:
     ):
         """Builds form parameters.
 
+        File contents are passed through unchanged and may be any
+        buffer-protocol object; paths are memory-mapped.
+
         :param files: File parameters.
         :return: Form parameters with files.
         """
         params = []
         for k, v in files.items():
             if isinstance(v, str):
-                with open(v, 'rb') as f:
-                    filename = os.path.basename(f.name)
-                    filedata = f.read()
-            elif isinstance(v, bytes):
-                filename = k
-                filedata = v
+                filename = os.path.basename(v)
+                filedata = map_file(v)
             elif isinstance(v, tuple):
                 filename, filedata = v
             elif isinstance(v, list):
@@ -571,7 +753,13 @@ class ApiClient:
                     params.extend(self.files_parameters({k: file_param}))
                 continue
             else:
-                raise ValueError("Unsupported file value")
+                # bytes or any other buffer-protocol object, sent as is
+                try:
+                    memoryview(v)
+                except TypeError:
+                    raise ValueError("Unsupported file value") from None
+                filename = k
+                filedata = v
             mimetype = (
                 mimetypes.guess_type(filename)[0]
                 or 'application/octet-stream'
@@ -0,0 +1,191 @@
+"""Circuit breakers around `ApiClient.call_api`.
+
+During a partial outage every caller would otherwise keep opening
+connections and waiting for the full timeout. With a
+:class:`CircuitBreakerRegistry` on `Configuration.circuit_breakers`, each
+(host, endpoint family) pair gets its own :class:`CircuitBreaker`:
+
+* **closed** – calls flow; consecutive failures (transport errors, 5xx or
+  calls slower than `slow_call_threshold`) are counted;
+* **open** – after `failure_threshold` consecutive failures calls fail
+  immediately with `CircuitOpenException` for `recovery_timeout` seconds;
+* **half-open** – afterwards up to `half_open_max_calls` trial requests
+  are let through; a successful trial closes the circuit, a failed one
+  re-opens it. Calls admitted before the circuit opened do not count.
+
+Every transition is reported to `on_state_change`, so callers can shed
+load instead of blocking.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from bsubio.exceptions import CircuitOpenException
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+StateChangeHook = Callable[['CircuitBreaker', str, str], None]
+
+
+class CircuitBreaker:
+    """A single circuit breaker.
+
+    :param name: identifies the breaker in hooks and exceptions.
+    :param failure_threshold: consecutive failures that open the circuit.
+    :param recovery_timeout: seconds to stay open before probing.
+    :param half_open_max_calls: concurrent trial requests while half-open.
+    :param slow_call_threshold: calls slower than this many seconds count as
+        failures; None disables latency-based tripping.
+    :param on_state_change: called with ``(breaker, old_state, new_state)``.
+    """
+
+    def __init__(
+        self,
+        name: str = '',
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        slow_call_threshold: Optional[float] = None,
+        on_state_change: Optional[StateChangeHook] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.slow_call_threshold = slow_call_threshold
+        self.on_state_change = on_state_change
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trials = 0
+        self._half_opened = 0  # counts half-open periods, tags their trials
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.recovery_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def _transition(self, new: str) -> Optional[Tuple[str, str]]:
+        old = self._state
+        if old == new:
+            return None
+        self._state = new
+        if new == OPEN:
+            self._opened_at = self._clock()
+        if new == HALF_OPEN:
+            self._half_opened += 1
+        if new != CLOSED:
+            self._trials = 0
+        if new == CLOSED:
+            self._failures = 0
+        return old, new
+
+    def _notify(self, change: Optional[Tuple[str, str]]) -> None:
+        if change is not None and self.on_state_change is not None:
+            self.on_state_change(self, *change)
+
+    def before_call(self) -> Optional[int]:
+        """Admits a call or raises `CircuitOpenException`.
+
+        :return: a trial token if the call was admitted as a half-open
+            trial, else None; pass it back to :meth:`record`.
+        """
+        change = None
+        with self._lock:
+            state = self._current_state()
+            if state == OPEN:
+                retry_after = self.recovery_timeout - (self._clock() - self._opened_at)
+                raise CircuitOpenException(self.name, retry_after)
+            token = None
+            if state == HALF_OPEN:
+                change = self._transition(HALF_OPEN)
+                if self._trials >= self.half_open_max_calls:
+                    raise CircuitOpenException(self.name, 0.0)
+                self._trials += 1
+                token = self._half_opened
+        self._notify(change)
+        return token
+
+    def record(
+        self,
+        success: bool,
+        latency: Optional[float] = None,
+        token: Optional[int] = None,
+    ) -> None:
+        """Records the outcome of an admitted call.
+
+        Only trial calls of the current half-open period (those whose
+        `token` :meth:`before_call` returned) close or re-open the circuit;
+        calls admitted before it opened are ignored once it did.
+        """
+        if (
+            success
+            and latency is not None
+            and self.slow_call_threshold is not None
+            and latency > self.slow_call_threshold
+        ):
+            success = False
+        change = None
+        with self._lock:
+            if token is not None:
+                if self._state == HALF_OPEN and token == self._half_opened:
+                    self._trials -= 1
+                    change = self._transition(CLOSED if success else OPEN)
+            elif self._state != CLOSED:
+                pass
+            elif success:
+                self._failures = 0
+            else:
+                self._failures += 1
+                if self._failures >= self.failure_threshold:
+                    change = self._transition(OPEN)
+        self._notify(change)
+
+
+class CircuitBreakerRegistry:
+    """Creates and holds one :class:`CircuitBreaker` per host and family.
+
+    Keyword arguments are passed to every breaker created.
+
+    :param on_state_change: called with ``(breaker, old_state, new_state)``
+        for transitions of any breaker; ``breaker.name`` is
+        ``"<host>/<family>"``.
+    """
+
+    def __init__(
+        self, on_state_change: Optional[StateChangeHook] = None, **breaker_kwargs
+    ) -> None:
+        self.on_state_change = on_state_change
+        self.breaker_kwargs = breaker_kwargs
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str, family: str) -> CircuitBreaker:
+        key = (host, family)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = CircuitBreaker(
+                        name='%s/%s' % key,
+                        on_state_change=self.on_state_change,
+                        **self.breaker_kwargs,
+                    )
+                    self._breakers[key] = breaker
+        return breaker
+
+    def states(self) -> Dict[str, str]:
+        """Returns the state of every breaker, keyed by name."""
+        return {b.name: b.state for b in list(self._breakers.values())}
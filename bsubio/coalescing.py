@@ -0,0 +1,159 @@
+"""Coalescing of identical in-flight reads.
+
+Threads watching overlapping jobs regularly issue the same `get_job` or
+`get_types` call at the same moment. With a :class:`RequestCoalescer` on
+`Configuration.coalescing`, identical calls of the configured operations
+(same URL, query and headers) that overlap share one HTTP request:
+
+* API methods share the deserialized result as well, so every caller
+  receives the same model object, which should be treated as read-only;
+* `ApiClient.call_api_async` callers share one fully read `RESTResponse`
+  and deserialize it themselves.
+
+The two share different results, so async callers and API method callers
+never join each other's requests.
+
+With a `window` greater than zero a result is also handed to identical
+calls starting up to `window` seconds after it arrived. Errors are never
+memoized: the callers already waiting receive the exception, the next
+call sends a new request.
+
+A caller joining another's request waits at most for its own
+`_request_timeout` (both parts of a ``(connect, read)`` pair) and then
+raises `TimeoutError`; the shared request carries on for the others.
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+def request_key(method: str, url: str, headers) -> Tuple[Any, ...]:
+    """Returns the part of a request key identifying the HTTP request."""
+    return (method, url, tuple(sorted(headers.items())) if headers else ())
+
+
+def wait_timeout(request_timeout) -> Optional[float]:
+    """Returns how long a follower with `request_timeout` waits, in
+    seconds; None waits until the shared call completes."""
+    if request_timeout is None:
+        return None
+    if isinstance(request_timeout, tuple):
+        return float(sum(request_timeout))
+    return float(request_timeout)
+
+
+_TIMED_OUT = 'the coalesced call did not complete within %s seconds'
+
+
+class RequestCoalescer:
+    """Singleflight for idempotent reads, usable from threads and asyncio.
+
+    :param operations: operation names whose calls are coalesced.
+    :param window: seconds a successful result is reused for identical
+        calls that start after it arrived; 0 only coalesces calls that
+        overlap.
+    """
+
+    def __init__(
+        self,
+        operations: Iterable[str] = ('get_job', 'list_jobs', 'get_types', 'get_version'),
+        window: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if window < 0:
+            raise ValueError('window must not be negative')
+        self.operations = frozenset(operations)
+        self.window = window
+        self.calls = 0
+        """Number of calls made through the coalescer."""
+        self.shared = 0
+        """Number of those calls that reused another call's result."""
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, 'Future[Any]'] = {}
+        self._expiry: 'deque[Tuple[float, Hashable, Future[Any]]]' = deque()
+
+    def _join(self, key: Hashable) -> Tuple['Future[Any]', bool]:
+        """Returns the future of `key` and whether the caller must fill it."""
+        with self._lock:
+            self.calls += 1
+            now = self._clock()
+            expiry = self._expiry
+            while expiry and expiry[0][0] <= now:
+                _, old_key, old = expiry.popleft()
+                if self._futures.get(old_key) is old:
+                    del self._futures[old_key]
+            future = self._futures.get(key)
+            if future is not None:
+                self.shared += 1
+                return future, False
+            future = self._futures[key] = Future()
+            return future, True
+
+    def _settle(
+        self, key: Hashable, future: 'Future[Any]', result: Any = None, error: Any = None
+    ) -> None:
+        with self._lock:
+            if error is None and self.window > 0:
+                self._expiry.append((self._clock() + self.window, key, future))
+            elif self._futures.get(key) is future:
+                del self._futures[key]
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def call(
+        self, key: Hashable, function: Callable[[], Any], timeout: Optional[float] = None
+    ) -> Any:
+        """Returns ``function()``, or the result of an identical call.
+
+        :param key: identifies identical calls, e.g. the mode of the API
+            method followed by :func:`request_key`.
+        :param timeout: seconds to wait for an identical call; see
+            :func:`wait_timeout`.
+        :raises TimeoutError: if the identical call takes longer.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            try:
+                return future.result(timeout)
+            except concurrent.futures.TimeoutError:
+                raise TimeoutError(_TIMED_OUT % timeout) from None
+        try:
+            result = function()
+        except BaseException as error:
+            self._settle(key, future, error=error)
+            raise
+        self._settle(key, future, result)
+        return result
+
+    async def call_async(
+        self,
+        key: Hashable,
+        function: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """Coroutine version of :meth:`call`; joins threads calling
+        :meth:`call` with the same `key`."""
+        future, leader = self._join(key)
+        if not leader:
+            # shielded: a cancelled follower must not cancel the shared call
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), timeout
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError(_TIMED_OUT % timeout) from None
+        try:
+            result = await function()
+        except BaseException as error:
+            self._settle(key, future, error=error)
+            raise
+        self._settle(key, future, result)
+        return result
@@ -0,0 +1,153 @@
+"""Adaptive (AIMD) concurrency limiting for submission and upload calls.
+
+A fixed number of in-flight `create_job`/`upload_job_data` calls is either
+too low to saturate the service or high enough to cause 429s, timeouts and
+server-side queueing. :class:`AdaptiveConcurrencyLimiter`, set on
+`Configuration.concurrency_limiter`, finds the right value at run time:
+
+* every healthy response grows the limit additively (by roughly
+  `increase` per round trip at the current limit);
+* a 429, a 5xx, a transport error or a latency spike above
+  `latency_tolerance` times the observed baseline shrinks it
+  multiplicatively by `decrease_factor`.
+
+Baselines are kept per operation and payload size class (sizes within a
+factor of 16 share one), so a large upload after small calls is compared
+with earlier uploads of its size rather than counted as congestion.
+
+Callers beyond the current limit block in `ApiClient.call_api` until a
+slot frees up. The current limit is exposed as :attr:`limit` (and through
+`on_limit_change`) so it can be exported as a metric.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+from bsubio.operations import Operation
+
+
+class AdaptiveConcurrencyLimiter:
+    """Additive-increase/multiplicative-decrease concurrency limit.
+
+    :param operations: operation names that are limited.
+    :param initial_limit: starting number of concurrent calls.
+    :param min_limit: the limit never drops below this.
+    :param max_limit: the limit never grows beyond this.
+    :param increase: additive increase per `limit` healthy responses.
+    :param decrease_factor: multiplier applied on congestion signals.
+    :param latency_tolerance: a successful response slower than this
+        multiple of the baseline latency counts as a congestion signal.
+    :param baseline_alpha: smoothing factor of the baseline latency EWMA.
+    :param on_limit_change: called with ``(old_limit, new_limit)`` whenever
+        the integral limit changes.
+    """
+
+    def __init__(
+        self,
+        operations: Iterable[str] = ('create_job', 'upload_job_data'),
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 3.0,
+        baseline_alpha: float = 0.05,
+        on_limit_change: Optional[Callable[[int, int], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("expected 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        self.operations = frozenset(operations)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.baseline_alpha = baseline_alpha
+        self.on_limit_change = on_limit_change
+        self._clock = clock
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._baselines: Dict[Hashable, float] = {}
+        self._last_decrease = float('-inf')
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """Current number of allowed concurrent calls."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def baseline_latency(self, key: Hashable = None) -> Optional[float]:
+        """Returns the baseline latency of calls released with `key`."""
+        return self._baselines.get(key)
+
+    @staticmethod
+    def baseline_key(operation: Operation, payload_size: int = 0) -> Hashable:
+        """Returns the key of the baseline `operation` is compared with."""
+        return operation.name, payload_size.bit_length() // 4
+
+    def applies_to(self, operation: Operation) -> bool:
+        return operation.name in self.operations
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """Waits for a free slot.
+
+        :return: an opaque start token to pass to :meth:`release`.
+        :raises TimeoutError: if no slot frees up within `timeout` seconds.
+        """
+        with self._cond:
+            if not self._cond.wait_for(
+                lambda: self._in_flight < int(self._limit), timeout
+            ):
+                raise TimeoutError("no concurrency slot available")
+            self._in_flight += 1
+        return self._clock()
+
+    def release(self, started: float, congested: bool, key: Hashable = None) -> None:
+        """Frees the slot taken at `started` and adapts the limit.
+
+        :param started: the token returned by :meth:`acquire`.
+        :param congested: whether the call ended with a 429, a 5xx or a
+            transport error.
+        :param key: baseline the latency is compared with, usually from
+            :meth:`baseline_key`.
+        """
+        now = self._clock()
+        latency = now - started
+        with self._cond:
+            self._in_flight -= 1
+            old = int(self._limit)
+            baseline = self._baselines.get(key)
+            if not congested and baseline is not None:
+                congested = latency > baseline * self.latency_tolerance
+            if congested:
+                # only back off once per round trip: calls that were already
+                # in flight when we last decreased report the same congestion
+                if started >= self._last_decrease:
+                    self._limit = max(
+                        float(self.min_limit), self._limit * self.decrease_factor
+                    )
+                    self._last_decrease = now
+            else:
+                self._baselines[key] = latency if baseline is None else (
+                    baseline + self.baseline_alpha * (latency - baseline)
+                )
+                self._limit = min(
+                    float(self.max_limit),
+                    self._limit + self.increase / self._limit,
+                )
+            new = int(self._limit)
+            self._cond.notify_all()
+        if new != old and self.on_limit_change is not None:
+            self.on_limit_change(old, new)
+
+    @staticmethod
+    def is_congestion_status(status: int) -> bool:
+        return status == 429 or status >= 500
@@ -6,9 +6,8 @@
     REST API for batch processing compute-intensive workloads.  Submit jobs, upload data, and retrieve results through a simple API. Perfect for PDF processing, video transcoding, audio transcription, and more.  ## Authentication  All endpoints require Bearer token authentication using your API key:  ``` Authorization: Bearer <your-api-key> ```  Get your API key from the [Dashboard](/).  ## Job Lifecycle  1. **Create** a job with `POST /v1/jobs` - Returns job ID and upload token 2. **Upload** data with `POST /v1/upload/{jobId}` - Uses upload token 3. **Submit** for processing with `POST /v1/jobs/{jobId}/submit` 4. **Monitor** status with `GET /v1/jobs/{jobId}` 5. **Retrieve** output with `GET /v1/jobs/{jobId}/output`  ## Job States  - `created` - Job created, awaiting data upload - `loaded` - Data uploaded successfully - `pending` - Waiting in queue for a worker - `claimed` - Worker claimed the job - `preparing` - Worker preparing to process - `processing` - Processing started - `finished` - Processing completed successfully - `failed` - Processing failed with error 
 
     The version of the OpenAPI document: 1.0.0
-    Generated by OpenAPI Generator (https://openapi-generator.tech)
-
-    Do not edit the class manually.
+    Generated by OpenAPI Generator (https://openapi-generator.tech), since
+    maintained by hand; listed in .openapi-generator-ignore.
 """  # noqa: E501
 
 
@@ -18,11 +17,26 @@ import logging
 from logging import FileHandler
 import multiprocessing
 import sys
-from typing import Any, ClassVar, Dict, List, Literal, Optional, TypedDict, Union
+from typing import (
+    Any, Callable, ClassVar, Dict, List, Literal, Optional, TYPE_CHECKING, Tuple, TypedDict, Union,
+)
 from typing_extensions import NotRequired, Self
 
 import urllib3
 
+if TYPE_CHECKING:
+    from bsubio.circuit import CircuitBreakerRegistry
+    from bsubio.coalescing import RequestCoalescer
+    from bsubio.concurrency import AdaptiveConcurrencyLimiter
+    from bsubio.hedging import HedgingPolicy
+    from bsubio.metrics import MetricsRegistry
+    from bsubio.middleware import Middleware
+    from bsubio.ratelimit import RateLimiter
+    from bsubio.requestlog import RequestLogger
+    from bsubio.retry import RetryEngine
+    from bsubio.timing import RequestTiming
+    from bsubio.tracing import JobTracer
+
 
 JSON_SCHEMA_VALIDATION_KEYWORDS = {
     'multipleOf', 'maximum', 'exclusiveMaximum',
@@ -292,6 +306,13 @@ class Configuration:
            cpu_count * 5 is used as default value to increase performance.
         """
 
+        self.http2 = False
+        """Use the HTTP/2 transport (requires the ``http2`` extra).
+           Concurrent requests are multiplexed over a few connections and
+           the client falls back to HTTP/1.1 when the server does not
+           negotiate h2.
+        """
+
         self.proxy: Optional[str] = None
         """Proxy URL
         """
@@ -304,10 +325,62 @@ class Configuration:
         self.retries = retries
         """Adding retries to override urllib3 default value 3
         """
+        self.middleware: List["Middleware"] = []
+        """Request/response middleware, outermost first
+           (see `bsubio.middleware`). The built-in features below are
+           appended to it when an ApiClient is created; changing any of
+           them afterwards does not affect existing clients.
+        """
+        self.retry_engine: Optional["RetryEngine"] = None
+        """Per-operation retry policies with backoff, Retry-After support
+           and a retry budget (see `bsubio.retry.RetryEngine`). When set and
+           `retries` is None, urllib3's own retries are disabled.
+        """
+        self.rate_limiter: Optional["RateLimiter"] = None
+        """Client-side token-bucket rate limits per endpoint family,
+           applied before every attempt (see `bsubio.ratelimit.RateLimiter`).
+        """
+        self.concurrency_limiter: Optional["AdaptiveConcurrencyLimiter"] = None
+        """AIMD limit on in-flight `create_job`/`upload_job_data` calls
+           (see `bsubio.concurrency.AdaptiveConcurrencyLimiter`).
+        """
+        self.circuit_breakers: Optional["CircuitBreakerRegistry"] = None
+        """Circuit breakers per host and endpoint family that fail fast with
+           `CircuitOpenException` during outages
+           (see `bsubio.circuit.CircuitBreakerRegistry`).
+        """
+        self.hedging: Optional["HedgingPolicy"] = None
+        """Opt-in request hedging for idempotent reads
+           (see `bsubio.hedging.HedgingPolicy`).
+        """
+        self.coalescing: Optional["RequestCoalescer"] = None
+        """Identical in-flight reads share one request and result
+           (see `bsubio.coalescing.RequestCoalescer`).
+           Must be set before the ApiClient is created.
+        """
+        self.timing_callback: Optional[Callable[["RequestTiming"], None]] = None
+        """Called with a `bsubio.timing.RequestTiming` record (pool wait,
+           connect, TLS, TTFB, transfer, bytes) for every HTTP attempt.
+           Must be set before the ApiClient is created.
+        """
+        self.metrics: Optional["MetricsRegistry"] = None
+        """Latency histograms, counters and pool utilisation of every HTTP
+           attempt (see `bsubio.metrics.MetricsRegistry`).
+           Must be set before the ApiClient is created.
+        """
+        self.tracer: Optional["JobTracer"] = None
+        """Job and HTTP call spans, OpenTelemetry-compatible
+           (see `bsubio.tracing.JobTracer`).
+        """
+        self.request_logger: Optional["RequestLogger"] = None
+        """Sampled structured logging of HTTP attempts, without bodies or
+           tokens (see `bsubio.requestlog.RequestLogger`). Unlike `debug`
+           it does not change any logger level.
+        """
         # Enable client side validation
         self.client_side_validation = True
 
-        self.socket_options = None
+        self.socket_options: Optional[List[Tuple[int, int, Union[int, bytes]]]] = None
         """Options to pass down to the underlying urllib3 socket
         """
 
@@ -0,0 +1,313 @@
+"""Table-driven API methods.
+
+Every operation used to be emitted four times in the API modules — the
+plain method, ``_with_http_info``, ``_without_preload_content`` and a
+``_serialize`` helper — each wrapped in `validate_call` at import. The
+API classes are now built from one :class:`ApiOperation` per operation:
+
+.. code-block:: python
+
+    @api_operations(
+        ApiOperation(
+            'get_job', 'Get job details', 'Returns detailed information ...',
+            params=(Param('job_id', JOB_ID, 'path', 'jobId'),),
+            returns=CreateJob201Response,
+            responses={'200': 'CreateJob201Response', '401': 'Error'},
+        ),
+    )
+    class JobsApi:
+        ...
+
+`api_operations` generates the three public methods of each operation with
+the signatures, annotations and docstrings of the generated code they
+replace; they all call :func:`dispatch`. The pydantic validator of a method
+is built the first time the method is looked up, so importing the package
+no longer pays for the schemas of operations a process never calls.
+
+Static type checkers read the ``.pyi`` stubs next to the API modules.
+"""
+
+from functools import update_wrapper
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union, cast
+
+from pydantic import Field, StrictFloat, StrictInt, StrictStr, validate_call
+from pydantic.fields import FieldInfo
+from typing_extensions import Annotated, get_args
+
+from bsubio.api_response import ApiResponse
+from bsubio.coalescing import request_key, wait_timeout
+from bsubio.multipart import close_mapped_files
+from bsubio.rest import RESTResponseType
+from bsubio.templates import TEMPLATES, RequestTemplate
+
+RequestTimeout = Union[
+    None,
+    Annotated[StrictFloat, Field(gt=0)],
+    Tuple[
+        Annotated[StrictFloat, Field(gt=0)],
+        Annotated[StrictFloat, Field(gt=0)]
+    ]
+]
+
+HostIndex = Annotated[StrictInt, Field(ge=0, le=0)]
+
+# keyword parameters every method accepts after the operation's own
+_COMMON_ANNOTATIONS: Dict[str, Any] = {
+    '_request_timeout': RequestTimeout,
+    '_request_auth': Optional[Dict[StrictStr, Any]],
+    '_content_type': Optional[StrictStr],
+    '_headers': Optional[Dict[StrictStr, Any]],
+    '_host_index': HostIndex,
+}
+
+_COMMON_PARAMETERS = (
+    '_request_timeout=None, _request_auth=None, _content_type=None, '
+    '_headers=None, _host_index=0'
+)
+
+_COMMON_DOC = """\
+:param _request_timeout: timeout setting for this request. If one
+                         number provided, it will be total request
+                         timeout. It can also be a pair (tuple) of
+                         (connection, read) timeouts.
+:type _request_timeout: int, tuple(int, int), optional
+:param _request_auth: set to override the auth_settings for an a single
+                      request; this effectively ignores the
+                      authentication in the spec for a single request.
+:type _request_auth: dict, optional
+:param _content_type: force content-type for the request.
+:type _content_type: str, Optional
+:param _headers: set to override the headers for a single
+                 request; this effectively ignores the headers
+                 in the spec for a single request.
+:type _headers: dict, optional
+:param _host_index: set to override the host_index for a single
+                    request; this effectively ignores the host_index
+                    in the spec for a single request.
+:type _host_index: int, optional
+:return: Returns the result object.
+"""
+
+DATA = 'data'
+"""Mode of the plain methods: return the deserialized body."""
+
+WITH_HTTP_INFO = 'with_http_info'
+"""Mode of ``*_with_http_info``: return the `ApiResponse`."""
+
+WITHOUT_PRELOAD_CONTENT = 'without_preload_content'
+"""Mode of ``*_without_preload_content``: return the unread urllib3 response."""
+
+UNREAD = 'unread'
+"""Mode of the helpers that consume the body themselves: return the unread
+response of a 2xx status; other statuses raise as in the modes above."""
+
+_MODES = (
+    (DATA, ''),
+    (WITH_HTTP_INFO, '_with_http_info'),
+    (WITHOUT_PRELOAD_CONTENT, '_without_preload_content'),
+)
+
+
+class Param(NamedTuple):
+    """A parameter of an operation.
+
+    :param name: Python name of the parameter.
+    :param annotation: type validated by pydantic.
+    :param location: ``'path'``, ``'query'``, ``'body'`` or ``'file'``.
+    :param key: name of the parameter on the wire; defaults to `name`.
+    :param doc_type: type shown in the docstring.
+    :param required: whether the parameter has no default (None).
+    """
+
+    name: str
+    annotation: Any
+    location: str
+    key: Optional[str] = None
+    doc_type: str = 'str'
+    required: bool = True
+
+    @property
+    def description(self) -> str:
+        for metadata in get_args(self.annotation)[1:]:
+            if isinstance(metadata, FieldInfo) and metadata.description:
+                return metadata.description
+        return ''
+
+
+class ApiOperation(NamedTuple):
+    """The table entry of one operation.
+
+    :param name: operation name, also the key of its `RequestTemplate`.
+    :param summary: first line of the docstrings.
+    :param description: paragraph following the summary.
+    :param params: the operation's own parameters, in signature order.
+    :param returns: type of the deserialized body.
+    :param responses: model name (or class) of the body per status code.
+    """
+
+    name: str
+    summary: str
+    description: str
+    params: Tuple[Param, ...] = ()
+    returns: Any = None
+    responses: Dict[str, Any] = {}
+
+    @property
+    def template(self) -> RequestTemplate:
+        return TEMPLATES[self.name]
+
+    def docstring(self) -> str:
+        lines = [self.summary, '', self.description, '']
+        for param in self.params:
+            description = param.description
+            if param.required:
+                description = (description + ' (required)').lstrip()
+            lines.append((':param %s: %s' % (param.name, description)).rstrip())
+            lines.append(':type %s: %s' % (param.name, param.doc_type))
+        return '\n'.join(lines) + '\n' + _COMMON_DOC
+
+
+def dispatch(
+    api,
+    operation: ApiOperation,
+    mode: str,
+    _request_timeout,
+    **serialize_args: Any
+):
+    """Sends `operation` and returns the result `mode` asks for.
+
+    The single implementation behind every generated API method;
+    `serialize_args` are passed to `ApiClient.serialize_template`.
+    """
+    api_client = api.api_client
+    _param = api_client.serialize_template(operation.template, **serialize_args)
+    coalescer = api_client.coalescer
+    if (
+        coalescer is not None
+        and mode not in (WITHOUT_PRELOAD_CONTENT, UNREAD)
+        and operation.name in coalescer.operations
+    ):
+        return coalescer.call(
+            (mode, operation.returns) + request_key(*_param[:3]),
+            lambda: _call(api_client, operation, mode, _param, _request_timeout),
+            wait_timeout(_request_timeout),
+        )
+    return _call(api_client, operation, mode, _param, _request_timeout)
+
+
+def _call(api_client, operation: ApiOperation, mode: str, _param, _request_timeout):
+    try:
+        response_data = api_client.call_api(*_param, _request_timeout=_request_timeout)
+    finally:
+        # every attempt has sent the body by now
+        close_mapped_files(_param[4])
+    if mode == WITHOUT_PRELOAD_CONTENT or (
+        mode == UNREAD and 200 <= response_data.status <= 299
+    ):
+        return response_data.response
+    response_data.read()
+    # only _with_http_info returns raw_data; elsewhere the body is dropped
+    # before the models are built
+    response_data.keep_data = mode == WITH_HTTP_INFO
+    api_response = api_client.response_deserialize(
+        response_data=response_data,
+        response_types_map=operation.responses,
+    )
+    return api_response if mode == WITH_HTTP_INFO else api_response.data
+
+
+_METHOD = '''\
+def {name}(self, {params}{common}):
+    return dispatch(self, operation, mode, _request_timeout,{args}
+        header_params=_headers, _request_auth=_request_auth)
+'''
+
+
+def _source(operation: ApiOperation, name: str) -> str:
+    params = ''.join(
+        '%s, ' % p.name if p.required else '%s=None, ' % p.name for p in operation.params
+    )
+    located: Dict[str, List[Param]] = {'path': [], 'query': [], 'file': [], 'body': []}
+    for p in operation.params:
+        located[p.location].append(p)
+    path = ', '.join('%r: %s' % (p.key or p.name, p.name) for p in located['path'])
+    query = ', '.join('(%r, %s)' % (p.key or p.name, p.name) for p in located['query'])
+    files = ', '.join('%r: %s' % (p.key or p.name, p.name) for p in located['file'])
+    body = [p.name for p in located['body']]
+    args = []
+    if path:
+        args.append('path_params={%s}' % path)
+    if query:
+        args.append('query_params=[(k, v) for k, v in (%s,) if v is not None]' % query)
+    if files:
+        args.append('files={%s}' % files)
+    if body:
+        args.append('body=%s' % body[0])
+    if operation.template.content_type is not None:
+        args.append('content_type=_content_type')
+    return _METHOD.format(
+        name=name,
+        params=params,
+        common=_COMMON_PARAMETERS,
+        args=''.join('\n        %s,' % arg for arg in args),
+    )
+
+
+def _build(cls: type, operation: ApiOperation, mode: str, suffix: str):
+    name = operation.name + suffix
+    namespace: Dict[str, Any] = {'dispatch': dispatch, 'operation': operation, 'mode': mode}
+    exec(_source(operation, name), namespace)
+    function = namespace[name]
+    if mode == DATA:
+        returns = operation.returns
+    elif mode == WITH_HTTP_INFO:
+        returns = cast(Any, ApiResponse)[operation.returns]
+    else:
+        returns = RESTResponseType
+    function.__annotations__ = dict(
+        {p.name: p.annotation for p in operation.params},
+        **_COMMON_ANNOTATIONS,
+        **{'return': returns}
+    )
+    function.__doc__ = operation.docstring()
+    function.__module__ = cls.__module__
+    function.__qualname__ = '%s.%s' % (cls.__qualname__, name)
+    return function
+
+
+class _LazyValidated:
+    """Applies `validate_call` to a method the first time it is looked up,
+    then replaces itself on the class with the validated function."""
+
+    def __init__(self, function) -> None:
+        self.raw_function = function
+        update_wrapper(cast(Callable[..., Any], self), function)
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._owner = owner
+        self._name = name
+
+    def __get__(self, instance, owner=None):
+        validated = validate_call(self.raw_function)
+        setattr(self._owner, self._name, validated)
+        return validated if instance is None else validated.__get__(instance, owner)
+
+
+def validated_method(function):
+    """Decorator validating the arguments of a hand-written API method as
+    the generated ones are: with `validate_call`, built on first use."""
+    return _LazyValidated(function)
+
+
+def api_operations(*operations: ApiOperation):
+    """Class decorator adding the methods of `operations` to an API class."""
+
+    def decorate(cls: type) -> type:
+        for operation in operations:
+            for mode, suffix in _MODES:
+                method = _LazyValidated(_build(cls, operation, mode, suffix))
+                setattr(cls, operation.name + suffix, method)
+                method.__set_name__(cls, operation.name + suffix)
+        return cls
+
+    return decorate
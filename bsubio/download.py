@@ -0,0 +1,146 @@
+"""Downloading job output into caller-provided memory.
+
+`OutputApi.get_job_output` returns a new `bytearray`, which callers then
+copy into a NumPy array or a memory-mapped file. :func:`read_into` reads a
+response body straight into any writable buffer instead — a `bytearray`,
+`memoryview`, `mmap` or C-contiguous NumPy array — and :func:`map_response`
+downloads it into a memory-mapped file:
+
+.. code-block:: python
+
+    samples = numpy.empty(sample_count, dtype=numpy.float32)
+    written = output_api.get_job_output_into(job_id, samples)
+
+    view = output_api.get_job_output_mmap(job_id, '/data/output.bin')
+
+For uncompressed HTTP/1.1 bodies the socket reads directly into the buffer
+(`readinto` on the underlying `http.client` response), so every byte is
+copied exactly once. Compressed and HTTP/2 bodies are decoded in chunks and
+copied from each chunk.
+"""
+
+import mmap
+import tempfile
+from typing import Any, Optional
+
+from bsubio.timing import TimedResponse
+
+_CHUNK = 1 << 16
+
+
+def content_length(response) -> Optional[int]:
+    """Returns the length announced by `response`, or None."""
+    value = response.headers.get('Content-Length')
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _raw_readinto(response):
+    # urllib3's own readinto() reads into a temporary bytes object first;
+    # the http.client response it wraps fills the buffer from the socket
+    encoding = response.headers.get('Content-Encoding', 'identity').strip().lower()
+    if encoding not in ('', 'identity'):
+        return None
+    fp = getattr(response, '_fp', None)
+    readinto = getattr(fp, 'readinto', None)
+    if readinto is not None and isinstance(response, TimedResponse):
+        return response.timed_readinto(readinto)
+    return readinto
+
+
+def _too_small(length: Any, size: int) -> ValueError:
+    return ValueError('buffer of %d bytes is too small for a body of %s bytes' % (size, length))
+
+
+def read_into(response, buffer) -> int:
+    """Reads the body of `response` into `buffer`.
+
+    The connection is released to its pool afterwards, or closed if the
+    body did not fit.
+
+    :param response: unread response, as returned by the
+        ``*_without_preload_content`` methods.
+    :param buffer: writable buffer-protocol object; the body is written
+        from its first byte.
+    :return: number of bytes written.
+    :raises ValueError: if the body is larger than `buffer`.
+    """
+    view = memoryview(buffer)
+    if view.readonly:
+        raise TypeError('buffer is read-only')
+    view = view.cast('B')
+    size = len(view)
+    length = content_length(response)
+    try:
+        if length is not None and length > size:
+            raise _too_small(length, size)
+        readinto = _raw_readinto(response)
+        filled = 0
+        if readinto is not None:
+            while filled < size:
+                count = readinto(view[filled:])
+                if not count:
+                    break
+                filled += count
+            if filled == size and length is None and readinto(bytearray(1)):
+                raise _too_small('more than %d' % size, size)
+        else:
+            for chunk in response.stream(_CHUNK):
+                end = filled + len(chunk)
+                if end > size:
+                    raise _too_small('more than %d' % size, size)
+                view[filled:end] = chunk
+                filled = end
+    except BaseException:
+        response.close()
+        raise
+    response.release_conn()
+    return filled
+
+
+def _chunks(response):
+    try:
+        yield from response.stream(_CHUNK)
+    except BaseException:
+        response.close()
+        raise
+    response.release_conn()
+
+
+def map_response(response, path: Optional[str] = None) -> memoryview:
+    """Downloads the body of `response` into a memory-mapped file.
+
+    The file is sized from Content-Length and filled with :func:`read_into`;
+    bodies of unknown length are written to the file first.
+
+    :param response: unread response, as returned by the
+        ``*_without_preload_content`` methods.
+    :param path: file to write; an anonymous temporary file by default.
+    :return: read-only view of the mapped file; the mapping is released
+        with the last reference to the view.
+    """
+    length = content_length(response)
+    with (open(path, 'w+b') if path is not None else tempfile.TemporaryFile()) as file:
+        if length is None:
+            for chunk in _chunks(response):
+                file.write(chunk)
+            file.flush()
+            length = file.tell()
+            if not length:
+                return memoryview(b'')
+            return memoryview(mmap.mmap(file.fileno(), length)).toreadonly()
+        if not length:
+            read_into(response, bytearray())
+            return memoryview(b'')
+        file.truncate(length)
+        mapped = mmap.mmap(file.fileno(), length)
+    try:
+        written = read_into(response, mapped)
+        if written != length:
+            raise ValueError('body ended after %d of %d bytes' % (written, length))
+    except BaseException:
+        mapped.close()
+        raise
+    return memoryview(mapped).toreadonly()
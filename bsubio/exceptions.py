@@ -6,9 +6,8 @@
     REST API for batch processing compute-intensive workloads.  Submit jobs, upload data, and retrieve results through a simple API. Perfect for PDF processing, video transcoding, audio transcription, and more.  ## Authentication  All endpoints require Bearer token authentication using your API key:  ``` Authorization: Bearer <your-api-key> ```  Get your API key from the [Dashboard](/).  ## Job Lifecycle  1. **Create** a job with `POST /v1/jobs` - Returns job ID and upload token 2. **Upload** data with `POST /v1/upload/{jobId}` - Uses upload token 3. **Submit** for processing with `POST /v1/jobs/{jobId}/submit` 4. **Monitor** status with `GET /v1/jobs/{jobId}` 5. **Retrieve** output with `GET /v1/jobs/{jobId}/output`  ## Job States  - `created` - Job created, awaiting data upload - `loaded` - Data uploaded successfully - `pending` - Waiting in queue for a worker - `claimed` - Worker claimed the job - `preparing` - Worker preparing to process - `processing` - Processing started - `finished` - Processing completed successfully - `failed` - Processing failed with error 
 
     The version of the OpenAPI document: 1.0.0
-    Generated by OpenAPI Generator (https://openapi-generator.tech)
-
-    Do not edit the class manually.
+    Generated by OpenAPI Generator (https://openapi-generator.tech), since
+    maintained by hand; listed in .openapi-generator-ignore.
 """  # noqa: E501
 
 from typing import Any, Optional
@@ -205,6 +204,26 @@ class UnprocessableEntityException(ApiException):
     pass
 
 
+class CircuitOpenException(OpenApiException):
+    """Raised instead of sending a request while its circuit is open."""
+
+    def __init__(self, circuit, retry_after=None) -> None:
+        """
+        Args:
+            circuit (str): name of the open circuit ("<host>/<family>")
+
+        Keyword Args:
+            retry_after (float): seconds until the circuit starts probing
+                                 again, if known
+        """
+        self.circuit = circuit
+        self.retry_after = retry_after
+        msg = "Circuit {0} is open".format(circuit)
+        if retry_after:
+            msg += "; retry in {0:.1f}s".format(retry_after)
+        super(CircuitOpenException, self).__init__(msg)
+
+
 def render_path(path_to_item):
     """Returns a string representation of a path"""
     result = ""
@@ -0,0 +1,210 @@
+"""Hedged requests for idempotent reads.
+
+A `get_job` that lands on a bad connection can take seconds while the
+typical call takes tens of milliseconds. With a :class:`HedgingPolicy` on
+`Configuration.hedging`, `ApiClient.call_api` sends hedgeable operations
+from a worker pool; if no response arrived after an adaptive delay (the
+observed `quantile` latency of that operation, counted from the moment the
+attempt started), a duplicate request is sent on another pooled connection
+and whichever answers first wins.
+
+Calls never queue for the pool: while all `max_workers` workers are busy,
+a call runs on the caller's thread without a hedge, so hedging does not cap
+the number of concurrent requests.
+
+Hedges are drawn from a budget (`budget_percent` of hedgeable requests),
+so a slow server never sees more than that much extra load; a budget of 0
+disables hedging. The losing request cannot be interrupted inside urllib3:
+it is abandoned, and its response is closed unread when it completes
+rather than drained on the worker pool. Hedged attempts without a
+`_request_timeout` get `attempt_timeout`, so an abandoned attempt cannot
+hold a worker indefinitely.
+"""
+
+import collections
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterable, Optional
+
+from bsubio.operations import Operation
+from bsubio.retry import RetryBudget
+
+DEFAULT_HEDGED_OPERATIONS = ('get_job', 'list_jobs', 'get_types', 'get_version')
+
+
+class HedgingPolicy:
+    """Which operations are hedged, and when.
+
+    :param operations: names of idempotent operations to hedge.
+    :param quantile: latency quantile used as hedging delay.
+    :param initial_delay: delay used until `min_samples` latencies of an
+        operation have been observed.
+    :param min_delay: lower bound for the hedging delay.
+    :param max_delay: upper bound for the hedging delay.
+    :param budget_percent: hedges allowed per 100 hedgeable requests; 0
+        disables hedging.
+    :param window: number of recent latencies kept per operation.
+    :param min_samples: samples needed before the quantile is trusted.
+    :param max_workers: size of the worker pool running the requests;
+        beyond this many attempts in flight, calls are not hedged.
+    :param attempt_timeout: `_request_timeout` of hedged attempts whose
+        caller passed none.
+    """
+
+    def __init__(
+        self,
+        operations: Iterable[str] = DEFAULT_HEDGED_OPERATIONS,
+        quantile: float = 0.95,
+        initial_delay: float = 0.1,
+        min_delay: float = 0.005,
+        max_delay: float = 2.0,
+        budget_percent: float = 5.0,
+        window: int = 1000,
+        min_samples: int = 20,
+        max_workers: int = 64,
+        attempt_timeout: Optional[float] = 30.0,
+    ) -> None:
+        self.operations = frozenset(operations)
+        self.quantile = quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.window = window
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        self.attempt_timeout = attempt_timeout
+        self.budget_percent = budget_percent
+        self.budget = RetryBudget(
+            ratio=budget_percent / 100.0,
+            min_retries_per_second=0.0,
+            max_tokens=max(1.0, budget_percent) if budget_percent > 0 else 0.0,
+        )
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._delays: Dict[str, float] = {}
+        self._since_update: Dict[str, int] = collections.Counter()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._busy = 0
+
+    def applies_to(self, operation: Operation) -> bool:
+        return (
+            self.budget_percent > 0
+            and operation.idempotent
+            and operation.name in self.operations
+        )
+
+    def delay_for(self, operation: Operation) -> float:
+        """Returns how long to wait before hedging `operation`."""
+        return self._delays.get(operation.name, self.initial_delay)
+
+    def record_latency(self, operation: Operation, seconds: float) -> None:
+        name = operation.name
+        with self._lock:
+            samples = self._latencies.get(name)
+            if samples is None:
+                samples = self._latencies[name] = collections.deque(maxlen=self.window)
+            samples.append(seconds)
+            self._since_update[name] += 1
+            # re-sorting on every call would cost more than it saves
+            stale = self._since_update[name] >= max(1, len(samples) // 20)
+            if len(samples) < self.min_samples or not stale:
+                return
+            self._since_update[name] = 0
+            ordered = sorted(samples)
+        delay = ordered[min(len(ordered) - 1, int(self.quantile * len(ordered)))]
+        self._delays[name] = min(self.max_delay, max(self.min_delay, delay))
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        self.max_workers, thread_name_prefix='bsubio-hedge'
+                    )
+        return self._executor
+
+    def _reserve(self) -> bool:
+        """Claims a pool worker; False when all are busy."""
+        with self._lock:
+            if self._busy >= self.max_workers:
+                return False
+            self._busy += 1
+            return True
+
+    def _unreserve(self) -> None:
+        with self._lock:
+            self._busy -= 1
+
+    def _timed(self, operation: Operation, send):
+        started = time.monotonic()
+        response = send()
+        self.record_latency(operation, time.monotonic() - started)
+        return response
+
+    def _run(self, operation: Operation, send, started: threading.Event):
+        started.set()
+        try:
+            return self._timed(operation, send)
+        finally:
+            self._unreserve()
+
+    def _submit(self, operation: Operation, send, started: threading.Event) -> 'Future[Any]':
+        # each attempt runs in its own copy of the caller's context, so
+        # context variables (tracing, timing) behave as on the caller thread
+        return self._pool().submit(
+            contextvars.copy_context().run, self._run, operation, send, started
+        )
+
+    def call(self, operation: Operation, send):
+        """Runs `send`, hedging it with a second attempt if it is slow.
+
+        :param send: zero-argument callable performing one attempt and
+            returning a `RESTResponse`.
+        """
+        self.budget.deposit()
+        if not self._reserve():
+            return self._timed(operation, send)
+        started = threading.Event()
+        primary = self._submit(operation, send, started)
+        # the delay counts from the start of the attempt, not its submission
+        started.wait()
+        done, _ = wait([primary], timeout=self.delay_for(operation))
+        if done or not self._reserve():
+            return primary.result()
+        if not self.budget.try_withdraw():
+            self._unreserve()
+            return primary.result()
+
+        with self._lock:
+            self.hedges_sent += 1
+        hedge = self._submit(operation, send, threading.Event())
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                if future is hedge:
+                    with self._lock:
+                        self.hedges_won += 1
+                for loser in (done | pending) - {future}:
+                    loser.add_done_callback(_discard)
+                return future.result()
+        assert error is not None
+        raise error
+
+
+def _discard(future: 'Future[Any]') -> None:
+    # closing drops the connection instead of reading the rest of a body
+    # nobody wants on a pool worker
+    if future.exception() is None:
+        try:
+            future.result().response.close()
+        except Exception:
+            pass
@@ -0,0 +1,144 @@
+"""Cheaper `Job` objects for pollers.
+
+Pollers usually only look at ``id`` and ``status``, yet every `Job` built
+from a response validates all of its fields, including four timestamps.
+Two cheaper representations are available wherever jobs are listed or
+watched (`JobsApi.get_job_projected`, `JobsApi.list_jobs_stream`,
+`bsubio.waiter.JobWaiter`):
+
+* a projection, ``fields=('id', 'status')``: a regular `Job` built from
+  those fields only; the others are None;
+* a :class:`LazyJob`, ``lazy=True``: keeps the response's dict and
+  validates each field the first time it is read.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from pydantic import AfterValidator, TypeAdapter
+from typing_extensions import Annotated
+
+from bsubio.models.job import Job
+
+JOB_FIELDS: Tuple[str, ...] = tuple(Job.model_fields)
+"""Names of the `Job` fields, valid in projections."""
+
+_JOB_FIELDS = frozenset(JOB_FIELDS)
+
+
+_validators: Dict[str, Callable[[Any], Any]] = {}
+
+
+def _validator(name: str) -> Callable[[Any], Any]:
+    """Returns the function validating field `name` as `Job` does."""
+    validate = _validators.get(name)
+    if validate is None:
+        field = Job.model_fields[name]
+        checks: Optional[List[Callable[..., Any]]] = []
+        for decorator in Job.__pydantic_decorators__.field_validators.values():
+            if name in decorator.info.fields:
+                if checks is None or decorator.info.mode != 'after':
+                    checks = None
+                    break
+                checks.append(decorator.func)
+        if checks is None:
+            # validators that see the raw input: validate through the model
+            def validate(value: Any) -> Any:
+                return getattr(Job.model_validate({name: value}), name)
+        else:
+            validators = [AfterValidator(check) for check in checks]
+            annotated: Any = Annotated[(field.annotation, field, *validators)]
+            validate = TypeAdapter(annotated).validate_python
+        _validators[name] = validate
+    return validate
+
+
+def _check_fields(fields: Iterable[str]) -> Tuple[str, ...]:
+    fields = tuple(fields)
+    unknown = [name for name in fields if name not in _JOB_FIELDS]
+    if unknown:
+        raise ValueError('unknown Job fields: %s' % ', '.join(unknown))
+    return fields
+
+
+class LazyJob:
+    """A `Job` whose fields are validated on first access.
+
+    Reading a field validates it exactly as `Job` would and caches the
+    result; fields missing from the response read as None.
+
+    :param raw: the job's dict as found in the response.
+    :param fields: if given, only these fields are kept.
+    """
+
+    __slots__ = ('_raw', '_values')
+
+    def __init__(self, raw: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> None:
+        if fields is not None:
+            raw = {name: raw[name] for name in _check_fields(fields) if name in raw}
+        self._raw = raw
+        self._values: Dict[str, Any] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in _JOB_FIELDS:
+            raise AttributeError("'LazyJob' object has no attribute %r" % name)
+        values = self._values
+        if name not in values:
+            value = self._raw.get(name)
+            if value is not None:
+                value = _validator(name)(value)
+            values[name] = value
+        return values[name]
+
+    def to_job(self) -> Job:
+        """Returns a fully validated `Job`."""
+        job = Job.from_dict(self._raw)
+        assert job is not None
+        return job
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the job's fields as found in the response."""
+        return dict(self._raw)
+
+    def __repr__(self) -> str:
+        return 'LazyJob(id=%r, status=%r)' % (self._raw.get('id'), self._raw.get('status'))
+
+
+def job_builder(
+    fields: Optional[Iterable[str]] = None, lazy: bool = False
+) -> Callable[[Dict[str, Any]], Any]:
+    """Returns the function building a job from its dict.
+
+    :param fields: build only these `Job` fields; all by default.
+    :param lazy: build :class:`LazyJob` objects.
+    """
+    if lazy:
+        return lambda raw: LazyJob(raw, fields)
+    if fields is None:
+        return Job.from_dict
+    fields = _check_fields(fields)
+    validate = Job.model_validate
+    return lambda raw: validate({name: raw[name] for name in fields if name in raw})
+
+
+class ProjectedJobResponse:
+    """Response type of `JobsApi.get_job_projected`, deserialized like the
+    generated models: ``data`` is the job built by `build`, or None."""
+
+    build: Callable[[Dict[str, Any]], Any] = Job.from_dict
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+
+    @classmethod
+    def from_dict(cls, obj: Optional[Dict[str, Any]]) -> 'ProjectedJobResponse':
+        raw = obj.get('data') if isinstance(obj, dict) else None
+        return cls(None if raw is None else cls.build(raw))
+
+
+def projected_job_response(
+    fields: Optional[Tuple[str, ...]] = None, lazy: bool = False
+) -> Type[ProjectedJobResponse]:
+    """Returns the :class:`ProjectedJobResponse` subclass building jobs with
+    ``job_builder(fields, lazy)``."""
+    build = job_builder(fields, lazy)
+    return type('ProjectedJobResponse', (ProjectedJobResponse,), {'build': staticmethod(build)})
@@ -0,0 +1,318 @@
+"""In-process client metrics with a Prometheus text-format export.
+
+A :class:`MetricsRegistry` on `Configuration.metrics` is fed the
+`bsubio.timing.RequestTiming` record of every HTTP attempt made by
+`ApiClient.call_api`, so retries (both `RetryEngine` attempts and retries
+performed inside urllib3) are counted without wrapping API calls by hand.
+It keeps:
+
+* a log-bucketed latency histogram per operation and status code;
+* request, error and retry counters;
+* request and response bytes per operation;
+* the utilisation of the connection pools of the clients it is bound to.
+
+``registry.snapshot()`` returns the values as plain Python objects and
+``registry.to_prometheus()`` renders them in the Prometheus text format.
+"""
+
+import math
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from bsubio.timing import RequestTiming
+
+
+class LogHistogram:
+    """Histogram with logarithmically spaced bucket bounds.
+
+    Bucket ``i`` counts values up to ``lowest * growth ** i``, so every
+    quantile estimate is within a factor `growth` of the true value. The
+    defaults cover 0.5 ms to ~9 minutes with a relative error below 19%.
+
+    :param lowest: upper bound of the first bucket.
+    :param growth: ratio between consecutive bucket bounds.
+    :param buckets: number of finite buckets; larger values fall in the
+        overflow bucket.
+    """
+
+    def __init__(
+        self, lowest: float = 0.0005, growth: float = 2 ** 0.25, buckets: int = 80
+    ) -> None:
+        self.lowest = lowest
+        self.growth = growth
+        self.bounds = [lowest * growth ** i for i in range(buckets)]
+        self.counts = [0] * (buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._log_growth = math.log(growth)
+
+    def _index(self, value: float) -> int:
+        if value <= self.lowest:
+            return 0
+        index = math.ceil(math.log(value / self.lowest) / self._log_growth - 1e-9)
+        return min(index, len(self.bounds))
+
+    def record(self, value: float) -> None:
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'LogHistogram') -> None:
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Returns the upper bound of the bucket holding quantile `q`."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                if i == len(self.bounds):
+                    return self.max
+                return min(self.bounds[i], self.max)
+        return self.max
+
+    def cumulative(self, stride: int = 1) -> List[Tuple[float, int]]:
+        """Returns ``(upper_bound, cumulative_count)`` for every `stride`-th
+        bucket, ending with ``(inf, count)``."""
+        result = []
+        seen = 0
+        for i, bound in enumerate(self.bounds):
+            seen += self.counts[i]
+            if i % stride == 0:
+                result.append((bound, seen))
+        result.append((math.inf, self.count))
+        return result
+
+
+_SeriesKey = Tuple[str, str]
+
+
+def _status_label(timing: RequestTiming) -> str:
+    return str(timing.status) if timing.status is not None else 'error'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels: str) -> str:
+    return '{%s}' % ','.join('%s="%s"' % (k, _escape(str(v))) for k, v in labels.items())
+
+
+def _format_float(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Collects latency histograms and counters from `RequestTiming` records.
+
+    :param namespace: prefix of the exported metric names.
+    :param histogram_factory: creates the histogram of each new series.
+    :param prometheus_bucket_stride: only every n-th histogram bucket is
+        exported to Prometheus (with the default histogram, 4 exports one
+        bucket per doubling of latency); quantiles are still computed from
+        all buckets.
+    """
+
+    def __init__(
+        self,
+        namespace: str = 'bsubio_client',
+        histogram_factory: Callable[[], LogHistogram] = LogHistogram,
+        prometheus_bucket_stride: int = 4,
+    ) -> None:
+        self.namespace = namespace
+        self.histogram_factory = histogram_factory
+        self.prometheus_bucket_stride = prometheus_bucket_stride
+        self._latency: Dict[_SeriesKey, LogHistogram] = {}
+        self._errors: Dict[_SeriesKey, int] = {}
+        self._retries: Dict[_SeriesKey, int] = {}
+        self._bytes_sent: Dict[str, int] = {}
+        self._bytes_received: Dict[str, int] = {}
+        self._pool_managers: 'weakref.WeakSet[Any]' = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def observe(self, timing: RequestTiming) -> None:
+        """Records one attempt; usable as a `timing_callback`."""
+        operation = timing.operation
+        key = (operation, _status_label(timing))
+        with self._lock:
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = self.histogram_factory()
+            histogram.record(timing.total or 0.0)
+            if timing.error is not None:
+                error_key = (operation, type(timing.error).__name__)
+                self._errors[error_key] = self._errors.get(error_key, 0) + 1
+            if timing.attempt > 1:
+                retry_key = (operation, 'client')
+                self._retries[retry_key] = self._retries.get(retry_key, 0) + 1
+            if timing.transport_retries:
+                retry_key = (operation, 'transport')
+                self._retries[retry_key] = (
+                    self._retries.get(retry_key, 0) + timing.transport_retries
+                )
+            self._bytes_sent[operation] = self._bytes_sent.get(operation, 0) + timing.bytes_sent
+            self._bytes_received[operation] = (
+                self._bytes_received.get(operation, 0) + timing.bytes_received
+            )
+
+    def callback(
+        self, chained: Optional[Callable[[RequestTiming], None]] = None
+    ) -> Callable[[RequestTiming], None]:
+        """Returns a timing callback feeding this registry, then `chained`."""
+        if chained is None:
+            return self.observe
+
+        def callback(timing: RequestTiming) -> None:
+            self.observe(timing)
+            chained(timing)
+
+        return callback
+
+    def bind_pool_manager(self, pool_manager) -> None:
+        """Includes the pools of `pool_manager` in the utilisation gauges."""
+        if hasattr(pool_manager, 'pools'):
+            self._pool_managers.add(pool_manager)
+
+    def histogram(self, operation: str, statuses: Optional[Iterable[str]] = None) -> LogHistogram:
+        """Returns the latencies of `operation` merged over `statuses`
+        (status codes as strings, or ``'error'``; all when None)."""
+        merged = self.histogram_factory()
+        wanted = None if statuses is None else {str(s) for s in statuses}
+        with self._lock:
+            for (op, status), histogram in self._latency.items():
+                if op == operation and (wanted is None or status in wanted):
+                    merged.merge(histogram)
+        return merged
+
+    def pool_stats(self) -> Dict[str, Dict[str, int]]:
+        """Returns connection pool utilisation keyed by ``scheme://host:port``."""
+        stats: Dict[str, Dict[str, int]] = {}
+        for pool_manager in list(self._pool_managers):
+            pools = pool_manager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None or pool.pool is None:
+                    continue
+                slots = list(pool.pool.queue)
+                name = '%s://%s:%s' % (pool.scheme, pool.host, pool.port)
+                entry = stats.setdefault(
+                    name, {'max': 0, 'in_use': 0, 'idle': 0, 'opened': 0, 'requests': 0}
+                )
+                entry['max'] += pool.pool.maxsize
+                entry['in_use'] += max(0, pool.pool.maxsize - len(slots))
+                entry['idle'] += sum(1 for conn in slots if conn is not None)
+                entry['opened'] += pool.num_connections
+                entry['requests'] += pool.num_requests
+        return stats
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns all metrics as plain Python objects."""
+        with self._lock:
+            latency = {
+                key: {
+                    'count': h.count,
+                    'sum': h.sum,
+                    'max': h.max,
+                    'p50': h.quantile(0.5),
+                    'p90': h.quantile(0.9),
+                    'p99': h.quantile(0.99),
+                }
+                for key, h in self._latency.items()
+            }
+            snapshot = {
+                'latency': latency,
+                'errors': dict(self._errors),
+                'retries': dict(self._retries),
+                'bytes_sent': dict(self._bytes_sent),
+                'bytes_received': dict(self._bytes_received),
+            }
+        snapshot['pools'] = self.pool_stats()
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latency.clear()
+            self._errors.clear()
+            self._retries.clear()
+            self._bytes_sent.clear()
+            self._bytes_received.clear()
+
+    def to_prometheus(self) -> str:
+        """Renders the metrics in the Prometheus text exposition format."""
+        ns = self.namespace
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> str:
+            lines.append('# HELP %s_%s %s' % (ns, name, help_text))
+            lines.append('# TYPE %s_%s %s' % (ns, name, kind))
+            return '%s_%s' % (ns, name)
+
+        with self._lock:
+            latency = sorted(self._latency.items())
+            name = header('request_duration_seconds', 'histogram',
+                          'Duration of HTTP attempts by operation and status.')
+            for (operation, status), histogram in latency:
+                for bound, count in histogram.cumulative(self.prometheus_bucket_stride):
+                    lines.append('%s_bucket%s %d' % (
+                        name,
+                        _labels(operation=operation, status=status, le=_format_float(bound)),
+                        count,
+                    ))
+                labels = _labels(operation=operation, status=status)
+                lines.append('%s_sum%s %s' % (name, labels, _format_float(histogram.sum)))
+                lines.append('%s_count%s %d' % (name, labels, histogram.count))
+
+            name = header('requests_total', 'counter', 'HTTP attempts by operation and status.')
+            for (operation, status), histogram in latency:
+                lines.append('%s%s %d' % (
+                    name, _labels(operation=operation, status=status), histogram.count
+                ))
+
+            name = header('errors_total', 'counter',
+                          'Attempts that failed without a response, by exception type.')
+            for (operation, error), count in sorted(self._errors.items()):
+                lines.append('%s%s %d' % (name, _labels(operation=operation, error=error), count))
+
+            name = header('retries_total', 'counter',
+                          'Retries by the retry engine (client) and inside urllib3 (transport).')
+            for (operation, layer), count in sorted(self._retries.items()):
+                lines.append('%s%s %d' % (name, _labels(operation=operation, layer=layer), count))
+
+            name = header('request_bytes_total', 'counter', 'Request bytes written to the socket.')
+            for operation, count in sorted(self._bytes_sent.items()):
+                lines.append('%s%s %d' % (name, _labels(operation=operation), count))
+
+            name = header('response_bytes_total', 'counter', 'Response body bytes received.')
+            for operation, count in sorted(self._bytes_received.items()):
+                lines.append('%s%s %d' % (name, _labels(operation=operation), count))
+
+        pools = sorted(self.pool_stats().items())
+        for field, kind, help_text in (
+            ('max', 'gauge', 'Maximum pooled connections.'),
+            ('in_use', 'gauge', 'Connections checked out of the pool.'),
+            ('idle', 'gauge', 'Open connections waiting in the pool.'),
+            ('opened', 'counter', 'Connections opened.'),
+            ('requests', 'counter', 'Requests sent through the pool.'),
+        ):
+            suffix = {'opened': 'connections_opened_total', 'requests': 'requests_total'}.get(
+                field, 'connections_' + field
+            )
+            name = header('pool_' + suffix, kind, help_text)
+            for pool, entry in pools:
+                lines.append('%s%s %d' % (name, _labels(pool=pool), entry[field]))
+
+        return '\n'.join(lines) + '\n'
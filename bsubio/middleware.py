@@ -0,0 +1,416 @@
+"""Request/response middleware for `ApiClient`.
+
+A middleware wraps every HTTP attempt made through `ApiClient.call_api`
+and, optionally, the deserialization of its response:
+
+.. code-block:: python
+
+    class AddHeader(Middleware):
+        def handle(self, request, call_next):
+            request.headers['X-Team'] = 'ingest'
+            return call_next(request)
+
+    config.middleware = [AddHeader()]
+
+`handle` receives a :class:`Request` (operation, method, URL, serialized
+headers and body) and returns the raw `RESTResponse`; `deserialize`
+receives that response (whose ``request`` attribute is the attempt that
+produced it) and returns the `ApiResponse`. The plain API methods release
+the body once it is parsed, so ``raw_data`` is only filled in on
+``*_with_http_info`` calls. Middleware can also implement `handle_async`,
+used by `ApiClient.call_api_async`; middleware without it runs on a worker
+thread on that path.
+
+The chain is compiled once when the `ApiClient` is created: user
+middleware from `Configuration.middleware` (outermost first), followed by
+the built-in features enabled on the configuration, in this order:
+
+retries → hedging → circuit breaker → rate limit → concurrency limit →
+tracing → timing/metrics/request log → transport.
+
+A client without any middleware calls the transport directly.
+"""
+
+import asyncio
+import contextvars
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+from urllib.parse import urlsplit
+
+from bsubio.operations import Operation, job_id_from_url
+from bsubio.timing import (
+    RequestTiming, activate as activate_timing, deactivate as deactivate_timing, time_response,
+)
+
+
+class Request:
+    """A serialized request on its way through the middleware chain.
+
+    The first attempt is the request itself; retries and hedges send
+    copies made by :meth:`next_attempt`.
+    """
+
+    __slots__ = (
+        'operation', 'method', 'url', 'headers', 'body', 'post_params',
+        'timeout', 'job_id', 'attempt', 'sent_at', '_attempts',
+    )
+
+    def __init__(
+        self,
+        operation: Operation,
+        method: str,
+        url: str,
+        headers: Dict[str, Any],
+        body: Any = None,
+        post_params: Any = None,
+        timeout: Any = None,
+    ) -> None:
+        self.operation = operation
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.body = body
+        self.post_params = post_params
+        self.timeout = timeout
+        self.job_id = job_id_from_url(url)
+        self.attempt = 1
+        self.sent_at: Optional[float] = None
+        """`time.monotonic()` when the transport started sending."""
+        self._attempts = itertools.count(2)
+
+    def next_attempt(self) -> 'Request':
+        """Returns a copy representing the next attempt of this request."""
+        copy = Request.__new__(Request)
+        for name in Request.__slots__:
+            setattr(copy, name, getattr(self, name))
+        copy.attempt = next(self._attempts)
+        copy.sent_at = None
+        return copy
+
+    def __repr__(self) -> str:
+        return 'Request(%s %s %s, attempt=%d)' % (
+            self.operation.name, self.method, urlsplit(self.url).path, self.attempt
+        )
+
+
+Handler = Callable[[Request], Any]
+AsyncHandler = Callable[[Request], Awaitable[Any]]
+
+
+class Middleware:
+    """Base class of middleware; every hook defaults to passing through."""
+
+    def handle(self, request: Request, call_next: Handler):
+        return call_next(request)
+
+    async def handle_async(self, request: Request, call_next: AsyncHandler):
+        return await call_next(request)
+
+    def deserialize(self, response_data, response_types_map, call_next):
+        return call_next(response_data, response_types_map)
+
+
+def _overrides(middleware: Middleware, name: str) -> bool:
+    return getattr(type(middleware), name) is not getattr(Middleware, name)
+
+
+def _link(middleware: Middleware, call_next: Handler) -> Handler:
+    handle = middleware.handle
+
+    def handler(request: Request):
+        return handle(request, call_next)
+
+    return handler
+
+
+def _link_async(middleware: Middleware, call_next: AsyncHandler) -> AsyncHandler:
+    handle = middleware.handle_async
+
+    async def handler(request: Request):
+        return await handle(request, call_next)
+
+    return handler
+
+
+def _link_deserialize(middleware: Middleware, call_next):
+    deserialize = middleware.deserialize
+
+    def handler(response_data, response_types_map):
+        return deserialize(response_data, response_types_map, call_next)
+
+    return handler
+
+
+def compile_chain(middleware: Sequence[Middleware], endpoint: Handler) -> Handler:
+    """Nests `middleware` (outermost first) around `endpoint`."""
+    handler = endpoint
+    for item in reversed(middleware):
+        if _overrides(item, 'handle'):
+            handler = _link(item, handler)
+    return handler
+
+
+def compile_async_chain(middleware: Sequence[Middleware], endpoint: Handler) -> AsyncHandler:
+    """Builds the chain of `ApiClient.call_api_async`.
+
+    Middleware implementing `handle_async` runs on the event loop; the
+    others are compiled around `endpoint` and run on a worker thread.
+    """
+    native = [item for item in middleware if _overrides(item, 'handle_async')]
+    threaded = compile_chain(
+        [item for item in middleware if not _overrides(item, 'handle_async')], endpoint
+    )
+
+    async def in_thread(request: Request):
+        return await asyncio.to_thread(threaded, request)
+
+    handler: AsyncHandler = in_thread
+    for item in reversed(native):
+        handler = _link_async(item, handler)
+    return handler
+
+
+def compile_deserialize_chain(middleware: Sequence[Middleware], endpoint):
+    """Nests the `deserialize` hooks of `middleware` around `endpoint`."""
+    handler = endpoint
+    for item in reversed(middleware):
+        if _overrides(item, 'deserialize'):
+            handler = _link_deserialize(item, handler)
+    return handler
+
+
+class RetryMiddleware(Middleware):
+    """Runs `Configuration.retry_engine`."""
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+
+    def handle(self, request: Request, call_next: Handler):
+        attempts = iter((request,))
+
+        def send():
+            return call_next(next(attempts, None) or request.next_attempt())
+
+        return self.engine.call(request.operation, send, request.headers)
+
+
+class HedgingMiddleware(Middleware):
+    """Runs `Configuration.hedging` for the operations it applies to."""
+
+    def __init__(self, policy) -> None:
+        self.policy = policy
+
+    def handle(self, request: Request, call_next: Handler):
+        if not self.policy.applies_to(request.operation):
+            return call_next(request)
+        if request.timeout is None:
+            request.timeout = self.policy.attempt_timeout
+        attempts = iter((request,))
+
+        def send():
+            return call_next(next(attempts, None) or request.next_attempt())
+
+        return self.policy.call(request.operation, send)
+
+
+class CircuitBreakerMiddleware(Middleware):
+    """Applies `Configuration.circuit_breakers` per host and family."""
+
+    def __init__(self, registry) -> None:
+        self.registry = registry
+
+    def handle(self, request: Request, call_next: Handler):
+        breaker = self.registry.get(urlsplit(request.url).netloc, request.operation.family)
+        token = breaker.before_call()
+        status = None
+        try:
+            response = call_next(request)
+            status = response.status
+            return response
+        finally:
+            latency = None
+            if request.sent_at is not None:
+                latency = time.monotonic() - request.sent_at
+            breaker.record(status is not None and status < 500, latency, token)
+
+
+# the request whose rate limit was already waited for on the event loop;
+# asyncio.to_thread copies it into the worker thread
+_rate_limited: contextvars.ContextVar[Optional[Request]] = contextvars.ContextVar(
+    'bsubio_rate_limited', default=None
+)
+
+
+class RateLimitMiddleware(Middleware):
+    """Applies `Configuration.rate_limiter` before every attempt."""
+
+    def __init__(self, limiter) -> None:
+        self.limiter = limiter
+
+    def handle(self, request: Request, call_next: Handler):
+        if _rate_limited.get() is not request:
+            self.limiter.acquire(request.operation)
+        return call_next(request)
+
+
+class AsyncRateLimitMiddleware(Middleware):
+    """Waits for `Configuration.rate_limiter` on the event loop before the
+    first attempt of `ApiClient.call_api_async` calls, so waiting callers
+    do not hold worker threads; `RateLimitMiddleware` paces their retries
+    and hedges."""
+
+    def __init__(self, limiter) -> None:
+        self.limiter = limiter
+
+    async def handle_async(self, request: Request, call_next: AsyncHandler):
+        await self.limiter.acquire_async(request.operation)
+        token = _rate_limited.set(request)
+        try:
+            return await call_next(request)
+        finally:
+            _rate_limited.reset(token)
+
+
+class ConcurrencyLimitMiddleware(Middleware):
+    """Applies `Configuration.concurrency_limiter`."""
+
+    def __init__(self, limiter) -> None:
+        self.limiter = limiter
+
+    def handle(self, request: Request, call_next: Handler):
+        limiter = self.limiter
+        if not limiter.applies_to(request.operation):
+            return call_next(request)
+        key = limiter.baseline_key(request.operation, _payload_size(request))
+        slot = limiter.acquire()
+        status = None
+        try:
+            response = call_next(request)
+            status = response.status
+            return response
+        finally:
+            congested = status is None or limiter.is_congestion_status(status)
+            limiter.release(slot, congested, key)
+
+
+def _payload_size(request: Request) -> int:
+    """Returns the size of the raw body or uploaded files of `request`;
+    JSON bodies count as 0."""
+    size = 0
+    body = request.body
+    if isinstance(body, str):
+        size += len(body)
+    elif body is not None and not isinstance(body, (dict, list)):
+        try:
+            size += memoryview(body).nbytes
+        except TypeError:
+            pass
+    for _, value in request.post_params or ():
+        if isinstance(value, tuple):
+            value = value[1]
+        try:
+            size += len(value) if isinstance(value, str) else memoryview(value).nbytes
+        except TypeError:
+            pass
+    return size
+
+
+class TracingMiddleware(Middleware):
+    """Opens the client span of every attempt and reports job statuses to
+    `Configuration.tracer`."""
+
+    def __init__(self, tracer) -> None:
+        self.tracer = tracer
+
+    def handle(self, request: Request, call_next: Handler):
+        tracer = self.tracer
+        parent = tracer.parent_context(request.job_id)
+        span = tracer.start_call(
+            request.operation, request.method, request.url, request.attempt, parent
+        )
+        request.headers = tracer.inject(span, request.headers)
+        status = None
+        error = None
+        try:
+            response = call_next(request)
+            status = response.status
+            return response
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            tracer.end_call(span, status, error)
+
+    def deserialize(self, response_data, response_types_map, call_next):
+        api_response = call_next(response_data, response_types_map)
+        if api_response.data is not None:
+            self.tracer.observe_response(api_response.data)
+        return api_response
+
+
+class TimingMiddleware(Middleware):
+    """Produces a `RequestTiming` record per attempt for the timing
+    callback, metrics registry and request logger of the configuration."""
+
+    def __init__(self, timing_callback=None, metrics=None, request_logger=None) -> None:
+        if metrics is not None:
+            timing_callback = metrics.callback(timing_callback)
+        self.timing_callback = timing_callback
+        self.request_logger = request_logger
+
+    def handle(self, request: Request, call_next: Handler):
+        callback = self.timing_callback
+        request_logger = self.request_logger
+        if request_logger is not None and request_logger.active():
+            callback = request_logger.callback(callback)
+        if callback is None:
+            return call_next(request)
+        timing = RequestTiming(
+            request.operation.name, request.method, urlsplit(request.url).path,
+            job_id=request.job_id,
+            attempt=request.attempt,
+            callback=callback,
+        )
+        token = activate_timing(timing)
+        try:
+            response = call_next(request)
+            timing.response_started(response.status)
+            history = getattr(getattr(response.response, 'retries', None), 'history', None)
+            if history:
+                timing.transport_retries = len(history)
+            # the record is completed once the body is read or released
+            time_response(response.response, timing)
+            return response
+        except BaseException as e:
+            timing.finish(error=e)
+            raise
+        finally:
+            deactivate_timing(token)
+
+
+def builtin_middleware(configuration) -> List[Middleware]:
+    """Returns the middleware for the features enabled on `configuration`."""
+    chain: List[Middleware] = []
+    if configuration.retry_engine is not None:
+        chain.append(RetryMiddleware(configuration.retry_engine))
+    if configuration.hedging is not None:
+        chain.append(HedgingMiddleware(configuration.hedging))
+    if configuration.circuit_breakers is not None:
+        chain.append(CircuitBreakerMiddleware(configuration.circuit_breakers))
+    if configuration.rate_limiter is not None:
+        chain.append(RateLimitMiddleware(configuration.rate_limiter))
+        chain.append(AsyncRateLimitMiddleware(configuration.rate_limiter))
+    if configuration.concurrency_limiter is not None:
+        chain.append(ConcurrencyLimitMiddleware(configuration.concurrency_limiter))
+    if configuration.tracer is not None:
+        chain.append(TracingMiddleware(configuration.tracer))
+    if (
+        configuration.timing_callback is not None
+        or configuration.metrics is not None
+        or configuration.request_logger is not None
+    ):
+        chain.append(TimingMiddleware(
+            configuration.timing_callback, configuration.metrics, configuration.request_logger
+        ))
+    return chain
@@ -0,0 +1,311 @@
+"""A local, incrementally synced index of the account's jobs.
+
+Questions like "which of my jobs failed in the last hour, by type" used to
+mean paging `list_jobs` over the whole account. A :class:`JobMirror` keeps
+the jobs in an SQLite database (WAL mode, so dashboards in other processes
+can read while a scheduler syncs) with indexes on status, type, time and
+size, and answers such queries locally:
+
+.. code-block:: python
+
+    mirror = JobMirror('/var/lib/bsubio/jobs.db', jobs_api)
+    mirror.sync()
+    failed = mirror.counts('type', status='failed', since=time.time() - 3600)
+
+`list_jobs` can only filter by status and returns at most 100 jobs, so
+:meth:`JobMirror.sync` fetches the newest page of every status and keeps
+a per-status ``updated_at`` watermark:
+
+* rows are only rewritten when the listed ``updated_at`` is newer than the
+  mirrored one;
+* a full page whose jobs are all newer than the status watermark (or any
+  full page on the first sync) may hide further jobs; such statuses are
+  reported in `SyncResult.truncated`;
+* mirrored jobs that are not finished or failed and did not show up in any
+  listing are refreshed with `get_job` (and dropped once deleted), at most
+  `max_refreshes` per sync: those not refreshed for the longest first,
+  then the oldest ``updated_at``. The rest are counted in
+  `SyncResult.deferred` and refreshed by later syncs.
+
+Finished and failed jobs never change again, so steady-state syncs cost one
+`list_jobs` call per status plus one `get_job` per job that changed status
+out of sight, up to `max_refreshes`.
+"""
+
+import datetime
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from bsubio.exceptions import NotFoundException
+from bsubio.models.job import Job
+from bsubio.operations import JOB_STATUSES, TERMINAL_JOB_STATUSES
+
+TimeBound = Union[datetime.datetime, float, None]
+
+TIME_COLUMNS = ('created_at', 'updated_at', 'finished_at')
+"""Columns accepted as `time_column` by the query methods."""
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    type TEXT,
+    data_size INTEGER,
+    created_at REAL,
+    updated_at REAL,
+    finished_at REAL,
+    job TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_type_created ON jobs (type, created_at);
+CREATE INDEX IF NOT EXISTS jobs_created ON jobs (created_at);
+CREATE INDEX IF NOT EXISTS jobs_updated ON jobs (updated_at);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished_at);
+CREATE INDEX IF NOT EXISTS jobs_size ON jobs (data_size);
+CREATE TABLE IF NOT EXISTS watermarks (
+    status TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+'''
+
+_UPSERT = '''
+INSERT INTO jobs (id, status, type, data_size, created_at, updated_at, finished_at, job)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    status = excluded.status, type = excluded.type, data_size = excluded.data_size,
+    created_at = excluded.created_at, updated_at = excluded.updated_at,
+    finished_at = excluded.finished_at, job = excluded.job
+WHERE jobs.updated_at IS NULL OR excluded.updated_at IS NULL
+    OR excluded.updated_at > jobs.updated_at
+'''
+
+
+def _epoch(value: TimeBound) -> Optional[float]:
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+def _row(job: Job) -> Tuple[Any, ...]:
+    return (
+        str(job.id), job.status, job.type, job.data_size,
+        _epoch(job.created_at), _epoch(job.updated_at), _epoch(job.finished_at),
+        job.model_dump_json(by_alias=True, exclude_none=True),
+    )
+
+
+class SyncResult(NamedTuple):
+    """Outcome of :meth:`JobMirror.sync`."""
+
+    changed: int
+    """Jobs inserted or updated."""
+    removed: int
+    """Jobs that no longer exist on the server."""
+    truncated: Tuple[str, ...]
+    """Statuses whose newest page may not have covered every change."""
+    deferred: int
+    """Unlisted unfinished jobs left for later syncs by `max_refreshes`."""
+
+
+class JobMirror:
+    """SQLite mirror of the jobs visible to `jobs_api`.
+
+    :param path: database file; created if missing. ``':memory:'`` keeps
+        the mirror in memory.
+    :param jobs_api: API used by :meth:`sync`; None opens the mirror for
+        queries only.
+    :param statuses: statuses listed on every sync.
+    :param page_size: `limit` passed to `list_jobs` (at most 100).
+    :param max_refreshes: `get_job` calls per sync for unfinished jobs
+        missing from the listings; None refreshes all of them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        jobs_api=None,
+        statuses: Iterable[str] = JOB_STATUSES,
+        page_size: int = 100,
+        max_refreshes: Optional[int] = 100,
+    ) -> None:
+        self.jobs_api = jobs_api
+        self.statuses = tuple(statuses)
+        self.page_size = page_size
+        self.max_refreshes = max_refreshes
+        self._syncs = 0
+        # job id -> number of the sync that last refreshed it
+        self._refreshed_in: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode = WAL')
+        self._db.execute('PRAGMA synchronous = NORMAL')
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> 'JobMirror':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def sync(self) -> SyncResult:
+        """Fetches changes from the API into the mirror."""
+        if self.jobs_api is None:
+            raise ValueError('JobMirror was opened without a jobs_api')
+        pages = {}
+        for status in self.statuses:
+            response = self.jobs_api.list_jobs(status=status, limit=self.page_size)
+            pages[status] = (response.data.jobs if response.data else None) or []
+        seen = {str(job.id) for jobs in pages.values() for job in jobs}
+
+        with self._lock:
+            self._syncs += 1
+            sync = self._syncs
+            # NULLs sort first, so jobs without updated_at count as oldest
+            stale = [
+                job_id for (job_id,) in self._db.execute(
+                    'SELECT id FROM jobs WHERE status IS NULL OR status NOT IN (%s)'
+                    ' ORDER BY updated_at' % ', '.join('?' * len(TERMINAL_JOB_STATUSES)),
+                    tuple(TERMINAL_JOB_STATUSES),
+                )
+                if job_id not in seen
+            ]
+            # jobs refreshed by recent syncs go to the back; the sort is
+            # stable, so ties stay in updated_at order
+            self._refreshed_in = {
+                job_id: self._refreshed_in.get(job_id, 0) for job_id in stale
+            }
+            stale.sort(key=self._refreshed_in.__getitem__)
+            deferred = 0
+            if self.max_refreshes is not None and len(stale) > self.max_refreshes:
+                deferred = len(stale) - self.max_refreshes
+                del stale[self.max_refreshes:]
+            for job_id in stale:
+                self._refreshed_in[job_id] = sync
+        refreshed, removed = [], []
+        for job_id in stale:
+            try:
+                refreshed.append(self.jobs_api.get_job(job_id).data)
+            except NotFoundException:
+                removed.append((job_id,))
+
+        rows = [_row(job) for jobs in pages.values() for job in jobs]
+        rows += [_row(job) for job in refreshed if job is not None]
+        with self._lock, self._db:
+            self._db.execute('BEGIN IMMEDIATE')
+            watermarks = dict(self._db.execute('SELECT status, updated_at FROM watermarks'))
+            truncated = []
+            for status, jobs in pages.items():
+                updated = [
+                    epoch for epoch in (_epoch(job.updated_at) for job in jobs)
+                    if epoch is not None
+                ]
+                if not updated:
+                    continue
+                watermark = watermarks.get(status)
+                full = len(jobs) >= self.page_size
+                if full and (watermark is None or min(updated) > watermark):
+                    truncated.append(status)
+                if watermark is not None:
+                    updated.append(watermark)
+                self._db.execute(
+                    'INSERT OR REPLACE INTO watermarks VALUES (?, ?)', (status, max(updated))
+                )
+            before = self._db.total_changes
+            self._db.executemany(_UPSERT, rows)
+            changed = self._db.total_changes - before
+            self._db.executemany('DELETE FROM jobs WHERE id = ?', removed)
+        return SyncResult(changed, len(removed), tuple(truncated), deferred)
+
+    def _where(
+        self,
+        status: Optional[str],
+        type: Optional[str],
+        since: TimeBound,
+        until: TimeBound,
+        min_size: Optional[int],
+        max_size: Optional[int],
+        time_column: str,
+    ) -> Tuple[str, List[Any]]:
+        if time_column not in TIME_COLUMNS:
+            raise ValueError('time_column must be one of %s' % (TIME_COLUMNS,))
+        clauses, params = [], []
+        for clause, value in (
+            ('status = ?', status),
+            ('type = ?', type),
+            ('%s >= ?' % time_column, _epoch(since)),
+            ('%s < ?' % time_column, _epoch(until)),
+            ('data_size >= ?', min_size),
+            ('data_size <= ?', max_size),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        time_column: str = 'created_at',
+        limit: Optional[int] = None,
+    ) -> List[Job]:
+        """Returns mirrored jobs matching every given filter, newest first.
+
+        :param since: inclusive lower bound of `time_column`, as a datetime
+            or a Unix timestamp.
+        :param until: exclusive upper bound of `time_column`.
+        :param min_size: inclusive lower bound of `data_size`.
+        :param max_size: inclusive upper bound of `data_size`.
+        :param time_column: one of :data:`TIME_COLUMNS`.
+        """
+        where, params = self._where(status, type, since, until, min_size, max_size, time_column)
+        sql = 'SELECT job FROM jobs%s ORDER BY %s DESC' % (where, time_column)
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [Job.model_validate_json(job) for (job,) in rows]
+
+    def counts(
+        self,
+        by: str,
+        status: Optional[str] = None,
+        type: Optional[str] = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        time_column: str = 'created_at',
+    ) -> Dict[Any, int]:
+        """Returns the number of matching jobs per ``'status'`` or ``'type'``.
+
+        Filters are those of :meth:`query`.
+        """
+        if by not in ('status', 'type'):
+            raise ValueError("by must be 'status' or 'type'")
+        where, params = self._where(status, type, since, until, min_size, max_size, time_column)
+        with self._lock:
+            return dict(self._db.execute(
+                'SELECT %s, count(*) FROM jobs%s GROUP BY %s' % (by, where, by), params
+            ))
+
+    def get(self, job_id) -> Optional[Job]:
+        """Returns the mirrored job with `job_id`, or None."""
+        with self._lock:
+            row = self._db.execute('SELECT job FROM jobs WHERE id = ?', (str(job_id),)).fetchone()
+        return Job.model_validate_json(row[0]) if row else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute('SELECT count(*) FROM jobs').fetchone()[0]
@@ -0,0 +1,120 @@
+"""Streaming multipart/form-data bodies.
+
+urllib3's `encode_multipart_formdata` (and httpx's equivalent) writes every
+part into one new `bytes` object, so uploading a file held in memory needs
+twice its size. :class:`MultipartBody` keeps the parts as they are — the
+small boundaries and part headers as bytes, the file contents as
+`memoryview` s of the caller's buffers — and the transport sends them one
+after another with an explicit Content-Length.
+
+Any buffer-protocol object can be uploaded that way: `bytes`, `bytearray`,
+`memoryview` (including slices of a memory-mapped file), `mmap` or a
+C-contiguous NumPy array. Uploads given as a file path are memory-mapped
+instead of read into memory.
+"""
+
+import mmap
+import os
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from pydantic.functional_validators import PlainValidator
+from typing_extensions import Annotated
+from urllib3.filepost import choose_boundary, iter_field_objects
+
+# parts smaller than this are copied into the surrounding headers rather
+# than sent as a separate (tiny) write
+_INLINE_LIMIT = 1 << 12
+
+
+def _validate_buffer(value: Any) -> Any:
+    if isinstance(value, str):
+        raise ValueError('expected a bytes-like object, not str')
+    try:
+        memoryview(value)
+    except TypeError:
+        raise ValueError(
+            'expected a bytes-like object, not %s' % type(value).__name__
+        ) from None
+    return value
+
+
+UploadBuffer = Annotated[Any, PlainValidator(_validate_buffer)]
+"""Argument type accepting any buffer-protocol object, unchanged."""
+
+
+class MappedFile(mmap.mmap):
+    """A mapping made by :func:`map_file`, as opposed to one passed in by
+    the caller; :func:`close_mapped_files` closes it after the upload."""
+
+
+def map_file(path: str) -> Union[bytes, MappedFile]:
+    """Maps the file at `path` read-only for uploading."""
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return b''
+        return MappedFile(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def close_mapped_files(post_params) -> None:
+    """Closes the files `ApiClient.files_parameters` mapped for
+    `post_params`.
+
+    A mapping still used by an abandoned hedged attempt cannot be closed
+    yet; it is released with the attempt's body.
+    """
+    for _, value in post_params or ():
+        if isinstance(value, tuple) and len(value) > 1 and isinstance(value[1], MappedFile):
+            try:
+                value[1].close()
+            except BufferError:
+                pass
+
+
+class MultipartBody:
+    """A multipart/form-data body sent part by part without joining it.
+
+    :param fields: form fields as accepted by
+        `urllib3.encode_multipart_formdata`; file contents may be any
+        buffer-protocol object.
+    :param boundary: multipart boundary; random by default.
+    """
+
+    __slots__ = ('chunks', 'content_type', 'length')
+
+    def __init__(self, fields, boundary: Optional[str] = None) -> None:
+        if boundary is None:
+            boundary = choose_boundary()
+        delimiter = ('--%s\r\n' % boundary).encode('latin-1')
+        chunks: List[Union[bytes, memoryview]] = []
+        head = bytearray()
+        for field in iter_field_objects(fields):
+            head += delimiter
+            head += field.render_headers().encode('utf-8')
+            data = field.data
+            if isinstance(data, (int, str)):
+                head += str(data).encode('utf-8')
+            else:
+                view = memoryview(data).cast('B')
+                if len(view) < _INLINE_LIMIT:
+                    head += view
+                else:
+                    chunks.append(bytes(head))
+                    chunks.append(view)
+                    head = bytearray()
+            head += b'\r\n'
+        head += ('--%s--\r\n' % boundary).encode('latin-1')
+        chunks.append(bytes(head))
+        self.chunks = tuple(chunks)
+        self.content_type = 'multipart/form-data; boundary=%s' % boundary
+        self.length = sum(len(chunk) for chunk in self.chunks)
+
+    def __iter__(self) -> Iterator[Union[bytes, memoryview]]:
+        # a new iterator each time, so the body can be sent again on retries
+        return iter(self.chunks)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def headers(self) -> Dict[str, str]:
+        """Returns the Content-Type and Content-Length of the body."""
+        return {'Content-Type': self.content_type, 'Content-Length': str(self.length)}
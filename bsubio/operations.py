@@ -0,0 +1,93 @@
+"""Static description of the bsub.io API operations.
+
+Cross-cutting client features (retries, rate limiting, metrics, ...) need
+to know which logical operation a request belongs to, whether it is safe
+to repeat and which endpoint family it is accounted against. The generated
+API classes only hand `ApiClient.call_api` a method and a URL, so this
+module maps those back to an :class:`Operation`.
+"""
+
+import re
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+
+class Operation(NamedTuple):
+    """A single API operation.
+
+    :param name: operation id, identical to the `JobsApi`/`OutputApi`/
+        `SystemApi` method name.
+    :param method: HTTP method.
+    :param path: URL template relative to the configured host.
+    :param family: endpoint family used to group limits and metrics:
+        ``create``, ``upload``, ``control``, ``poll`` or ``download``.
+    :param idempotent: whether repeating the request cannot change
+        server-side state a second time.
+    """
+
+    name: str
+    method: str
+    path: str
+    family: str
+    idempotent: bool
+
+
+OPERATIONS = (
+    Operation('cancel_job', 'POST', '/v1/jobs/{jobId}/cancel', 'control', False),
+    Operation('create_job', 'POST', '/v1/jobs', 'create', False),
+    Operation('delete_job', 'DELETE', '/v1/jobs/{jobId}', 'control', True),
+    Operation('get_job', 'GET', '/v1/jobs/{jobId}', 'poll', True),
+    Operation('list_jobs', 'GET', '/v1/jobs', 'poll', True),
+    Operation('submit_job', 'POST', '/v1/jobs/{jobId}/submit', 'control', False),
+    Operation('upload_job_data', 'POST', '/v1/upload/{jobId}', 'upload', False),
+    Operation('get_job_logs', 'GET', '/v1/jobs/{jobId}/logs', 'download', True),
+    Operation('get_job_output', 'GET', '/v1/jobs/{jobId}/output', 'download', True),
+    Operation('get_types', 'GET', '/v1/types', 'poll', True),
+    Operation('get_version', 'GET', '/v1/version', 'poll', True),
+)
+
+OPERATIONS_BY_NAME: Dict[str, Operation] = {op.name: op for op in OPERATIONS}
+
+UNKNOWN_OPERATION = Operation('unknown', '', '', 'other', False)
+
+JOB_STATUSES = (
+    'created', 'loaded', 'pending', 'claimed', 'preparing', 'processing', 'finished', 'failed',
+)
+"""Every `Job.status` value, in lifecycle order."""
+
+TERMINAL_JOB_STATUSES = frozenset(('finished', 'failed'))
+"""`Job.status` values after which a job no longer changes."""
+
+_PATH_PARAM = re.compile(r'\{[^}]+\}')
+
+_JOB_ID = re.compile(r'/v1/(?:jobs|upload)/([^/]+)')
+
+_MATCHERS = [
+    (
+        op.method,
+        re.compile(_PATH_PARAM.sub('[^/]+', op.path) + '$'),
+        op,
+    )
+    for op in OPERATIONS
+]
+
+
+def resolve_operation(method: str, url: str) -> Operation:
+    """Returns the operation addressed by `method` and `url`.
+
+    The host (including any base path) and query string are ignored.
+    Requests that do not correspond to a known operation resolve to
+    :data:`UNKNOWN_OPERATION`, which is treated as non-idempotent.
+    """
+    method = method.upper()
+    path = urlsplit(url).path
+    for op_method, pattern, operation in _MATCHERS:
+        if op_method == method and pattern.search(path):
+            return operation
+    return UNKNOWN_OPERATION
+
+
+def job_id_from_url(url: str) -> Optional[str]:
+    """Returns the job id embedded in a job-scoped URL, if any."""
+    match = _JOB_ID.search(urlsplit(url).path)
+    return match.group(1) if match else None
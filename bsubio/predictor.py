@@ -0,0 +1,184 @@
+"""Online prediction of job durations.
+
+Processing time correlates strongly with the processing `type` and the
+size of the input, so a :class:`DurationPredictor` keeps, per type, an
+exponentially weighted least-squares fit of ``log(duration)`` against
+``log(data_size)`` (durations of compute jobs tend to follow a power law of
+the input size). Queue wait is modelled per type as well, without the size
+term. Models are updated from completed jobs' ``claimed_at``/``finished_at``
+timestamps and are cheap enough to update on every completion.
+
+`bsubio.waiter.JobWaiter` uses :meth:`DurationPredictor.expected_completion`
+to schedule the first poll of a job near its predicted completion time.
+"""
+
+import datetime
+import math
+import statistics
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+from bsubio.operations import TERMINAL_JOB_STATUSES
+
+_UNIT_NORMAL = statistics.NormalDist()
+
+
+def _epoch(value) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.timestamp()
+
+
+class LogLinearModel:
+    """Exponentially weighted fit of ``log(y) = a + b * log(1 + x)``.
+
+    :param decay: weight kept by older samples on every update; 0.98 gives
+        an effective memory of roughly 50 jobs.
+    """
+
+    def __init__(self, decay: float = 0.98) -> None:
+        self.decay = decay
+        self.samples = 0
+        self._w = self._x = self._y = self._xx = self._xy = self._yy = 0.0
+
+    def update(self, x: float, y: float) -> None:
+        lx = math.log1p(max(0.0, x))
+        ly = math.log(max(y, 1e-3))
+        d = self.decay
+        self._w = self._w * d + 1.0
+        self._x = self._x * d + lx
+        self._y = self._y * d + ly
+        self._xx = self._xx * d + lx * lx
+        self._xy = self._xy * d + lx * ly
+        self._yy = self._yy * d + ly * ly
+        self.samples += 1
+
+    def _coefficients(self):
+        w = self._w
+        denominator = w * self._xx - self._x * self._x
+        # with (nearly) constant sizes the slope is not identifiable
+        if denominator <= 1e-9 * max(1.0, w * self._xx):
+            return self._y / w, 0.0
+        b = (w * self._xy - self._x * self._y) / denominator
+        return (self._y - b * self._x) / w, b
+
+    def stddev(self) -> float:
+        """Standard deviation of the residuals, in log space."""
+        if self.samples < 2:
+            return 0.0
+        a, b = self._coefficients()
+        w = self._w
+        sse = (
+            self._yy - 2 * a * self._y - 2 * b * self._xy
+            + a * a * w + 2 * a * b * self._x + b * b * self._xx
+        )
+        return math.sqrt(max(0.0, sse / w))
+
+    def predict(self, x: float, quantile: float = 0.5) -> float:
+        a, b = self._coefficients()
+        log_y = a + b * math.log1p(max(0.0, x))
+        if quantile != 0.5:
+            log_y += _UNIT_NORMAL.inv_cdf(quantile) * self.stddev()
+        return math.exp(log_y)
+
+
+class DurationPredictor:
+    """Predicts queue wait and processing time of jobs per processing type.
+
+    :param default_processing: processing time assumed for types without
+        any completed job.
+    :param default_queue_wait: queue wait assumed for types without any
+        claimed job.
+    :param min_samples: completed jobs of a type needed before its own
+        model is used; until then the model across all types is used.
+    :param decay: passed to every :class:`LogLinearModel`.
+    """
+
+    def __init__(
+        self,
+        default_processing: float = 5.0,
+        default_queue_wait: float = 1.0,
+        min_samples: int = 3,
+        decay: float = 0.98,
+    ) -> None:
+        self.default_processing = default_processing
+        self.default_queue_wait = default_queue_wait
+        self.min_samples = min_samples
+        self.decay = decay
+        self._processing: Dict[Optional[str], LogLinearModel] = {}
+        self._queue: Dict[Optional[str], LogLinearModel] = {}
+        self._lock = threading.Lock()
+
+    def _model(
+        self, models: Dict[Optional[str], LogLinearModel], key: Optional[str]
+    ) -> LogLinearModel:
+        model = models.get(key)
+        if model is None:
+            model = models[key] = LogLinearModel(self.decay)
+        return model
+
+    def observe(self, job: Any) -> bool:
+        """Learns from a finished `Job`; returns whether it was usable."""
+        if job.status != 'finished':
+            return False
+        claimed = _epoch(job.claimed_at)
+        finished = _epoch(job.finished_at)
+        created = _epoch(job.created_at)
+        if claimed is None or finished is None or finished < claimed:
+            return False
+        size = job.data_size or 0
+        job_type = job.type or ''
+        with self._lock:
+            for key in (job_type, None):
+                self._model(self._processing, key).update(size, finished - claimed)
+                if created is not None and claimed >= created:
+                    self._model(self._queue, key).update(0, claimed - created)
+        return True
+
+    def observe_many(self, jobs: Iterable[Any]) -> int:
+        """Learns from many jobs, e.g. a `list_jobs` page; returns the
+        number of jobs used."""
+        return sum(1 for job in jobs if self.observe(job))
+
+    def _predict(
+        self, models, job_type: Optional[str], size: int, default: float, quantile: float
+    ) -> float:
+        with self._lock:
+            model = models.get(job_type or '')
+            if model is None or model.samples < self.min_samples:
+                model = models.get(None)
+            if model is None or model.samples == 0:
+                return default
+            return model.predict(size, quantile)
+
+    def processing_time(
+        self, job_type: Optional[str], data_size: Optional[int], quantile: float = 0.5
+    ) -> float:
+        """Predicted processing time (claimed → finished) in seconds."""
+        return self._predict(
+            self._processing, job_type, data_size or 0, self.default_processing, quantile
+        )
+
+    def queue_wait(self, job_type: Optional[str], quantile: float = 0.5) -> float:
+        """Predicted queue wait (created → claimed) in seconds."""
+        return self._predict(self._queue, job_type, 0, self.default_queue_wait, quantile)
+
+    def expected_completion(self, job: Any, now: float, quantile: float = 0.5) -> float:
+        """Returns the epoch time `job` is expected to reach a terminal state.
+
+        :param now: current epoch time; the server clock is assumed to be
+            reasonably in sync with the local one.
+        """
+        if job.status in TERMINAL_JOB_STATUSES:
+            return now
+        processing = self.processing_time(job.type, job.data_size, quantile)
+        claimed = _epoch(job.claimed_at)
+        if claimed is not None:
+            return max(now, claimed + processing)
+        queue = self.queue_wait(job.type, quantile)
+        created = _epoch(job.created_at)
+        if created is not None and job.status == 'pending':
+            queue = max(0.0, created + queue - now)
+        return now + queue + processing
@@ -0,0 +1,205 @@
+"""Client-side token-bucket rate limiting.
+
+A :class:`RateLimiter` set on `Configuration.rate_limiter` is consulted by
+`ApiClient.call_api` before every attempt (retries included) and paces
+requests per endpoint family (``create``, ``upload``, ``control``,
+``poll``, ``download``; see `bsubio.operations`). `ApiClient.call_api_async`
+waits for the first attempt on the event loop.
+
+Buckets hand out reservations rather than "try again later" answers:
+a caller that finds the bucket empty is told exactly how long to wait and
+its token is already booked. Waiting callers are therefore spaced evenly at
+the configured rate instead of waking up together and oscillating around
+the limit.
+
+* :class:`TokenBucket` is shared by threads (and asyncio tasks) of one
+  process.
+* :class:`FileTokenBucket` keeps its state in a small file guarded by an
+  ``flock``, so every process on a host that points at the same path
+  draws from one budget.
+"""
+
+import asyncio
+import os
+import struct
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from bsubio.operations import Operation
+
+
+def _reserve(
+    tokens: float,
+    updated: float,
+    now: float,
+    rate: float,
+    capacity: float,
+    amount: float,
+) -> Tuple[float, float]:
+    """Refills a bucket up to `now` and books `amount` tokens.
+
+    :return: the new token count (negative while callers are queued) and
+        the number of seconds the caller has to wait for its reservation.
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+    tokens -= amount
+    wait = 0.0 if tokens >= 0 else -tokens / rate
+    return tokens, wait
+
+
+class TokenBucket:
+    """In-process token bucket.
+
+    :param rate: sustained requests per second.
+    :param capacity: burst size; defaults to one second worth of tokens.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Books `amount` tokens and returns the seconds to wait for them."""
+        with self._lock:
+            now = self._clock()
+            self._tokens, wait = _reserve(
+                self._tokens, self._updated, now, self.rate, self.capacity, amount
+            )
+            self._updated = now
+        return wait
+
+
+class FileTokenBucket:
+    """Token bucket shared by all processes on a host.
+
+    The bucket state (token count and timestamp) lives in `path`; every
+    reservation takes an exclusive ``flock`` on it for a read-modify-write
+    of 16 bytes, so the overhead is a couple of syscalls per request.
+    Processes must agree on `rate` and `capacity` for the same path.
+
+    The file is reopened in processes forked after the bucket was built:
+    an ``flock`` belongs to the open file, which a forked child would
+    otherwise share with its parent.
+
+    Only available on POSIX systems.
+
+    :param path: state file; created if missing.
+    :param rate: sustained requests per second for the whole host.
+    :param capacity: burst size; defaults to one second worth of tokens.
+    """
+
+    _STATE = struct.Struct('<dd')
+
+    def __init__(
+        self,
+        path: str,
+        rate: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        try:
+            import fcntl
+        except ImportError as e:
+            raise ImportError("FileTokenBucket requires fcntl (POSIX)") from e
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._fcntl = fcntl
+        self.path = path
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def _file(self) -> int:
+        """Returns the state file descriptor owned by this process."""
+        pid = os.getpid()
+        if pid != self._pid:
+            inherited, self._fd = self._fd, os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = pid
+            os.close(inherited)
+        return self._fd
+
+    def reserve(self, amount: float = 1.0) -> float:
+        """Books `amount` tokens and returns the seconds to wait for them."""
+        fcntl = self._fcntl
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                raw = os.pread(fd, self._STATE.size, 0)
+                now = self._clock()
+                if len(raw) == self._STATE.size:
+                    tokens, updated = self._STATE.unpack(raw)
+                else:
+                    tokens, updated = self.capacity, now
+                tokens, wait = _reserve(
+                    tokens, updated, now, self.rate, self.capacity, amount
+                )
+                os.pwrite(fd, self._STATE.pack(tokens, now), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        return wait
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class RateLimiter:
+    """Per endpoint family rate limits.
+
+    :param limits: mapping of endpoint family (``create``, ``upload``,
+        ``control``, ``poll``, ``download``) to a :class:`TokenBucket` or
+        :class:`FileTokenBucket`. Several families may share one bucket.
+    :param default: bucket for families without an entry; None leaves
+        them unlimited.
+
+    :Example:
+
+    >>> limiter = RateLimiter({
+    ...     "create": FileTokenBucket("/tmp/bsubio-create.bucket", rate=20),
+    ...     "upload": FileTokenBucket("/tmp/bsubio-upload.bucket", rate=20),
+    ...     "poll": TokenBucket(rate=50, capacity=100),
+    ... })
+    """
+
+    def __init__(self, limits: Dict[str, object], default=None) -> None:
+        self.limits = dict(limits)
+        self.default = default
+
+    def bucket_for(self, operation: Operation):
+        return self.limits.get(operation.family, self.default)
+
+    def acquire(self, operation: Operation) -> float:
+        """Blocks until `operation` may be sent; returns the time waited."""
+        bucket = self.bucket_for(operation)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, operation: Operation) -> float:
+        """Asyncio variant of :meth:`acquire`, used by
+        `ApiClient.call_api_async`."""
+        bucket = self.bucket_for(operation)
+        if bucket is None:
+            return 0.0
+        wait = bucket.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
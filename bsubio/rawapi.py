@@ -0,0 +1,54 @@
+"""Unvalidated access to the API methods.
+
+Every public method of `JobsApi`, `OutputApi` and `SystemApi` is wrapped in
+pydantic's `validate_call`, which re-validates the UUIDs, strict strings
+and timeout unions of every call. For arguments produced by our own code
+(a job id taken from a previous response, a constant type name) that is
+pure overhead. `api.raw` exposes the same methods, with the same
+signatures, without the validation:
+
+.. code-block:: python
+
+    jobs_api = JobsApi(client)
+    job = jobs_api.raw.get_job(job.id)
+
+Nothing is checked or coerced: pass values of the annotated types (a
+`UUID` or its string form for ids, `float` timeouts, a `CreateJobRequest`
+for bodies). Invalid arguments surface as server-side errors or Python
+exceptions instead of `pydantic.ValidationError`.
+"""
+
+from inspect import getattr_static
+from types import MethodType
+from typing import Any
+
+
+class RawApi:
+    """Unvalidated view of the methods of an API object.
+
+    :param api: the `JobsApi`, `OutputApi` or `SystemApi` to call.
+    """
+
+    def __init__(self, api: Any) -> None:
+        self._api = api
+
+    def __getattr__(self, name: str):
+        # getattr_static does not build the validator of a method not yet used
+        function = getattr(getattr_static(type(self._api), name, None), 'raw_function', None)
+        if function is None:
+            raise AttributeError(
+                '%s has no validated method %r' % (type(self._api).__name__, name)
+            )
+        method = MethodType(function, self._api)
+        # later lookups find the bound method without going through here
+        setattr(self, name, method)
+        return method
+
+    def __dir__(self):
+        return sorted(
+            name for name, value in vars(type(self._api)).items()
+            if hasattr(value, 'raw_function')
+        )
+
+    def __repr__(self) -> str:
+        return 'RawApi(%r)' % (self._api,)
@@ -0,0 +1,132 @@
+"""Sampled, structured request logging.
+
+`Configuration.debug` switches the urllib3 and package loggers to DEBUG
+for every request, which is unusable under production load. A
+:class:`RequestLogger` on `Configuration.request_logger` instead emits one
+record per HTTP attempt with the operation, method, path, status, duration,
+byte counts, job id and attempt number, for a sample of the requests
+and/or only for slow or failed ones. Bodies, headers and query strings
+(which carry upload tokens) are never logged.
+
+The fields are also attached to the log record as ``record.bsubio`` for
+structured (e.g. JSON) formatters. When the logger is disabled for the
+levels of every record that could be emitted, or nothing would be
+sampled, `ApiClient.call_api` does not collect anything for it.
+"""
+
+import logging
+import random
+from typing import Callable, Dict, Optional
+
+from bsubio.timing import RequestTiming
+
+_MESSAGE = '%s %s %s -> %s in %.1fms (sent=%d received=%d attempt=%d job_id=%s)'
+
+
+class RequestLogger:
+    """Decides which attempts are logged and formats them.
+
+    :param logger: destination; defaults to ``bsubio.requests``.
+    :param level: level of the emitted records.
+    :param sample_rate: fraction of ordinary requests that is logged.
+    :param slow_threshold: requests slower than this many seconds are always
+        logged; None disables the check.
+    :param slow_only: log only slow and failed requests, ignoring
+        `sample_rate`.
+    :param log_failures: always log transport errors and 5xx responses.
+    :param failure_level: level of the records of failures; defaults to
+        `level`.
+    """
+
+    def __init__(
+        self,
+        logger: Optional[logging.Logger] = None,
+        level: int = logging.INFO,
+        sample_rate: float = 1.0,
+        slow_threshold: Optional[float] = None,
+        slow_only: bool = False,
+        log_failures: bool = True,
+        failure_level: Optional[int] = None,
+        random: Callable[[], float] = random.random,
+    ) -> None:
+        self.logger = logger if logger is not None else logging.getLogger('bsubio.requests')
+        self.level = level
+        self.sample_rate = sample_rate
+        self.slow_threshold = slow_threshold
+        self.slow_only = slow_only
+        self.log_failures = log_failures
+        self.failure_level = failure_level if failure_level is not None else level
+        self._random = random
+
+    def active(self) -> bool:
+        """Whether any request could be logged right now."""
+        if self.log_failures and self.logger.isEnabledFor(self.failure_level):
+            return True
+        if not self.logger.isEnabledFor(self.level):
+            return False
+        return self.slow_threshold is not None or (not self.slow_only and self.sample_rate > 0)
+
+    def _failed(self, timing: RequestTiming) -> bool:
+        return self.log_failures and (
+            timing.error is not None or (timing.status is not None and timing.status >= 500)
+        )
+
+    def should_log(self, timing: RequestTiming) -> bool:
+        if self._failed(timing):
+            return self.logger.isEnabledFor(self.failure_level)
+        if not self.logger.isEnabledFor(self.level):
+            return False
+        if self.slow_threshold is not None and (timing.total or 0.0) >= self.slow_threshold:
+            return True
+        if self.slow_only:
+            return False
+        return self.sample_rate >= 1.0 or self._random() < self.sample_rate
+
+    @staticmethod
+    def fields(timing: RequestTiming) -> Dict[str, object]:
+        """Returns the logged fields of `timing`."""
+        return {
+            'operation': timing.operation,
+            'method': timing.method,
+            'path': timing.path,
+            'status': timing.status,
+            'error': type(timing.error).__name__ if timing.error is not None else None,
+            'duration': timing.total,
+            'bytes_sent': timing.bytes_sent,
+            'bytes_received': timing.bytes_received,
+            'attempt': timing.attempt,
+            'job_id': timing.job_id,
+        }
+
+    def log(self, timing: RequestTiming) -> None:
+        """Logs `timing` if it is sampled; usable as a `timing_callback`."""
+        if not self.should_log(timing):
+            return
+        fields = self.fields(timing)
+        self.logger.log(
+            self.failure_level if self._failed(timing) else self.level,
+            _MESSAGE,
+            timing.operation,
+            timing.method,
+            timing.path,
+            timing.status if timing.status is not None else fields['error'],
+            (timing.total or 0.0) * 1000.0,
+            timing.bytes_sent,
+            timing.bytes_received,
+            timing.attempt,
+            timing.job_id,
+            extra={'bsubio': fields},
+        )
+
+    def callback(
+        self, chained: Optional[Callable[[RequestTiming], None]] = None
+    ) -> Callable[[RequestTiming], None]:
+        """Returns a timing callback logging records, then calling `chained`."""
+        if chained is None:
+            return self.log
+
+        def callback(timing: RequestTiming) -> None:
+            self.log(timing)
+            chained(timing)
+
+        return callback
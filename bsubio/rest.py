@@ -6,20 +6,24 @@
     REST API for batch processing compute-intensive workloads.  Submit jobs, upload data, and retrieve results through a simple API. Perfect for PDF processing, video transcoding, audio transcription, and more.  ## Authentication  All endpoints require Bearer token authentication using your API key:  ``` Authorization: Bearer <your-api-key> ```  Get your API key from the [Dashboard](/).  ## Job Lifecycle  1. **Create** a job with `POST /v1/jobs` - Returns job ID and upload token 2. **Upload** data with `POST /v1/upload/{jobId}` - Uses upload token 3. **Submit** for processing with `POST /v1/jobs/{jobId}/submit` 4. **Monitor** status with `GET /v1/jobs/{jobId}` 5. **Retrieve** output with `GET /v1/jobs/{jobId}/output`  ## Job States  - `created` - Job created, awaiting data upload - `loaded` - Data uploaded successfully - `pending` - Waiting in queue for a worker - `claimed` - Worker claimed the job - `preparing` - Worker preparing to process - `processing` - Processing started - `finished` - Processing completed successfully - `failed` - Processing failed with error 
 
     The version of the OpenAPI document: 1.0.0
-    Generated by OpenAPI Generator (https://openapi-generator.tech)
-
-    Do not edit the class manually.
+    Generated by OpenAPI Generator (https://openapi-generator.tech), since
+    maintained by hand; listed in .openapi-generator-ignore.
 """  # noqa: E501
 
 
+import contextlib
 import io
 import json
 import re
 import ssl
+from typing import Any, Dict, Iterator, Union, cast
+from urllib.parse import urlencode
 
 import urllib3
 
 from bsubio.exceptions import ApiException, ApiValueError
+from bsubio.multipart import MultipartBody
+from bsubio.timing import instrument_pool_manager
 
 SUPPORTED_SOCKS_PROXIES = {"socks5", "socks5h", "socks4", "socks4a"}
 RESTResponseType = urllib3.HTTPResponse
@@ -42,10 +46,19 @@ class RESTResponse(io.IOBase):
         self.status = resp.status
         self.reason = resp.reason
         self.data = None
+        self.request = None
+        # whether response_deserialize keeps `data` for ApiResponse.raw_data;
+        # the plain API methods release the body once it is parsed
+        self.keep_data = True
+
+    def _read_body(self):
+        # unlike `.data`, read() leaves no second reference to the body in
+        # urllib3's cache; preloaded responses only have the cached one
+        return self.response.read() or self.response.data
 
     def read(self):
         if self.data is None:
-            self.data = self.response.data
+            self.data = self._read_body()
         return self.data
 
     def getheaders(self):
@@ -85,6 +98,12 @@ class RESTClientObject:
 
         if configuration.retries is not None:
             pool_args['retries'] = configuration.retries
+        elif configuration.retry_engine is not None:
+            # the retry engine owns connect/read retries; stacking urllib3's
+            # default retries on top would multiply attempts
+            pool_args['retries'] = urllib3.Retry(
+                total=None, connect=0, read=0, other=0, status=0, redirect=3
+            )
 
         if configuration.tls_server_name:
             pool_args['server_hostname'] = configuration.tls_server_name
@@ -112,6 +131,13 @@ class RESTClientObject:
         else:
             self.pool_manager = urllib3.PoolManager(**pool_args)
 
+        if (
+            configuration.timing_callback is not None
+            or configuration.metrics is not None
+            or configuration.request_logger is not None
+        ):
+            instrument_pool_manager(self.pool_manager)
+
     def request(
         self,
         method,
@@ -199,17 +225,17 @@ class RESTClientObject:
                         preload_content=False
                     )
                 elif content_type == 'multipart/form-data':
-                    # must del headers['Content-Type'], or the correct
-                    # Content-Type which generated by urllib3 will be
-                    # overwritten.
-                    del headers['Content-Type']
                     # Ensures that dict objects are serialized
                     post_params = [(a, json.dumps(b)) if isinstance(b, dict) else (a,b) for a, b in post_params]
+                    # sent part by part, without copying file contents
+                    multipart = MultipartBody(post_params)
+                    headers.update(multipart.headers())
+                    # urllib3 writes memoryview chunks as they are; its
+                    # annotation only names bytes and str
                     r = self.pool_manager.request(
                         method,
                         url,
-                        fields=post_params,
-                        encode_multipart=True,
+                        body=cast(Any, multipart),
                         timeout=timeout,
                         headers=headers,
                         preload_content=False
@@ -256,3 +282,248 @@ class RESTClientObject:
             raise ApiException(status=0, reason=msg)
 
         return RESTResponse(r)
+
+
+_HTTP_VERSIONS = {"HTTP/1.0": 10, "HTTP/1.1": 11, "HTTP/2": 20}
+
+
+def _connect_retries(retries) -> int:
+    """Returns `Configuration.retries` as the number of connection retries
+    httpx takes; of a ``urllib3.Retry``, its connect (or total) count."""
+    if isinstance(retries, urllib3.Retry):
+        retries = retries.connect if retries.connect is not None else retries.total
+    return int(retries or 0)
+
+
+@contextlib.contextmanager
+def _urllib3_errors(url: str) -> Iterator[None]:
+    """Re-raises ``httpx`` transport errors as the urllib3 errors the
+    default transport raises, so callers and retries see one set of
+    exceptions whichever transport is configured."""
+    import httpx
+
+    # the errors are raised outside of any urllib3 pool or connection
+    no_pool: Any = None
+    try:
+        yield
+    except httpx.ConnectTimeout as e:
+        raise urllib3.exceptions.ConnectTimeoutError(no_pool, str(e)) from e
+    except httpx.ReadTimeout as e:
+        raise urllib3.exceptions.ReadTimeoutError(no_pool, url, str(e)) from e
+    except httpx.TimeoutException as e:
+        raise urllib3.exceptions.TimeoutError(str(e)) from e
+    except httpx.ConnectError as e:
+        if isinstance(e.__context__, ssl.SSLError):
+            msg = "\n".join([type(e).__name__, str(e)])
+            raise ApiException(status=0, reason=msg)
+        raise urllib3.exceptions.NewConnectionError(no_pool, str(e)) from e
+    except httpx.ProxyError as e:
+        raise urllib3.exceptions.ProxyError(str(e), e) from e
+    except httpx.TransportError as e:
+        raise urllib3.exceptions.ProtocolError(str(e), e) from e
+
+
+class HTTP2Response:
+    """Adapts an ``httpx.Response`` to the subset of the
+    ``urllib3.HTTPResponse`` interface used by the generated API code."""
+
+    def __init__(self, resp) -> None:
+        self._response = resp
+        self._url = str(resp.request.url)
+        self.status = resp.status_code
+        self.reason = resp.reason_phrase
+        self.headers = resp.headers
+        self.version = _HTTP_VERSIONS.get(resp.http_version, 0)
+        self.version_string = resp.http_version
+
+    @property
+    def data(self):
+        with _urllib3_errors(self._url):
+            return self._response.read()
+
+    def read(self, amt=None):
+        if amt is None:
+            return self.data
+        return b"".join(self.stream(amt))
+
+    def stream(self, amt=2 ** 16, decode_content=True):
+        if decode_content:
+            chunks = self._response.iter_bytes(amt)
+        else:
+            chunks = self._response.iter_raw(amt)
+        with _urllib3_errors(self._url):
+            yield from chunks
+
+    def getheaders(self):
+        return self.headers
+
+    def getheader(self, name, default=None):
+        return self.headers.get(name, default)
+
+    def release_conn(self):
+        self._response.close()
+
+    def close(self):
+        self._response.close()
+
+
+class HTTP2RESTClientObject:
+    """REST client that speaks HTTP/2 through ``httpx``.
+
+    Concurrent requests to the same host are multiplexed as streams over a
+    small number of connections instead of holding one socket each. When
+    the server does not negotiate ``h2`` via ALPN (or the URL is plain
+    ``http://``) the same client transparently falls back to HTTP/1.1.
+
+    Transport errors are raised as the urllib3 errors of
+    :class:`RESTClientObject`. httpx ignores `Configuration.retries` for
+    connections through an HTTP proxy; use `Configuration.retry_engine`
+    there. `Configuration.socket_options` requires httpx 0.25 or later.
+
+    Requires the optional ``http2`` extra: ``pip install bsubio[http2]``.
+    """
+
+    def __init__(self, configuration) -> None:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "HTTP/2 transport requires httpx with the h2 extra; "
+                "install it with `pip install bsubio[http2]`"
+            ) from e
+        self._httpx = httpx
+
+        verify: Union[ssl.SSLContext, bool] = False
+        if configuration.verify_ssl:
+            context = ssl.create_default_context(
+                cafile=configuration.ssl_ca_cert,
+                cadata=configuration.ca_cert_data,
+            )
+            if configuration.assert_hostname is False:
+                context.check_hostname = False
+            if configuration.cert_file:
+                context.load_cert_chain(
+                    configuration.cert_file, configuration.key_file
+                )
+            verify = context
+
+        limits = httpx.Limits(
+            max_connections=configuration.connection_pool_maxsize,
+            max_keepalive_connections=configuration.connection_pool_maxsize,
+        )
+        transport_args: Dict[str, Any] = {
+            "http2": True,
+            "verify": verify,
+            "limits": limits,
+            "retries": _connect_retries(configuration.retries),
+        }
+        # socket_options is only known to httpx >= 0.25
+        if configuration.socket_options is not None:
+            transport_args["socket_options"] = configuration.socket_options
+        transport = httpx.HTTPTransport(**transport_args)
+        mounts = None
+        if configuration.proxy:
+            proxy = httpx.Proxy(
+                configuration.proxy,
+                headers=configuration.proxy_headers,
+            )
+            mounts = {
+                "all://": httpx.HTTPTransport(proxy=proxy, **transport_args),
+            }
+
+        self.pool_manager = httpx.Client(
+            http2=True,
+            transport=transport,
+            mounts=mounts,
+            timeout=None,
+        )
+
+    def _timeout(self, _request_timeout):
+        httpx = self._httpx
+        if _request_timeout:
+            if isinstance(_request_timeout, (int, float)):
+                return httpx.Timeout(_request_timeout)
+            if (
+                isinstance(_request_timeout, tuple)
+                and len(_request_timeout) == 2
+            ):
+                return httpx.Timeout(
+                    None,
+                    connect=_request_timeout[0],
+                    read=_request_timeout[1],
+                )
+        return None
+
+    def request(
+        self,
+        method,
+        url,
+        headers=None,
+        body=None,
+        post_params=None,
+        _request_timeout=None
+    ):
+        """Perform requests.
+
+        Accepts the same arguments as :meth:`RESTClientObject.request`.
+        """
+        method = method.upper()
+        assert method in [
+            'GET',
+            'HEAD',
+            'DELETE',
+            'POST',
+            'PUT',
+            'PATCH',
+            'OPTIONS'
+        ]
+
+        if post_params and body:
+            raise ApiValueError(
+                "body parameter cannot be used with post_params parameter."
+            )
+
+        post_params = post_params or []
+        headers = dict(headers or {})
+        content: Union[None, str, bytes, MultipartBody] = None
+
+        if method in ['POST', 'PUT', 'PATCH', 'OPTIONS', 'DELETE']:
+            content_type = headers.get('Content-Type')
+            if (
+                not content_type
+                or re.search('json', content_type, re.IGNORECASE)
+            ):
+                if body is not None:
+                    content = json.dumps(body)
+            elif content_type == 'application/x-www-form-urlencoded':
+                content = urlencode(post_params)
+            elif content_type == 'multipart/form-data':
+                post_params = [
+                    (a, json.dumps(b)) if isinstance(b, dict) else (a, b)
+                    for a, b in post_params
+                ]
+                content = MultipartBody(post_params)
+                headers.update(content.headers())
+            elif isinstance(body, str) or isinstance(body, bytes):
+                content = body
+            elif headers['Content-Type'].startswith('text/') and isinstance(body, bool):
+                content = "true" if body else "false"
+            else:
+                msg = """Cannot prepare a request message for provided
+                         arguments. Please check that your arguments match
+                         declared content type."""
+                raise ApiException(status=0, reason=msg)
+
+        # like urllib3, httpx sends the memoryview chunks of a
+        # MultipartBody as they are
+        request = self.pool_manager.build_request(
+            method,
+            url,
+            content=cast(Any, content),
+            headers=headers,
+            timeout=self._timeout(_request_timeout),
+        )
+        with _urllib3_errors(url):
+            r = self.pool_manager.send(request, stream=True)
+
+        return RESTResponse(HTTP2Response(r))
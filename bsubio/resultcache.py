@@ -0,0 +1,275 @@
+"""Reusing the results of byte-identical inputs.
+
+Pipelines often submit the same input many times (the same PDF attached to
+many tickets). A :class:`ResultCache` stores the output and logs of finished
+jobs on local disk, keyed by the processing type and the SHA-256 of the
+input, and evicts the least recently used entries beyond `max_bytes`.
+:class:`CachedProcessor` runs the whole create → upload → submit → wait →
+download sequence through it:
+
+.. code-block:: python
+
+    processor = CachedProcessor(jobs_api, output_api, ResultCache('~/.cache/bsubio'))
+    result = processor.process('pdf-extract', 'invoice.pdf')
+
+A cache hit makes no API calls at all, and concurrent calls for the same
+type and content share one job. Failed jobs are not cached.
+"""
+
+import concurrent.futures
+import hashlib
+import mmap
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+from bsubio.api.jobs_api import JobsApi
+from bsubio.api.output_api import OutputApi
+from bsubio.exceptions import ApiException
+from bsubio.lazyjob import LazyJob
+from bsubio.models.create_job_request import CreateJobRequest
+from bsubio.models.job import Job
+from bsubio.multipart import map_file
+from bsubio.waiter import JobWaiter
+
+_JOB = 'job.json'
+_OUTPUT = 'output'
+_LOGS = 'logs'
+
+
+class ProcessResult(NamedTuple):
+    """Outcome of :meth:`CachedProcessor.process`."""
+
+    job: Job
+    output: Optional[bytearray]
+    """Job output; None if the job failed."""
+    logs: str
+    cached: bool
+    """Whether the result came from the cache."""
+
+
+def content_digest(data: Any) -> str:
+    """Returns the hex SHA-256 of an upload as accepted by
+    `JobsApi.upload_job_data`: a path, a buffer or a ``(name, buffer)`` tuple.
+    """
+    if isinstance(data, tuple):
+        data = data[1]
+    if not isinstance(data, str):
+        return _sha256(data)
+    mapped = map_file(data)
+    try:
+        return _sha256(mapped)
+    finally:
+        if isinstance(mapped, mmap.mmap):
+            mapped.close()
+
+
+def _sha256(data: Any) -> str:
+    # the views are released before a mapped file can be closed
+    with memoryview(data) as view, view.cast('B') as octets:
+        return hashlib.sha256(octets).hexdigest()
+
+
+def _entry_size(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path))
+
+
+class ResultCache:
+    """Size-capped LRU store of job results on local disk.
+
+    Every entry is a directory ``<type>/<sha256>`` holding the job, its
+    output and its logs; the type is percent-encoded, dots included, so it
+    cannot name another directory. Entries are written to a temporary directory and
+    renamed into place, so readers never see partial entries; recency is
+    kept in the entry's modification time and survives restarts.
+
+    :param directory: cache directory; created if missing.
+    :param max_bytes: total size of the stored entries above which the
+        least recently used ones are removed.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30) -> None:
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[str, int]' = OrderedDict()
+        os.makedirs(self.directory, exist_ok=True)
+        found = []
+        for type_dir in os.scandir(self.directory):
+            if not type_dir.is_dir() or type_dir.name.startswith('.'):
+                continue
+            for entry in os.scandir(type_dir.path):
+                if entry.is_dir():
+                    found.append((entry.stat().st_mtime, entry.path, _entry_size(entry.path)))
+        for _, path, size in sorted(found):
+            self._entries[path] = size
+        self.size = sum(self._entries.values())
+
+    def _path(self, type: str, digest: str) -> str:
+        if not type:
+            raise ValueError('type must not be empty')
+        # quote() keeps dots, which would allow '..'
+        name = quote(type, safe='').replace('.', '%2E')
+        return os.path.join(self.directory, name, digest)
+
+    def get(self, type: str, digest: str) -> Optional[ProcessResult]:
+        """Returns the stored result for `type` and `digest`, or None.
+
+        Unreadable entries (e.g. truncated by a crash) are evicted.
+        """
+        path = self._path(type, digest)
+        try:
+            with open(os.path.join(path, _JOB), encoding='utf-8') as file:
+                job = Job.from_json(file.read())
+            if job is None:
+                return None
+            with open(os.path.join(path, _OUTPUT), 'rb') as file:
+                output = bytearray(os.fstat(file.fileno()).st_size)
+                file.readinto(output)
+            with open(os.path.join(path, _LOGS), encoding='utf-8') as file:
+                logs = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # invalid JSON, model or text
+            self._evict(path)
+            return None
+        with self._lock:
+            if path in self._entries:
+                self._entries.move_to_end(path)
+        return ProcessResult(job, output, logs, True)
+
+    def _evict(self, path: str) -> None:
+        with self._lock:
+            self.size -= self._entries.pop(path, 0)
+        shutil.rmtree(path, ignore_errors=True)
+
+    def put(self, type: str, digest: str, job: Job, output, logs: str) -> None:
+        """Stores the result of a finished job and evicts old entries.
+
+        Results larger than `max_bytes` are not stored.
+        """
+        size = len(memoryview(output).cast('B')) + len(logs.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        path = self._path(type, digest)
+        staging = os.path.join(self.directory, '.tmp-%s' % uuid.uuid4().hex)
+        os.makedirs(staging)
+        try:
+            with open(os.path.join(staging, _JOB), 'w', encoding='utf-8') as file:
+                file.write(job.model_dump_json(by_alias=True, exclude_none=True))
+            with open(os.path.join(staging, _OUTPUT), 'wb') as file:
+                file.write(output)
+            with open(os.path.join(staging, _LOGS), 'w', encoding='utf-8') as file:
+                file.write(logs)
+            size = _entry_size(staging)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                os.rename(staging, path)
+            except OSError:
+                # stored concurrently by another process
+                return
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        with self._lock:
+            self.size += size - self._entries.pop(path, 0)
+            self._entries[path] = size
+            evicted = []
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                old, old_size = self._entries.popitem(last=False)
+                self.size -= old_size
+                evicted.append(old)
+        for old in evicted:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+class CachedProcessor:
+    """Processes inputs through a :class:`ResultCache`.
+
+    :param jobs_api: API used to create, upload, submit and poll jobs.
+    :param output_api: API used to download outputs and logs.
+    :param cache: where results of finished jobs are kept.
+    :param waiter: waits for submitted jobs; a default `JobWaiter` on
+        `jobs_api` if None.
+    """
+
+    def __init__(
+        self,
+        jobs_api: JobsApi,
+        output_api: OutputApi,
+        cache: ResultCache,
+        waiter: Optional[JobWaiter] = None,
+    ) -> None:
+        self.jobs_api = jobs_api
+        self.output_api = output_api
+        self.cache = cache
+        self.waiter = waiter if waiter is not None else JobWaiter(jobs_api)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Tuple[str, str], 'Future[ProcessResult]'] = {}
+
+    def process(self, type: str, data: Any, timeout: Optional[float] = None) -> ProcessResult:
+        """Returns the result of processing `data` with `type`.
+
+        Served from the cache if the same type and content finished before;
+        otherwise a job is created, uploaded, submitted and waited for, or
+        the job of a concurrent call with the same input is joined.
+
+        :param type: processing type.
+        :param data: input as accepted by `JobsApi.upload_job_data`.
+        :param timeout: seconds to wait for the job to finish.
+        :raises TimeoutError: if the job did not finish within `timeout`.
+        """
+        digest = content_digest(data)
+        result = self.cache.get(type, digest)
+        if result is not None:
+            return result
+        key = (type, digest)
+        with self._lock:
+            joined = self._inflight.get(key)
+            if joined is None:
+                future = self._inflight[key] = Future()
+        if joined is not None:
+            try:
+                error = joined.exception(timeout)
+            except concurrent.futures.TimeoutError:
+                # not the builtin TimeoutError before Python 3.11
+                raise TimeoutError(
+                    'the job of a concurrent call did not finish within %s seconds' % timeout
+                ) from None
+            if error is not None:
+                raise error
+            return joined.result()
+        try:
+            # an earlier leader may have finished since the lookup above
+            result = self.cache.get(type, digest) or self._run(type, digest, data, timeout)
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _run(self, type: str, digest: str, data: Any, timeout: Optional[float]) -> ProcessResult:
+        created = self.jobs_api.create_job(CreateJobRequest(type=type)).data
+        if created is None or created.id is None or created.upload_token is None:
+            raise ApiException(status=0, reason='create_job returned no job id and upload token')
+        self.jobs_api.upload_job_data(created.id, created.upload_token, data)
+        self.jobs_api.submit_job(created.id)
+        polled = self.waiter.wait(created.id, timeout)
+        job = polled.to_job() if isinstance(polled, LazyJob) else polled
+        assert job.id is not None
+        logs = self.output_api.get_job_logs(job.id)
+        if job.status != 'finished':
+            return ProcessResult(job, None, logs, False)
+        output = self.output_api.get_job_output(job.id)
+        self.cache.put(type, digest, job, output, logs)
+        return ProcessResult(job, output, logs, False)
@@ -0,0 +1,256 @@
+"""Retry policies for `ApiClient.call_api`.
+
+`Configuration.retries` is handed to urllib3 as-is, which retries blindly
+and without a backoff policy. A :class:`RetryEngine` set on
+`Configuration.retry_engine` replaces that with per-operation policies:
+
+* idempotent operations (`get_job`, `list_jobs`, ...) are retried on
+  connection errors, timeouts and retryable status codes;
+* unsafe operations (`create_job`, `upload_job_data`, ...) are only retried
+  when the request provably never reached the server (connection refused,
+  connect timeout, HTTP 429) or when it carries an idempotency key;
+* delays use exponential backoff with full jitter and honour
+  ``Retry-After`` on 429/503 responses;
+* a shared :class:`RetryBudget` caps retries to a fraction of the request
+  rate, so a struggling server does not receive a retry storm.
+"""
+
+import email.utils
+import random
+import threading
+import time
+import uuid
+from typing import Callable, Dict, FrozenSet, Iterable, Optional
+
+import urllib3
+
+from bsubio.operations import Operation
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+
+
+class RetryPolicy:
+    """How failed attempts of a single operation are retried.
+
+    :param max_attempts: total number of attempts, including the first one.
+    :param backoff_factor: base delay in seconds. The n-th retry waits a
+        random duration between 0 and ``backoff_factor * 2 ** (n - 1)``.
+    :param max_backoff: upper bound for a single backoff delay.
+    :param retry_on_status: HTTP status codes that are retried.
+    :param respect_retry_after: honour the ``Retry-After`` response header.
+    :param max_retry_after: ``Retry-After`` values above this many seconds
+        are not waited for; the response is returned to the caller instead.
+    :param jitter: randomize delays ("full jitter"). Disable only in tests.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.2,
+        max_backoff: float = 10.0,
+        retry_on_status: Iterable[int] = (429, 502, 503, 504),
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0,
+        jitter: bool = True,
+    ) -> None:
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_on_status: FrozenSet[int] = frozenset(retry_on_status)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.jitter = jitter
+
+    def backoff(self, retry_number: int) -> float:
+        """Returns the delay before the `retry_number`-th retry (1-based)."""
+        delay = min(self.max_backoff, self.backoff_factor * 2 ** (retry_number - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+
+class RetryBudget:
+    """Caps retries to a fraction of the request rate.
+
+    Every first attempt deposits `ratio` tokens, every retry withdraws one,
+    and `min_retries_per_second` tokens are refilled over time so that
+    low-traffic clients can still retry. The budget is thread-safe and is
+    meant to be shared by all operations of a client (or process).
+
+    :param ratio: retries allowed per original request.
+    :param min_retries_per_second: retries always allowed regardless of
+        traffic.
+    :param max_tokens: upper bound for saved-up retries.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_retries_per_second: float = 1.0,
+        max_tokens: float = 100.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self._clock = clock
+        self._tokens = max_tokens
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.max_tokens,
+            self._tokens + (now - self._updated) * self.min_retries_per_second,
+        )
+        self._updated = now
+
+    def deposit(self) -> None:
+        """Records an original (non-retry) request."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Takes one retry from the budget; returns False if exhausted."""
+        with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+# the HTTP/2 transport raises the urllib3 errors too
+_CONNECT_ERRORS = (
+    urllib3.exceptions.NewConnectionError,
+    urllib3.exceptions.ConnectTimeoutError,
+)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Parses a ``Retry-After`` header into seconds to wait.
+
+    Both the delta-seconds and the HTTP-date forms are supported.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class RetryEngine:
+    """Applies per-operation :class:`RetryPolicy` objects to API calls.
+
+    :param default_policy: policy for operations without an explicit entry.
+    :param policies: mapping of operation name (e.g. ``"get_job"``) to its
+        policy. Use ``RetryPolicy(max_attempts=1)`` to disable retries for
+        an operation.
+    :param budget: shared retry budget; defaults to a fresh
+        :class:`RetryBudget`. Set the `budget` attribute to None to disable
+        the cap.
+    :param idempotency_keys: add an ``Idempotency-Key`` header to
+        `idempotent_key_operations` requests that do not carry one. Requests
+        with a key are retried like idempotent ones, so only enable this
+        against servers that deduplicate on the key.
+    :param idempotent_key_operations: operations that get an automatic key.
+    """
+
+    def __init__(
+        self,
+        default_policy: Optional[RetryPolicy] = None,
+        policies: Optional[Dict[str, RetryPolicy]] = None,
+        budget: Optional[RetryBudget] = None,
+        idempotency_keys: bool = False,
+        idempotent_key_operations: Iterable[str] = ('create_job',),
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.default_policy = default_policy or RetryPolicy()
+        self.policies = dict(policies or {})
+        self.budget = RetryBudget() if budget is None else budget
+        self.idempotency_keys = idempotency_keys
+        self.idempotent_key_operations = frozenset(idempotent_key_operations)
+        self._sleep = sleep
+
+    def policy_for(self, operation: Operation) -> RetryPolicy:
+        return self.policies.get(operation.name, self.default_policy)
+
+    def _is_connect_error(self, exc: BaseException) -> bool:
+        if isinstance(exc, urllib3.exceptions.MaxRetryError):
+            return isinstance(exc.reason, _CONNECT_ERRORS)
+        return isinstance(exc, _CONNECT_ERRORS)
+
+    def call(self, operation: Operation, send, headers: Dict[str, str]):
+        """Runs `send` until it succeeds or the policy gives up.
+
+        :param operation: the operation being performed.
+        :param send: zero-argument callable performing one attempt and
+            returning a `RESTResponse`.
+        :param headers: request headers; may be updated with an
+            idempotency key before the first attempt.
+        :return: the last `RESTResponse`; transport errors of the last
+            attempt are re-raised.
+        """
+        if (
+            self.idempotency_keys
+            and operation.name in self.idempotent_key_operations
+            and IDEMPOTENCY_KEY_HEADER not in headers
+        ):
+            headers[IDEMPOTENCY_KEY_HEADER] = str(uuid.uuid4())
+        safe = operation.idempotent or IDEMPOTENCY_KEY_HEADER in headers
+        policy = self.policy_for(operation)
+        budget = self.budget
+        if budget is not None:
+            budget.deposit()
+
+        attempt = 1
+        while True:
+            try:
+                response = send()
+            except urllib3.exceptions.HTTPError as e:
+                retryable = safe or self._is_connect_error(e)
+                if not retryable or not self._may_retry(policy, attempt):
+                    raise
+                self._sleep(policy.backoff(attempt))
+                attempt += 1
+                continue
+
+            status = response.status
+            if status not in policy.retry_on_status or not (safe or status == 429):
+                return response
+            delay = policy.backoff(attempt)
+            if policy.respect_retry_after and status in (429, 503):
+                retry_after = parse_retry_after(response.getheader('Retry-After'))
+                if retry_after is not None:
+                    if retry_after > policy.max_retry_after:
+                        return response
+                    delay = max(delay, retry_after)
+            if not self._may_retry(policy, attempt):
+                return response
+            # drain the (small) error body so the connection is reused
+            response.read()
+            self._sleep(delay)
+            attempt += 1
+
+    def _may_retry(self, policy: RetryPolicy, attempt: int) -> bool:
+        if attempt >= policy.max_attempts:
+            return False
+        return self.budget is None or self.budget.try_withdraw()
@@ -0,0 +1,185 @@
+"""Incremental parsing of `list_jobs` responses.
+
+`JobsApi.list_jobs` reads the whole body, parses it with `json.loads` and
+builds every `Job` before returning. `JobsApi.list_jobs_stream` returns a
+:class:`JobStream` instead, which parses the ``data.jobs`` array from the
+socket as it arrives and yields one `Job` at a time:
+
+.. code-block:: python
+
+    with jobs_api.list_jobs_stream(status='failed', limit=100) as jobs:
+        for job in jobs:
+            print(job.id, job.error_message)
+        print(jobs.total)
+
+Only the undecoded remainder of the last chunk and the job being parsed
+are held in memory, and the first job is available as soon as its bytes
+have arrived. Each array element is decoded with `json.JSONDecoder.raw_decode`
+once the buffer holds all of it.
+"""
+
+import codecs
+import json
+from typing import Any, Callable, Dict, Generator, Iterator, Optional
+
+from bsubio.models.job import Job
+
+_CHUNK = 1 << 16
+
+_WHITESPACE = ' \t\n\r'
+
+
+class JobStream:
+    """Iterator over the jobs of a `list_jobs` response body.
+
+    The connection is released to its pool once the body is exhausted, and
+    closed if the stream is closed (or left as a context manager) early.
+
+    :param response: unread 2xx response, as returned by
+        `list_jobs_without_preload_content`.
+    :param build: builds an item from the dict of each job.
+    :param observe: called with every item before it is yielded.
+    """
+
+    def __init__(
+        self,
+        response,
+        build: Callable[[Dict[str, Any]], Any] = Job.from_dict,
+        observe: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        self.total: Optional[int] = None
+        """``data.total``, once the parser has reached it; fields after
+        ``data.jobs`` are only parsed after the last job."""
+        self._response = response
+        self._build = build
+        self._observe = observe
+        self._chunks = response.stream(_CHUNK)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._decode = json.JSONDecoder().raw_decode
+        self._text = ''
+        self._pos = 0
+        self._items: Generator[Any, None, None] = self._parse()
+        self._done = False
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            return next(self._items)
+        except StopIteration:
+            self._finish()
+            raise
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> 'JobStream':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _finish(self) -> None:
+        if not self._done:
+            self._done = True
+            for _ in self._chunks:
+                pass
+            self._response.release_conn()
+
+    def close(self) -> None:
+        """Stops reading; the connection is closed unless fully read."""
+        if not self._done:
+            self._done = True
+            self._items.close()
+            self._response.close()
+
+    def _fill(self) -> bool:
+        """Appends the next chunk to the buffer; False at the end of the body."""
+        chunk = next(self._chunks, None)
+        text = self._decoder.decode(chunk or b'', final=chunk is None)
+        self._text = self._text[self._pos:] + text
+        self._pos = 0
+        return chunk is not None
+
+    def _peek(self) -> str:
+        """Returns the next non-whitespace character, '' at the end."""
+        while True:
+            text, pos = self._text, self._pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(
+                'expected %r in the list_jobs body, found %r' % (char, found or 'the end')
+            )
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """Decodes the next complete JSON value."""
+        while True:
+            self._peek()
+            try:
+                value, end = self._decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a number at the end of the buffer may continue in the next chunk
+            if end == len(self._text) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _keys(self) -> Iterator[str]:
+        """Yields the keys of the object being parsed; the caller consumes
+        each value before asking for the next key."""
+        self._expect('{')
+        first = True
+        while True:
+            char = self._peek()
+            if char == '}':
+                self._pos += 1
+                return
+            if not first:
+                self._expect(',')
+            first = False
+            key = self._value()
+            self._expect(':')
+            yield key
+
+    def _parse(self) -> Generator[Any, None, None]:
+        for key in self._keys():
+            if key != 'data' or self._peek() != '{':
+                self._value()
+                continue
+            for data_key in self._keys():
+                if data_key == 'jobs' and self._peek() == '[':
+                    yield from self._array()
+                elif data_key == 'total':
+                    self.total = self._value()
+                else:
+                    self._value()
+
+    def _array(self) -> Iterator[Any]:
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        build, observe = self._build, self._observe
+        while True:
+            item = build(self._value())
+            if observe is not None:
+                observe(item)
+            yield item
+            if self._peek() == ']':
+                self._pos += 1
+                return
+            self._expect(',')
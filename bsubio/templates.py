@@ -0,0 +1,108 @@
+"""Precompiled request templates.
+
+Building a request used to re-create the same dicts and lists on every
+call, select the Accept and Content-Type headers with regular expressions,
+run `sanitize_for_serialization` over headers and path parameters and look
+up the auth settings again. For tiny calls such as `get_job` that CPU time
+is comparable to a LAN round trip.
+
+A :class:`RequestTemplate` holds the constant parts of one operation —
+method, split URL template, Accept/Content-Type and auth scheme names —
+computed once at import. `ApiClient.serialize_template` only fills in the
+per-call values.
+"""
+
+import re
+from typing import Any, Dict, Optional, Sequence, Tuple
+from urllib.parse import quote
+from uuid import UUID
+
+from bsubio.operations import OPERATIONS_BY_NAME, Operation
+
+_PLACEHOLDER = re.compile(r'\{([^}]+)\}')
+
+
+def _select(media_types: Sequence[str]) -> Optional[str]:
+    # same rule as ApiClient.select_header_accept/_content_type
+    for media_type in media_types:
+        if re.search('json', media_type, re.IGNORECASE):
+            return media_type
+    return media_types[0] if media_types else None
+
+
+class RequestTemplate:
+    """Constant parts of the requests of one operation.
+
+    :param operation: the operation the template builds requests for.
+    :param accepts: media types the operation can respond with.
+    :param content_types: media types the request body can be sent as.
+    :param auth_settings: names of the auth settings applied.
+    """
+
+    __slots__ = (
+        'operation', 'method', 'path', 'accept', 'content_type', 'auth_settings', '_segments',
+    )
+
+    def __init__(
+        self,
+        operation: Operation,
+        accepts: Sequence[str] = (),
+        content_types: Sequence[str] = (),
+        auth_settings: Sequence[str] = (),
+    ) -> None:
+        self.operation = operation
+        self.method = operation.method
+        self.path = operation.path
+        self.accept = _select(accepts)
+        self.content_type = _select(content_types)
+        self.auth_settings = tuple(auth_settings)
+        # literal text at even, parameter names at odd indices
+        self._segments: Tuple[str, ...] = tuple(_PLACEHOLDER.split(operation.path))
+
+    def render_path(self, path_params: Optional[Dict[str, Any]], safe: str) -> str:
+        """Substitutes and quotes `path_params` into the URL template."""
+        segments = self._segments
+        if len(segments) == 1:
+            return segments[0]
+        if path_params is None:
+            path_params = {}
+        parts = []
+        for index, segment in enumerate(segments):
+            if not index % 2:
+                parts.append(segment)
+                continue
+            value = path_params[segment]
+            if isinstance(value, UUID):
+                # the canonical form only has characters that are never quoted
+                parts.append(str(value))
+            else:
+                parts.append(quote(str(value), safe=safe))
+        return ''.join(parts)
+
+
+def _template(
+    name: str,
+    accepts: Sequence[str],
+    content_types: Sequence[str] = (),
+    auth: Sequence[str] = ('BearerAuth',),
+) -> RequestTemplate:
+    return RequestTemplate(OPERATIONS_BY_NAME[name], accepts, content_types, auth)
+
+
+_JSON = ('application/json',)
+
+TEMPLATES: Dict[str, RequestTemplate] = {
+    'cancel_job': _template('cancel_job', _JSON),
+    'create_job': _template('create_job', _JSON, _JSON),
+    'delete_job': _template('delete_job', _JSON),
+    'get_job': _template('get_job', _JSON),
+    'list_jobs': _template('list_jobs', _JSON),
+    'submit_job': _template('submit_job', _JSON),
+    'upload_job_data': _template('upload_job_data', _JSON, ('multipart/form-data',)),
+    'get_job_logs': _template('get_job_logs', ('text/plain', 'application/json')),
+    'get_job_output': _template(
+        'get_job_output', ('application/octet-stream', 'text/plain', 'application/json')
+    ),
+    'get_types': _template('get_types', _JSON),
+    'get_version': _template('get_version', _JSON, auth=()),
+}
@@ -0,0 +1,373 @@
+"""Per-request timing instrumentation.
+
+When `Configuration.timing_callback` is set, every attempt made by
+`ApiClient.call_api` produces a :class:`RequestTiming` record that is
+passed to the callback once the response body has been read (or the
+attempt failed). Records are tagged with the operation name, so slow
+uploads, slow server processing and connection pool starvation can be told
+apart:
+
+* ``pool_wait`` – time spent checking a connection out of the pool;
+* ``connect`` – TCP connect of a new connection, including DNS resolution
+  (urllib3 resolves and connects in one step);
+* ``tls`` – TLS handshake of a new HTTPS connection;
+* ``ttfb`` – from sending the request until the response headers arrived;
+* ``transfer`` – reading the response body, until it is fully read,
+  released or closed;
+* ``bytes_sent`` / ``bytes_received`` – request bytes written to the socket
+  (headers included) and response body bytes;
+* ``transport_retries`` – retries and redirects urllib3 performed inside
+  the attempt.
+
+The connection-level phases come from instrumented urllib3 pool and
+connection classes that are only installed when a callback is configured
+at client construction, so a client without a callback runs the stock
+urllib3 code. With the HTTP/2 transport only ``ttfb``, ``transfer`` and
+the byte counts are available.
+
+Responses get the accounting of :class:`TimedResponse` mixed into their
+class, so the record of a ``*_without_preload_content`` call (or of the
+streaming and download helpers built on them) is delivered once the caller
+has read, released or closed the body, while the response stays a
+``urllib3.HTTPResponse``.
+"""
+
+import contextvars
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional
+
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.response import HTTPResponse
+
+_current: contextvars.ContextVar[Optional['RequestTiming']] = contextvars.ContextVar(
+    'bsubio_request_timing', default=None
+)
+
+if TYPE_CHECKING:
+    from bsubio.rest import HTTP2Response
+
+    _ConnectionBase = HTTPConnection
+    _PoolBase = HTTPConnectionPool
+    _ResponseBase = HTTPResponse
+    _HTTP2ResponseBase = HTTP2Response
+else:
+    _ConnectionBase = _PoolBase = _ResponseBase = _HTTP2ResponseBase = object
+
+
+class RequestTiming:
+    """Timing record of one HTTP attempt. Durations are in seconds."""
+
+    __slots__ = (
+        'operation', 'method', 'path', 'job_id', 'attempt', 'status', 'error',
+        'started_at', 'pool_wait', 'connect', 'tls', 'ttfb', 'transfer',
+        'total', 'bytes_sent', 'bytes_received', 'reused_connection',
+        'transport_retries', '_start', '_request_start', '_connected', '_callback',
+    )
+
+    def __init__(
+        self,
+        operation: str,
+        method: str,
+        path: str,
+        job_id: Optional[str] = None,
+        attempt: int = 1,
+        callback: Optional[Callable[['RequestTiming'], None]] = None,
+    ) -> None:
+        self.operation = operation
+        self.method = method
+        self.path = path
+        self.job_id = job_id
+        self.attempt = attempt
+        self.status: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.started_at = time.time()
+        self.pool_wait: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.tls: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.transfer: Optional[float] = None
+        self.total: Optional[float] = None
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.reused_connection: Optional[bool] = None
+        self.transport_retries = 0
+        self._start = time.perf_counter()
+        self._request_start: Optional[float] = None
+        self._connected: Optional[float] = None
+        self._callback = callback
+
+    def response_started(self, status: int) -> None:
+        """Marks the arrival of the response headers."""
+        self.status = status
+        if self.ttfb is None:
+            start = self._request_start
+            if start is None or (self._connected is not None and self._connected > start):
+                start = self._connected if self._connected is not None else self._start
+            self.ttfb = time.perf_counter() - start
+
+    def finish(
+        self,
+        bytes_received: int = 0,
+        transfer: Optional[float] = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Completes the record and hands it to the callback; later calls
+        are ignored."""
+        if self.total is not None:
+            return
+        self.bytes_received = bytes_received
+        self.transfer = transfer
+        self.error = error
+        self.total = time.perf_counter() - self._start
+        callback, self._callback = self._callback, None
+        if callback is not None:
+            callback(self)
+
+    def as_dict(self):
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if not name.startswith('_')
+        }
+
+    def __repr__(self) -> str:
+        return 'RequestTiming(%s)' % ', '.join(
+            '%s=%r' % item for item in self.as_dict().items()
+        )
+
+
+class TimedResponse:
+    """Completes the `RequestTiming` record of an unread urllib3 (or HTTP/2)
+    response when the body has been fully read, or when the response is
+    released, drained or closed.
+
+    :func:`time_response` mixes it into the class of a response in place,
+    so the response keeps its type and interface.
+    """
+
+    timing: RequestTiming
+    _received: int
+    _transfer: float
+    _reading: int
+    _released: bool
+
+    def _count(self, read, *args, **kwargs):
+        started = time.perf_counter()
+        self._reading += 1
+        try:
+            data = read(*args, **kwargs)
+        except StopIteration:
+            raise
+        except BaseException as e:
+            self.finish(e)
+            raise
+        finally:
+            self._reading -= 1
+        self._received += data if isinstance(data, int) else len(data)
+        self._transfer += time.perf_counter() - started
+        if self._released and not self._reading:
+            self.finish()
+        return data
+
+    def _count_chunks(self, chunks):
+        chunks = iter(chunks)
+        while True:
+            try:
+                yield self._count(next, chunks)
+            except StopIteration:
+                return
+
+    def timed_readinto(self, readinto):
+        """Returns `readinto` of the underlying file, counted in the
+        record; `bsubio.download` reads the http.client response directly."""
+        return lambda buffer: self._count(readinto, buffer)
+
+    def _release(self) -> None:
+        # urllib3 releases the connection from inside read(), before the
+        # bytes of that read are counted
+        if self._reading:
+            self._released = True
+        else:
+            self.finish()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Completes the record with the bytes read so far."""
+        self.timing.finish(self._received, self._transfer, error)
+
+
+class _TimedHTTPResponse(TimedResponse, _ResponseBase):
+    # stream(), data, readinto() and iteration all read through these
+
+    def read(self, amt=None, *args, **kwargs):
+        data = self._count(super().read, amt, *args, **kwargs)
+        if amt is None:
+            self.finish()
+        return data
+
+    def read1(self, amt=None, *args, **kwargs):
+        return self._count(super().read1, amt, *args, **kwargs)
+
+    def read_chunked(self, amt=None, *args, **kwargs):
+        return self._count_chunks(super().read_chunked(amt, *args, **kwargs))
+
+    def release_conn(self) -> None:
+        super().release_conn()
+        self._release()
+
+    def drain_conn(self) -> None:
+        super().drain_conn()
+        self._release()
+
+    def close(self) -> None:
+        super().close()
+        self._release()
+
+
+class _TimedHTTP2Response(TimedResponse, _HTTP2ResponseBase):
+    # HTTP2Response reads through `data` and stream()
+
+    @property
+    def data(self):
+        data = self._count(lambda: super(_TimedHTTP2Response, self).data)
+        self.finish()
+        return data
+
+    def stream(self, *args, **kwargs):
+        return self._count_chunks(super().stream(*args, **kwargs))
+
+    def release_conn(self) -> None:
+        super().release_conn()
+        self._release()
+
+    def close(self) -> None:
+        super().close()
+        self._release()
+
+
+_timed_classes: Dict[type, type] = {}
+
+
+def time_response(response, timing: RequestTiming) -> None:
+    """Completes `timing` once the body of the unread `response` has been
+    read, or the response released, drained or closed.
+
+    The class of `response` is replaced by a subclass adding the
+    accounting, so it is still an instance of its original class.
+    """
+    cls = type(response)
+    timed = _timed_classes.get(cls)
+    if timed is None:
+        mixin = _TimedHTTPResponse if issubclass(cls, HTTPResponse) else _TimedHTTP2Response
+        timed = _timed_classes.setdefault(cls, type('Timed' + cls.__name__, (mixin, cls), {}))
+    response.timing = timing
+    response._received = 0
+    response._transfer = 0.0
+    response._reading = 0
+    response._released = False
+    response.__class__ = timed
+
+
+def current_timing() -> Optional[RequestTiming]:
+    """Returns the record of the attempt running in this context."""
+    return _current.get()
+
+
+def activate(timing: Optional[RequestTiming]):
+    """Makes `timing` the current record; returns a reset token."""
+    return _current.set(timing)
+
+
+def deactivate(token) -> None:
+    _current.reset(token)
+
+
+class _TimedConnectionMixin(_ConnectionBase):
+
+    def _new_conn(self):
+        timing = _current.get()
+        if timing is None:
+            return super()._new_conn()
+        start = time.perf_counter()
+        sock = super()._new_conn()
+        timing.connect = time.perf_counter() - start
+        timing.reused_connection = False
+        timing._connected = time.perf_counter()
+        return sock
+
+    def request(self, method, url, body=None, headers=None, **kwargs):
+        timing = _current.get()
+        if timing is not None:
+            timing._request_start = time.perf_counter()
+        return super().request(method, url, body=body, headers=headers, **kwargs)
+
+    def send(self, data):
+        timing = _current.get()
+        if timing is not None:
+            timing.bytes_sent += len(data) if hasattr(data, '__len__') else 0
+        return super().send(data)
+
+    def getresponse(self):
+        response = super().getresponse()
+        timing = _current.get()
+        if timing is not None:
+            timing.response_started(response.status)
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+
+    def connect(self):
+        timing = _current.get()
+        if timing is None:
+            return super().connect()
+        start = time.perf_counter()
+        super().connect()
+        elapsed = time.perf_counter() - start
+        timing.tls = elapsed - (timing.connect or 0.0)
+        timing._connected = time.perf_counter()
+
+
+class _TimedPoolMixin(_PoolBase):
+
+    def _get_conn(self, timeout=None):
+        timing = _current.get()
+        if timing is None:
+            return super()._get_conn(timeout)
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        timing.pool_wait = time.perf_counter() - start
+        timing.reused_connection = getattr(conn, 'sock', None) is not None
+        if timing.reused_connection:
+            timing.connect = timing.tls = 0.0
+        return conn
+
+
+class TimedHTTPConnectionPool(_TimedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(_TimedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+def instrument_pool_manager(pool_manager) -> bool:
+    """Switches `pool_manager` to the instrumented pool classes.
+
+    Pool managers with custom pool classes (e.g. SOCKS proxies) are left
+    alone. Returns whether instrumentation was installed.
+    """
+    classes = getattr(pool_manager, 'pool_classes_by_scheme', None)
+    if classes is None or classes.get('http') is not HTTPConnectionPool:
+        return False
+    if classes.get('https') is not HTTPSConnectionPool:
+        return False
+    pool_manager.pool_classes_by_scheme = {
+        'http': TimedHTTPConnectionPool,
+        'https': TimedHTTPSConnectionPool,
+    }
+    return True
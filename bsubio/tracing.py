@@ -0,0 +1,308 @@
+"""Tracing of job lifecycles, compatible with OpenTelemetry.
+
+One logical unit of work is create → upload → submit → poll × N → output →
+logs. With a :class:`JobTracer` on `Configuration.tracer`:
+
+* every job gets a ``bsubio.job`` span. It is opened explicitly with
+  ``with tracer.job():`` around the unit of work, or implicitly by the
+  first call that mentions the job id; implicit spans end once a terminal
+  status was observed (or via :meth:`JobTracer.end_job`);
+* every HTTP attempt becomes a client span (``bsubio.<operation>``), a
+  child of its job span, and carries the W3C ``traceparent`` header when
+  OpenTelemetry is installed;
+* every `Job.status` change seen in a response is added to the job span as
+  a ``bsubio.job.status`` event, including the server-side
+  ``claimed_at``/``finished_at`` timestamps, so queueing time is visible.
+
+If the ``opentelemetry-api`` package is not installed the tracer falls back
+to a no-op shim, so instrumented code keeps working unchanged. Job spans
+are kept in a bounded LRU and the per-call work is a handful of attribute
+writes, cheap enough to leave on in production.
+"""
+
+import collections
+import contextlib
+import contextvars
+import importlib
+import threading
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+from bsubio.operations import Operation, TERMINAL_JOB_STATUSES
+
+# imported by name so that type checking does not depend on OpenTelemetry
+# being installed
+otel_context: Any
+otel_propagate: Any
+otel_trace: Any
+try:
+    otel_context = importlib.import_module('opentelemetry.context')
+    otel_propagate = importlib.import_module('opentelemetry.propagate')
+    otel_trace = importlib.import_module('opentelemetry.trace')
+except ImportError:  # pragma: no cover - depends on the environment
+    otel_context = None
+    otel_propagate = None
+    otel_trace = None
+
+
+class NoOpSpan:
+    """Span of the shim used when OpenTelemetry is not installed."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_event(
+        self, name: str, attributes: Optional[Dict[str, Any]] = None, timestamp=None
+    ) -> None:
+        pass
+
+    def record_exception(
+        self, exception: BaseException, attributes=None, timestamp=None, escaped=False
+    ) -> None:
+        pass
+
+    def set_status(self, status, description: Optional[str] = None) -> None:
+        pass
+
+    def end(self, end_time=None) -> None:
+        pass
+
+    def is_recording(self) -> bool:
+        return False
+
+
+class NoOpTracer:
+    """Tracer of the shim used when OpenTelemetry is not installed."""
+
+    _span = NoOpSpan()
+
+    def start_span(
+        self, name: str, context=None, kind=None, attributes=None, **kwargs
+    ) -> NoOpSpan:
+        return self._span
+
+
+_JobScope = collections.namedtuple('_JobScope', 'span job_ids')
+
+_scope: contextvars.ContextVar[Optional[_JobScope]] = contextvars.ContextVar(
+    'bsubio_job_scope', default=None
+)
+
+
+class _JobEntry:
+    __slots__ = ('span', 'status', 'owned', 'ended')
+
+    def __init__(self, span, owned: bool) -> None:
+        self.span = span
+        self.status: Optional[str] = None
+        self.owned = owned
+        self.ended = False
+
+
+def _context_with(span):
+    if isinstance(span, NoOpSpan):
+        return None
+    if otel_trace is None:
+        # custom tracers without OpenTelemetry get the parent span itself
+        return span
+    return otel_trace.set_span_in_context(span)
+
+
+class JobTracer:
+    """Opens job spans and HTTP call spans.
+
+    :param tracer: OpenTelemetry tracer (or any object with a compatible
+        ``start_span``; without OpenTelemetry its ``context`` argument is
+        the parent span); defaults to ``trace.get_tracer('bsubio')`` or the
+        no-op shim.
+    :param max_jobs: job spans remembered for parenting later calls; the
+        least recently used are ended and forgotten beyond this.
+    :param propagate: inject the trace context into request headers.
+    """
+
+    def __init__(self, tracer=None, max_jobs: int = 10000, propagate: bool = True) -> None:
+        if tracer is None:
+            if otel_trace is not None:
+                from bsubio import __version__
+                tracer = otel_trace.get_tracer('bsubio', __version__)
+            else:
+                tracer = NoOpTracer()
+        self.tracer = tracer
+        self.max_jobs = max_jobs
+        self.propagate = propagate and otel_propagate is not None
+        self._jobs: 'collections.OrderedDict[str, _JobEntry]' = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def job(self, job_id: Optional[str] = None, **attributes: Any) -> Iterator[Any]:
+        """Opens a job span for the calls made inside the block.
+
+        The job id is taken from `job_id` or from the first job returned or
+        addressed inside the block.
+        """
+        span = self.tracer.start_span('bsubio.job', attributes=attributes or None)
+        scope = _JobScope(span, [])
+        token = _scope.set(scope)
+        if job_id is not None:
+            self._bind(scope, str(job_id))
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _scope.reset(token)
+            with self._lock:
+                for bound in scope.job_ids:
+                    entry = self._jobs.get(bound)
+                    if entry is not None and entry.span is span:
+                        entry.ended = True
+            span.end()
+
+    def _bind(self, scope: _JobScope, job_id: str) -> None:
+        scope.job_ids.append(job_id)
+        scope.span.set_attribute('bsubio.job_id', job_id)
+        with self._lock:
+            entry = self._jobs.pop(job_id, None)
+            if entry is not None and entry.owned and not entry.ended:
+                entry.span.end()
+            self._remember(job_id, _JobEntry(scope.span, owned=False))
+
+    def _remember(self, job_id: str, entry: _JobEntry) -> None:
+        self._jobs[job_id] = entry
+        while len(self._jobs) > self.max_jobs:
+            _, evicted = self._jobs.popitem(last=False)
+            if evicted.owned and not evicted.ended:
+                evicted.span.end()
+
+    def _entry(self, job_id: str, create: bool = True) -> Optional[_JobEntry]:
+        if create:
+            scope = _scope.get()
+            if scope is not None and not scope.job_ids:
+                self._bind(scope, job_id)
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is not None:
+                self._jobs.move_to_end(job_id)
+                return entry
+            if not create:
+                return None
+            span = self.tracer.start_span('bsubio.job', attributes={'bsubio.job_id': job_id})
+            entry = _JobEntry(span, owned=True)
+            self._remember(job_id, entry)
+            return entry
+
+    def parent_context(self, job_id: Optional[str]):
+        """Returns the context new call spans for `job_id` are parented to.
+
+        Must be called on the caller's thread, before the request is handed
+        to worker threads (hedging).
+        """
+        if job_id is not None:
+            entry = self._entry(job_id)
+            assert entry is not None
+            return _context_with(entry.span)
+        scope = _scope.get()
+        if scope is not None:
+            return _context_with(scope.span)
+        if otel_context is not None:
+            return otel_context.get_current()
+        return None
+
+    def start_call(self, operation: Operation, method: str, url: str, attempt: int, parent):
+        """Starts the client span of one HTTP attempt."""
+        parts = urlsplit(url)
+        attributes = {
+            'http.request.method': method,
+            'url.path': parts.path,
+            'server.address': parts.hostname or '',
+            'bsubio.operation': operation.name,
+            'bsubio.attempt': attempt,
+        }
+        if parts.port is not None:
+            attributes['server.port'] = parts.port
+        kind = otel_trace.SpanKind.CLIENT if otel_trace is not None else None
+        return self.tracer.start_span(
+            'bsubio.' + operation.name, context=parent, kind=kind, attributes=attributes
+        )
+
+    def inject(self, span, headers: Dict[str, str]) -> Dict[str, str]:
+        """Returns `headers` plus the trace context of `span`.
+
+        A copy is returned, as hedged attempts share the caller's headers.
+        """
+        if not self.propagate:
+            return headers
+        context = _context_with(span)
+        if context is None:
+            return headers
+        headers = dict(headers)
+        otel_propagate.inject(headers, context=context)
+        return headers
+
+    def end_call(self, span, status: Optional[int], error: Optional[BaseException]) -> None:
+        if status is not None:
+            span.set_attribute('http.response.status_code', status)
+        if error is not None:
+            span.record_exception(error)
+        failed = error is not None or (status is not None and status >= 500)
+        if otel_trace is not None and failed:
+            span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR))
+        span.end()
+
+    def observe(self, job, create: bool = True) -> None:
+        """Records the status of a `Job` seen in a response.
+
+        :param create: open a job span if the job has none yet; listings
+            only update jobs that are already traced.
+        """
+        if job.id is None or job.status is None:
+            return
+        entry = self._entry(str(job.id), create)
+        if entry is None or entry.status == job.status:
+            return
+        attributes = {'bsubio.job.status': job.status}
+        if entry.status is not None:
+            attributes['bsubio.job.previous_status'] = entry.status
+        for name in ('type', 'data_size', 'claimed_by', 'error_code'):
+            value = getattr(job, name)
+            if value is not None:
+                attributes['bsubio.job.' + name] = value
+        for name in ('created_at', 'claimed_at', 'finished_at'):
+            value = getattr(job, name)
+            if value is not None:
+                attributes['bsubio.job.' + name] = value.isoformat()
+        entry.status = job.status
+        entry.span.add_event('bsubio.job.status', attributes)
+        if job.status in TERMINAL_JOB_STATUSES and entry.owned and not entry.ended:
+            entry.ended = True
+            entry.span.end()
+
+    def observe_response(self, data) -> None:
+        """Records every `Job` in a deserialized response model."""
+        payload = getattr(data, 'data', None)
+        if payload is None:
+            return
+        if hasattr(payload, 'status') and hasattr(payload, 'id'):
+            self.observe(payload)
+            return
+        for job in getattr(payload, 'jobs', None) or ():
+            self.observe(job, create=False)
+
+    def end_job(self, job_id: str) -> None:
+        """Ends the implicit span of `job_id`."""
+        with self._lock:
+            entry = self._jobs.pop(str(job_id), None)
+        if entry is not None and entry.owned and not entry.ended:
+            entry.ended = True
+            entry.span.end()
+
+    def close(self) -> None:
+        """Ends all open implicit job spans."""
+        with self._lock:
+            entries = list(self._jobs.values())
+            self._jobs.clear()
+        for entry in entries:
+            if entry.owned and not entry.ended:
+                entry.ended = True
+                entry.span.end()
@@ -0,0 +1,146 @@
+"""Waiting for jobs to finish.
+
+A :class:`JobWaiter` polls `JobsApi.get_job` until jobs reach a terminal
+status. With a `bsubio.predictor.DurationPredictor` the first poll of every
+job is scheduled at its predicted completion time instead of a fixed
+interval, so a 2 KB passthru job is checked again after a fraction of a
+second while a 3 GB transcode is left alone for minutes. Once the
+prediction has passed, polls back off geometrically from `min_interval` to
+`max_interval`. Completed jobs are fed back into the predictor.
+
+With `fields`, polls build only those `Job` fields (plus the ones the
+waiter and its predictor read); see `bsubio.lazyjob`.
+"""
+
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
+
+from bsubio.api.jobs_api import JobsApi
+from bsubio.exceptions import ApiException
+from bsubio.lazyjob import LazyJob
+from bsubio.models.job import Job
+from bsubio.operations import TERMINAL_JOB_STATUSES
+from bsubio.predictor import DurationPredictor
+
+PolledJob = Union[Job, LazyJob]
+JobRef = Union[PolledJob, UUID, str]
+
+_WAITER_FIELDS = ('id', 'status')
+_PREDICTOR_FIELDS = ('type', 'data_size', 'created_at', 'claimed_at', 'finished_at')
+
+
+class JobWaiter:
+    """Polls jobs until they finish or fail.
+
+    :param jobs_api: API used for `get_job`.
+    :param predictor: schedules first polls and learns from completed
+        jobs; None polls every job right away and then backs off.
+    :param min_interval: first interval once a prediction has passed.
+    :param max_interval: upper bound of the backoff interval (not of the
+        delay until a predicted completion).
+    :param backoff: growth factor of the interval between polls.
+    :param fields: `Job` fields to build on every poll, e.g.
+        ``('id', 'status')``; all by default. ``id``, ``status`` and, with
+        a predictor, the fields it learns from are always included.
+    """
+
+    def __init__(
+        self,
+        jobs_api: JobsApi,
+        predictor: Optional[DurationPredictor] = None,
+        min_interval: float = 0.5,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        fields: Optional[Sequence[str]] = None,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.jobs_api = jobs_api
+        self.predictor = predictor
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.polls = 0
+        if fields is not None:
+            required = _WAITER_FIELDS + (_PREDICTOR_FIELDS if predictor is not None else ())
+            fields = tuple(dict.fromkeys(tuple(fields) + required))
+        self.fields = fields
+        self._clock = clock
+        self._sleep = sleep
+
+    def _schedule(self, job: PolledJob, now: float, interval: float) -> Tuple[float, float]:
+        """Returns ``(due, next_interval)`` for a job that is not done."""
+        if self.predictor is not None:
+            expected = self.predictor.expected_completion(job, now)
+            if expected - now > interval:
+                return expected, self.min_interval
+        return now + interval, min(self.max_interval, interval * self.backoff)
+
+    def _get(self, job_id: Any) -> Optional[PolledJob]:
+        self.polls += 1
+        if self.fields is not None:
+            return self.jobs_api.get_job_projected(job_id, self.fields)
+        response = self.jobs_api.get_job(job_id)
+        return None if response is None else response.data
+
+    def watch(
+        self, jobs: Iterable[JobRef], timeout: Optional[float] = None
+    ) -> Iterator[PolledJob]:
+        """Yields every job once it reached a terminal status.
+
+        Jobs are given as `Job` or `LazyJob` objects (whose status is used
+        to schedule the first poll) or ids (polled right away).
+
+        :raises TimeoutError: if jobs are still running after `timeout`
+            seconds.
+        """
+        now = self._clock()
+        deadline = None if timeout is None else now + timeout
+        order = itertools.count()
+        heap: List[Tuple[float, int, Any, float]] = []
+        for ref in jobs:
+            if isinstance(ref, (Job, LazyJob)):
+                if ref.status in TERMINAL_JOB_STATUSES:
+                    yield ref
+                    continue
+                due, interval = self._schedule(ref, now, self.min_interval)
+                job_id = ref.id
+            else:
+                due, interval, job_id = now, self.min_interval, ref
+            heapq.heappush(heap, (due, next(order), job_id, interval))
+
+        while heap:
+            due, _, job_id, interval = heap[0]
+            now = self._clock()
+            if deadline is not None and due > deadline:
+                if now < deadline:
+                    self._sleep(deadline - now)
+                raise TimeoutError(
+                    '%d job(s) did not finish within %s seconds' % (len(heap), timeout)
+                )
+            if due > now:
+                self._sleep(due - now)
+            heapq.heappop(heap)
+            job = self._get(job_id)
+            if job is None:
+                raise ApiException(status=0, reason='get_job returned no job for %s' % job_id)
+            if job.status in TERMINAL_JOB_STATUSES:
+                if self.predictor is not None:
+                    self.predictor.observe(job)
+                yield job
+                continue
+            due, interval = self._schedule(job, self._clock(), interval)
+            heapq.heappush(heap, (due, next(order), job_id, interval))
+
+    def wait(self, job: JobRef, timeout: Optional[float] = None) -> PolledJob:
+        """Blocks until `job` finished or failed and returns it."""
+        return next(self.watch([job], timeout))
+
+    def wait_all(
+        self, jobs: Iterable[JobRef], timeout: Optional[float] = None
+    ) -> Dict[Any, PolledJob]:
+        """Waits for all `jobs`; returns them keyed by job id."""
+        return {job.id: job for job in self.watch(jobs, timeout)}
@@ -6,9 +6,8 @@
     REST API for batch processing compute-intensive workloads.  Submit jobs, upload data, and retrieve results through a simple API. Perfect for PDF processing, video transcoding, audio transcription, and more.  ## Authentication  All endpoints require Bearer token authentication using your API key:  ``` Authorization: Bearer <your-api-key> ```  Get your API key from the [Dashboard](/).  ## Job Lifecycle  1. **Create** a job with `POST /v1/jobs` - Returns job ID and upload token 2. **Upload** data with `POST /v1/upload/{jobId}` - Uses upload token 3. **Submit** for processing with `POST /v1/jobs/{jobId}/submit` 4. **Monitor** status with `GET /v1/jobs/{jobId}` 5. **Retrieve** output with `GET /v1/jobs/{jobId}/output`  ## Job States  - `created` - Job created, awaiting data upload - `loaded` - Data uploaded successfully - `pending` - Waiting in queue for a worker - `claimed` - Worker claimed the job - `preparing` - Worker preparing to process - `processing` - Processing started - `finished` - Processing completed successfully - `failed` - Processing failed with error 
 
     The version of the OpenAPI document: 1.0.0
-    Generated by OpenAPI Generator (https://openapi-generator.tech)
-
-    Do not edit the class manually.
+    Generated by OpenAPI Generator (https://openapi-generator.tech), since
+    maintained by hand; listed in .openapi-generator-ignore.
 """  # noqa: E501
 
 
@@ -39,6 +38,11 @@ setup(
     url="https://www.bsub.io",
     keywords=["OpenAPI", "OpenAPI-Generator", "BSUB.IO API"],
     install_requires=REQUIRES,
+    extras_require={
+        "http2": ["httpx[http2] >= 0.23.0"],
+        "tracing": ["opentelemetry-api >= 1.20.0"],
+        "analytics": ["numpy >= 1.22"],
+    },
     packages=find_packages(exclude=["test", "tests"]),
     include_package_data=True,
     license="MIT",
@@ -46,5 +50,5 @@ setup(
     long_description="""\
     REST API for batch processing compute-intensive workloads.  Submit jobs, upload data, and retrieve results through a simple API. Perfect for PDF processing, video transcoding, audio transcription, and more.  ## Authentication  All endpoints require Bearer token authentication using your API key:  &#x60;&#x60;&#x60; Authorization: Bearer &lt;your-api-key&gt; &#x60;&#x60;&#x60;  Get your API key from the [Dashboard](/).  ## Job Lifecycle  1. **Create** a job with &#x60;POST /v1/jobs&#x60; - Returns job ID and upload token 2. **Upload** data with &#x60;POST /v1/upload/{jobId}&#x60; - Uses upload token 3. **Submit** for processing with &#x60;POST /v1/jobs/{jobId}/submit&#x60; 4. **Monitor** status with &#x60;GET /v1/jobs/{jobId}&#x60; 5. **Retrieve** output with &#x60;GET /v1/jobs/{jobId}/output&#x60;  ## Job States  - &#x60;created&#x60; - Job created, awaiting data upload - &#x60;loaded&#x60; - Data uploaded successfully - &#x60;pending&#x60; - Waiting in queue for a worker - &#x60;claimed&#x60; - Worker claimed the job - &#x60;preparing&#x60; - Worker preparing to process - &#x60;processing&#x60; - Processing started - &#x60;finished&#x60; - Processing completed successfully - &#x60;failed&#x60; - Processing failed with error 
     """,  # noqa: E501
-    package_data={"bsubio": ["py.typed"]},
+    package_data={"bsubio": ["py.typed", "api/*.pyi"]},
 )
\ No newline at end of file
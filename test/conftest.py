@@ -1,5 +1,10 @@
+from typing import Any, Callable, Dict, List, Tuple
+
 import pytest
 
+# (status, headers, body) of a fake response; the body is str or bytes
+Response = Tuple[int, Dict[str, str], Any]
+
 # These modules are generated placeholders for integration tests against the
 # live BSUB.IO API. Mark them as skipped so the test suite doesn't report
 # misleading greens until real coverage is added.
@@ -30,3 +35,88 @@ def pytest_collection_modifyitems(config, items):
         module_name = item.module.__name__.rsplit(".", 1)[-1]
         if module_name in PLACEHOLDER_MODULES:
             item.add_marker(skip_placeholder)
+
+
+class FakeClock:
+    """Clock for `clock=` parameters; advanced by hand or by :meth:`sleep`."""
+
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class FakeApi:
+    """In-process HTTP server standing in for the bsub.io API.
+
+    Tests register handlers with :meth:`route`; each handler receives the
+    ``BaseHTTPRequestHandler`` and returns ``(status, headers, body)``.
+    """
+
+    def __init__(self) -> None:
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.routes: Dict[Tuple[str, str], Callable[[Any], Response]] = {}
+        self.requests: List[Tuple[str, str, Dict[str, str], bytes]] = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            wbufsize = 1 << 16
+
+            def log_message(self, *args) -> None:
+                pass
+
+            def _dispatch(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                self.body = self.rfile.read(length) if length else b""
+                path = self.path.split("?", 1)[0]
+                fake.requests.append((self.command, self.path, dict(self.headers), self.body))
+                handler = fake.routes.get((self.command, path))
+                headers: Dict[str, str]
+                if handler is None:
+                    status, headers, body = 404, {}, b'{"error": "not found"}'
+                else:
+                    status, headers, body = handler(self)
+                if isinstance(body, str):
+                    body = body.encode()
+                self.send_response(status)
+                headers = {"Content-Type": "application/json", **headers}
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_DELETE = _dispatch
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.host = "http://127.0.0.1:%d" % self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def route(self, method, path, handler) -> None:
+        self.routes[(method, path)] = handler
+
+    def json(self, method, path, payload, status=200, headers=None) -> None:
+        import json
+
+        body = json.dumps(payload)
+        self.route(method, path, lambda _: (status, headers or {}, body))
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture()
+def fake_api():
+    api = FakeApi()
+    yield api
+    api.close()
@@ -0,0 +1,128 @@
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable, List, Optional, cast
+
+import pytest
+
+from bsubio.admission import AdmissionController
+from bsubio.api.jobs_api import JobsApi
+
+from test.conftest import FakeClock
+
+
+class _FakeJobsApi:
+    def __init__(self, pending) -> None:
+        self.pending = pending
+        self.samples = 0
+        self.submitted: List[str] = []
+        self.sampling: Optional[Callable[[], None]] = None
+        self.submitting: Optional[Callable[[str], None]] = None
+
+    def list_jobs(self, status=None, limit=None):
+        assert status == "pending"
+        self.samples += 1
+        if self.sampling is not None:
+            self.sampling()
+        return SimpleNamespace(data=SimpleNamespace(total=self.pending, jobs=[]))
+
+    def submit_job(self, job_id, **kwargs):
+        if self.submitting is not None:
+            self.submitting(job_id)
+        self.submitted.append(job_id)
+        return SimpleNamespace(success=True)
+
+
+def _controller(api: _FakeJobsApi, **kwargs: Any) -> AdmissionController:
+    return AdmissionController(cast(JobsApi, api), **kwargs)
+
+
+def test_submissions_are_admitted_below_backlog() -> None:
+    api = _FakeJobsApi(pending=1)
+    controller = _controller(api, max_pending=3, clock=FakeClock())
+
+    controller.submit_job("a")
+    controller.submit_job("b")
+
+    assert api.submitted == ["a", "b"]
+    assert api.samples == 1
+    assert controller.estimated_pending == 3
+
+
+def test_submissions_are_held_at_backlog() -> None:
+    api = _FakeJobsApi(pending=5)
+    controller = _controller(api, max_pending=5, sample_interval=0.01)
+
+    with pytest.raises(TimeoutError):
+        controller.submit_job("a", timeout=0.05)
+
+    assert api.submitted == []
+    assert api.samples > 1
+
+
+def test_high_priority_work_gets_through() -> None:
+    api = _FakeJobsApi(pending=100)
+    controller = _controller(api, max_pending=10, high_priority_max_pending=200)
+
+    controller.submit_job("urgent", high_priority=True, timeout=0)
+
+    assert api.submitted == ["urgent"]
+
+
+def test_backlog_is_resampled_after_interval() -> None:
+    clock = FakeClock()
+    api = _FakeJobsApi(pending=0)
+    controller = _controller(api, max_pending=1, sample_interval=5, clock=clock)
+
+    controller.admit()
+    api.pending = 0
+    clock.now = 6
+    controller.admit(timeout=0)
+
+    assert api.samples == 2
+
+
+def test_nothing_is_admitted_before_the_first_sample() -> None:
+    api = _FakeJobsApi(pending=0)
+    controller = _controller(api, max_pending=1)
+    sampling, release = threading.Event(), threading.Event()
+
+    def block() -> None:
+        sampling.set()
+        release.wait(1)
+
+    api.sampling = block
+    first = threading.Thread(target=controller.submit_job, args=("a",))
+    first.start()
+    assert sampling.wait(1)
+    # the first sample is in flight; a second caller must not assume 0
+    with pytest.raises(TimeoutError):
+        controller.submit_job("b", timeout=0.05)
+    release.set()
+    first.join()
+
+    assert api.submitted == ["a"]
+    assert api.samples == 1
+
+
+def test_submissions_count_until_a_later_sample() -> None:
+    clock = FakeClock()
+    api = _FakeJobsApi(pending=0)
+    controller = _controller(api, max_pending=1, sample_interval=5, clock=clock)
+
+    def resample_while_in_flight(job_id: str) -> None:
+        if job_id == "a":
+            # "a" is not on the server yet when the next sample is taken
+            clock.now = 6
+            with pytest.raises(TimeoutError):
+                controller.submit_job("b", timeout=0)
+
+    api.submitting = resample_while_in_flight
+    controller.submit_job("a")
+    assert api.submitted == ["a"] and api.samples == 2
+    assert controller.estimated_pending == 1
+
+    # a sample sent after "a" completed counts it on the server side
+    api.pending = 1
+    clock.now = 12
+    assert controller.sample() == 1
+    assert controller.estimated_pending == 1
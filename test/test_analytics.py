@@ -0,0 +1,74 @@
+import datetime
+import math
+
+import pytest
+
+from bsubio.analytics import JobLifecycle, lifecycle_summary
+from bsubio.models.job import Job
+
+T0 = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def make_job(index, job_type, data_size, queue, processing, status="finished"):
+    created = T0 + datetime.timedelta(seconds=index)
+    claimed = created + datetime.timedelta(seconds=queue)
+    return Job(
+        type=job_type,
+        status=status,
+        data_size=data_size,
+        created_at=created,
+        claimed_at=claimed,
+        finished_at=claimed + datetime.timedelta(seconds=processing),
+    )
+
+
+def test_percentiles_by_type_and_size() -> None:
+    jobs = [make_job(i, "passthru", 100, queue=1, processing=i % 10) for i in range(100)]
+    jobs += [make_job(i, "transcode", 5 << 20, queue=10, processing=60) for i in range(10)]
+    lifecycle = JobLifecycle(jobs)
+
+    by_type = lifecycle.percentiles("processing", by="type")
+    assert by_type["passthru"]["count"] == 100
+    assert by_type["passthru"]["p50"] == 4.5
+    assert by_type["passthru"]["p99"] == 9.0
+    assert by_type["transcode"]["p50"] == 60.0
+
+    by_size = lifecycle.percentiles("queue_wait", by="size")
+    assert set(by_size) == {"<1KiB", "1MiB-16MiB"}
+    assert by_size["1MiB-16MiB"]["mean"] == 10.0
+
+    overall = lifecycle.percentiles("end_to_end")["all"]
+    assert overall["count"] == 110
+
+
+def test_missing_timestamps_and_throughput() -> None:
+    jobs = [make_job(i, "passthru", 10, queue=1, processing=1) for i in range(11)]
+    jobs.append(Job(type="passthru", status="pending", created_at=T0))
+    summary = lifecycle_summary(jobs, percentiles=(50,))
+
+    assert summary["overall"]["processing"]["all"]["count"] == 11
+    assert summary["overall"]["throughput"]["all"] == 1.0
+    assert summary["by_type"]["processing"]["passthru"]["p50"] == 1.0
+    assert math.isnan(JobLifecycle(jobs[:1]).throughput()["all"])
+
+
+def test_pure_python_matches_vectorized(monkeypatch) -> None:
+    pytest.importorskip("numpy")
+    import bsubio.analytics
+
+    jobs = [make_job(i, "passthru", i * 1000, queue=i % 7, processing=i % 13) for i in range(50)]
+
+    def flatten(report):
+        return {
+            (section, metric, group, key): value
+            for section, metrics in report.items()
+            for metric, groups in metrics.items()
+            for group, stats in groups.items()
+            for key, value in (stats.items() if isinstance(stats, dict) else [("value", stats)])
+        }
+
+    expected = flatten(JobLifecycle(jobs).summary())
+    monkeypatch.setattr(bsubio.analytics, "numpy", None)
+    assert flatten(JobLifecycle(jobs).summary()) == pytest.approx(expected)
+    dicts = [job.to_dict() for job in jobs]
+    assert flatten(JobLifecycle(dicts).summary()) == pytest.approx(expected)
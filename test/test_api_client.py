@@ -1,3 +1,4 @@
+from typing import Any, cast
 from uuid import uuid4
 
 from bsubio.api_client import ApiClient
@@ -18,12 +19,13 @@ class _DummyRestClient:
 
 def test_api_client_context_clears_pool() -> None:
     client = ApiClient()
-    client.rest_client = _DummyRestClient()
+    rest_client = _DummyRestClient()
+    client.rest_client = cast(Any, rest_client)
 
     with client:
         pass
 
-    assert client.rest_client.pool_manager.cleared is True
+    assert rest_client.pool_manager.cleared is True
 
 
 def test_sanitize_for_serialization_handles_uuid() -> None:
@@ -0,0 +1,105 @@
+import pytest
+
+from bsubio import ApiClient, Configuration, SystemApi
+from bsubio.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerRegistry
+from bsubio.exceptions import CircuitOpenException, ServiceException
+
+from test.conftest import FakeClock
+
+
+def _fail(breaker, times) -> None:
+    for _ in range(times):
+        breaker.record(False, token=breaker.before_call())
+
+
+def test_breaker_opens_after_consecutive_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=3, clock=FakeClock())
+
+    _fail(breaker, 2)
+    breaker.before_call()
+    breaker.record(True)
+    _fail(breaker, 2)
+    assert breaker.state == CLOSED
+
+    _fail(breaker, 1)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()
+
+
+def test_breaker_probes_half_open_and_recovers() -> None:
+    clock = FakeClock()
+    transitions = []
+    breaker = CircuitBreaker(
+        failure_threshold=1,
+        recovery_timeout=10,
+        clock=clock,
+        on_state_change=lambda b, old, new: transitions.append((old, new)),
+    )
+    _fail(breaker, 1)
+
+    clock.now = 10
+    trial = breaker.before_call()
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()  # only one trial request at a time
+    breaker.record(True, token=trial)
+
+    assert breaker.state == CLOSED
+    assert transitions == [(CLOSED, OPEN), (OPEN, HALF_OPEN), (HALF_OPEN, CLOSED)]
+
+
+def test_failed_probe_reopens() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    _fail(breaker, 1)
+    clock.now = 10
+
+    _fail(breaker, 1)
+
+    assert breaker.state == OPEN
+
+
+def test_calls_admitted_before_opening_do_not_drive_half_open() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10, clock=clock)
+    assert breaker.before_call() is None  # a slow call, admitted while closed
+    _fail(breaker, 1)
+    clock.now = 10
+
+    trial = breaker.before_call()
+    assert trial is not None and breaker.state == HALF_OPEN
+    breaker.record(True)  # the slow call completes during the trial
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenException):
+        breaker.before_call()  # the trial slot is still taken
+
+    breaker.record(False, token=trial)
+    assert breaker.state == OPEN
+    breaker.record(True, token=trial)  # a stale trial token changes nothing
+    assert breaker.state == OPEN
+
+
+def test_slow_calls_count_as_failures() -> None:
+    breaker = CircuitBreaker(failure_threshold=1, slow_call_threshold=1.0, clock=FakeClock())
+    breaker.before_call()
+    breaker.record(True, latency=2.0)
+
+    assert breaker.state == OPEN
+
+
+def test_api_client_fails_fast_once_open(fake_api) -> None:
+    fake_api.json("GET", "/v1/types", {"error": "down"}, status=503)
+    fake_api.json("GET", "/v1/version", {"version": "1"})
+    config = Configuration(host=fake_api.host)
+    config.circuit_breakers = CircuitBreakerRegistry(failure_threshold=2)
+
+    with ApiClient(config) as client:
+        system_api = SystemApi(client)
+        for _ in range(2):
+            with pytest.raises(ServiceException):
+                system_api.get_types()
+        with pytest.raises(CircuitOpenException) as excinfo:
+            system_api.get_version()  # same host, same "poll" family
+
+    assert excinfo.value.circuit.endswith("/poll")
+    assert len(fake_api.requests) == 2
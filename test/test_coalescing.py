@@ -0,0 +1,178 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
+
+import pytest
+
+from bsubio import ApiClient, Configuration, JobsApi, OutputApi, RequestCoalescer
+from bsubio.exceptions import NotFoundException
+
+from test.conftest import FakeClock
+
+
+def serve_job(fake_api, delay=0.0):
+    job_id = uuid4()
+    body = json.dumps({"success": True, "data": {"id": str(job_id), "status": "processing"}})
+
+    def handler(_):
+        time.sleep(delay)
+        return 200, {}, body
+
+    fake_api.route("GET", "/v1/jobs/%s" % job_id, handler)
+    return job_id
+
+
+def sent(fake_api, path):
+    return sum(1 for _, url, _, _ in fake_api.requests if url.split("?")[0] == path)
+
+
+def test_concurrent_identical_calls_share_one_request(fake_api) -> None:
+    job_id = serve_job(fake_api, delay=0.2)
+    other_id = serve_job(fake_api)
+    config = Configuration(host=fake_api.host)
+    config.coalescing = coalescer = RequestCoalescer()
+
+    with ApiClient(config) as client:
+        api = JobsApi(client)
+        start = threading.Barrier(8)
+
+        def get(_):
+            start.wait()
+            return api.get_job(job_id)
+
+        with ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(get, range(8)))
+        api.get_job(other_id)
+        api.get_job_with_http_info(other_id)
+
+    assert sent(fake_api, "/v1/jobs/%s" % job_id) == 1
+    assert all(result is results[0] for result in results)
+    assert str(results[0].data.id) == str(job_id)
+    # different URLs and return modes are separate calls
+    assert sent(fake_api, "/v1/jobs/%s" % other_id) == 2
+    assert coalescer.calls == 10 and coalescer.shared == 7
+
+
+def test_memo_window_and_errors(fake_api) -> None:
+    job_id = serve_job(fake_api)
+    fake_api.route(
+        "GET", "/v1/jobs/%s/output" % job_id,
+        lambda _: (200, {"Content-Type": "application/octet-stream"}, b"output"),
+    )
+    clock = FakeClock()
+    config = Configuration(host=fake_api.host)
+    config.coalescing = RequestCoalescer(window=1.0, clock=clock)
+
+    with ApiClient(config) as client:
+        api = JobsApi(client)
+        first = api.get_job(job_id)
+        clock.now = 0.9
+        assert api.get_job(job_id) is first
+        clock.now = 1.5
+        assert api.get_job(job_id) is not first
+        assert sent(fake_api, "/v1/jobs/%s" % job_id) == 2
+
+        missing = uuid4()
+        for _ in range(2):
+            with pytest.raises(NotFoundException):
+                api.get_job(missing)
+        assert sent(fake_api, "/v1/jobs/%s" % missing) == 2
+
+        # operations outside `operations` are never coalesced
+        output_api = OutputApi(client)
+        assert output_api.get_job_output(job_id) is not output_api.get_job_output(job_id)
+
+
+def test_async_callers_share_a_read_response(fake_api) -> None:
+    job_id = serve_job(fake_api, delay=0.2)
+    config = Configuration(host=fake_api.host)
+    config.coalescing = RequestCoalescer()
+    url = fake_api.host + "/v1/jobs/%s" % job_id
+
+    async def main(client):
+        return await asyncio.gather(*(client.call_api_async("GET", url) for _ in range(5)))
+
+    with ApiClient(config) as client:
+        responses = asyncio.run(main(client))
+        job = client.response_deserialize(responses[-1], {"200": "CreateJob201Response"}).data
+
+    assert sent(fake_api, "/v1/jobs/%s" % job_id) == 1
+    assert all(response is responses[0] for response in responses)
+    assert responses[0].data is not None
+    assert str(job.data.id) == str(job_id)
+
+
+def test_async_callers_do_not_join_api_methods(fake_api) -> None:
+    job_id = serve_job(fake_api, delay=0.2)
+    config = Configuration(host=fake_api.host)
+    config.coalescing = RequestCoalescer()
+    url = fake_api.host + "/v1/jobs/%s" % job_id
+
+    async def main(client):
+        # the API method is in flight while the coroutine starts
+        thread_call = asyncio.ensure_future(asyncio.to_thread(JobsApi(client).get_job, job_id))
+        await asyncio.sleep(0.05)
+        return await asyncio.gather(thread_call, client.call_api_async("GET", url))
+
+    with ApiClient(config) as client:
+        job, response = asyncio.run(main(client))
+
+    # one shares a model, the other a response: they are separate calls
+    assert sent(fake_api, "/v1/jobs/%s" % job_id) == 2
+    assert job.data is not None and response.status == 200
+
+
+def test_cancelled_async_follower_does_not_cancel_the_call() -> None:
+    coalescer = RequestCoalescer()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def main():
+        leader = asyncio.ensure_future(coalescer.call_async("key", slow))
+        follower = asyncio.ensure_future(coalescer.call_async("key", slow))
+        await asyncio.sleep(0)
+        follower.cancel()
+        return await leader
+
+    assert asyncio.run(main()) == "result"
+
+
+def test_followers_wait_at_most_their_own_timeout(fake_api) -> None:
+    job_id = serve_job(fake_api, delay=0.5)
+    config = Configuration(host=fake_api.host)
+    config.coalescing = RequestCoalescer()
+
+    with ApiClient(config) as client:
+        api = JobsApi(client)
+        with ThreadPoolExecutor(1) as pool:
+            leader = pool.submit(api.get_job, job_id)
+            time.sleep(0.1)
+            started = time.monotonic()
+            with pytest.raises(TimeoutError):
+                api.get_job(job_id, _request_timeout=(0.05, 0.05))
+            assert time.monotonic() - started < 0.3
+            assert leader.result().data is not None
+
+    assert sent(fake_api, "/v1/jobs/%s" % job_id) == 1
+
+
+def test_async_followers_wait_at_most_their_timeout() -> None:
+    coalescer = RequestCoalescer()
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        return "result"
+
+    async def main():
+        leader = asyncio.ensure_future(coalescer.call_async("key", slow))
+        await asyncio.sleep(0)
+        with pytest.raises(TimeoutError):
+            await coalescer.call_async("key", slow, timeout=0.05)
+        return await leader
+
+    assert asyncio.run(main()) == "result"
@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+from typing import List, Tuple
+from uuid import uuid4
+
+import pytest
+
+from bsubio import ApiClient, Configuration, CreateJobRequest, JobsApi
+from bsubio.concurrency import AdaptiveConcurrencyLimiter
+from bsubio.operations import OPERATIONS_BY_NAME
+
+from test.conftest import FakeClock
+
+
+def test_limit_grows_additively_while_healthy() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, clock=clock)
+
+    for _ in range(3):
+        started = limiter.acquire()
+        clock.now += 0.05
+        limiter.release(started, congested=False)
+
+    assert limiter.limit == 3
+
+
+def test_limit_halves_once_per_congestion_episode() -> None:
+    clock = FakeClock()
+    changes: List[Tuple[int, int]] = []
+    limiter = AdaptiveConcurrencyLimiter(
+        initial_limit=8, clock=clock, on_limit_change=lambda *c: changes.append(c)
+    )
+
+    tokens = [limiter.acquire() for _ in range(4)]
+    clock.now += 0.05
+    for token in tokens:
+        limiter.release(token, congested=True)
+
+    assert limiter.limit == 4
+    assert changes == [(8, 4)]
+
+
+def test_latency_spike_counts_as_congestion() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_tolerance=3.0, clock=clock)
+
+    started = limiter.acquire()
+    clock.now += 0.1
+    limiter.release(started, congested=False)
+    started = limiter.acquire()
+    clock.now += 1.0
+    limiter.release(started, congested=False)
+
+    assert limiter.limit == 2
+
+
+def test_acquire_blocks_at_limit() -> None:
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+    limiter.acquire()
+
+    with pytest.raises(TimeoutError):
+        limiter.acquire(timeout=0.01)
+
+
+def test_create_job_calls_are_limited(fake_api) -> None:
+    peak = []
+    active = []
+    lock = threading.Lock()
+    payload = json.dumps({"success": True, "data": {"id": str(uuid4())}})
+
+    def handler(_):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.02)
+        with lock:
+            active.pop()
+        return 201, {}, payload
+
+    fake_api.route("POST", "/v1/jobs", handler)
+    config = Configuration(host=fake_api.host)
+    config.concurrency_limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+
+    with ApiClient(config) as client:
+        jobs_api = JobsApi(client)
+        threads = [
+            threading.Thread(target=jobs_api.create_job, args=(CreateJobRequest(type="passthru"),))
+            for _ in range(6)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert max(peak) == 2
+    assert config.concurrency_limiter.in_flight == 0
+
+
+def test_baselines_are_kept_per_operation_and_size() -> None:
+    clock = FakeClock()
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, latency_tolerance=3.0, clock=clock)
+    create = limiter.baseline_key(OPERATIONS_BY_NAME["create_job"])
+    small = limiter.baseline_key(OPERATIONS_BY_NAME["upload_job_data"], 1 << 10)
+    large = limiter.baseline_key(OPERATIONS_BY_NAME["upload_job_data"], 1 << 30)
+    assert len({create, small, large}) == 3
+
+    for key, latency in ((create, 0.05), (small, 0.1), (large, 10.0)):
+        started = limiter.acquire()
+        clock.now += latency
+        limiter.release(started, congested=False, key=key)
+
+    # the slow large upload was compared with nothing, not the small calls
+    assert limiter.limit == 4
+    assert limiter.baseline_latency(large) == pytest.approx(10.0)
+
+    started = limiter.acquire()
+    clock.now += 1.0
+    limiter.release(started, congested=False, key=small)
+    assert limiter.limit == 2
+
+
+def test_upload_size_selects_the_baseline(fake_api) -> None:
+    job_id = uuid4()
+    fake_api.json("POST", "/v1/upload/%s" % job_id, {"success": True, "data_size": 3})
+    config = Configuration(host=fake_api.host)
+    config.concurrency_limiter = limiter = AdaptiveConcurrencyLimiter()
+
+    with ApiClient(config) as client:
+        JobsApi(client).upload_job_data(job_id, "token", ("a.bin", bytearray(1 << 20)))
+
+    upload = OPERATIONS_BY_NAME["upload_job_data"]
+    assert limiter.baseline_latency(limiter.baseline_key(upload, 1 << 20)) is not None
+    assert limiter.baseline_latency(limiter.baseline_key(upload, 0)) is None
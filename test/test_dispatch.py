@@ -0,0 +1,71 @@
+import inspect
+from inspect import getattr_static
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from bsubio import ApiClient, Configuration, JobsApi, OutputApi
+from bsubio.dispatch import ApiOperation, api_operations
+
+
+@api_operations(
+    ApiOperation(
+        "get_version",
+        "Get API version",
+        "Returns version information for the API server",
+        returns=str,
+        responses={"200": "str"},
+    )
+)
+class VersionApi:
+    def __init__(self, api_client) -> None:
+        self.api_client = api_client
+
+
+def test_validators_are_built_on_first_use(fake_api) -> None:
+    fake_api.route("GET", "/v1/version", lambda _: (200, {"Content-Type": "text/plain"}, "1.0.0"))
+    assert not inspect.isfunction(getattr_static(VersionApi, "get_version"))
+    # the methods are generated, so mypy does not know them
+    cls: Any = VersionApi
+    parameters = list(inspect.signature(cls.get_version_with_http_info).parameters)
+    assert parameters[1] == "_request_timeout"
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        api = cls(client)
+        assert api.get_version() == "1.0.0"
+        assert api.get_version_with_http_info().status_code == 200
+        assert api.get_version_without_preload_content().status == 200
+        with pytest.raises(ValidationError):
+            api.get_version(_host_index=1)
+
+    # the validated function replaced the lazy descriptor on the class
+    assert inspect.isfunction(getattr_static(VersionApi, "get_version"))
+
+
+def test_optional_query_parameters_are_omitted(fake_api) -> None:
+    fake_api.json("GET", "/v1/jobs", {"success": True, "data": {"jobs": [], "total": 0}})
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        JobsApi(client).list_jobs(limit=5)
+        JobsApi(client).list_jobs()
+
+    assert [path for _, path, _, _ in fake_api.requests] == ["/v1/jobs?limit=5", "/v1/jobs"]
+
+
+def test_hand_written_methods_are_validated(fake_api) -> None:
+    fake_api.json("GET", "/v1/jobs", {"success": True, "data": {"jobs": [], "total": 0}})
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        jobs_api = JobsApi(client)
+        with pytest.raises(ValidationError):
+            jobs_api.list_jobs_stream(limit=1000)
+        not_a_uuid: Any = "not-a-uuid"
+        with pytest.raises(ValidationError):
+            OutputApi(client).get_job_output_into(not_a_uuid, bytearray(1))
+        with pytest.raises(ValidationError):
+            jobs_api.list_jobs_stream(_host_index=1)
+        assert list(jobs_api.list_jobs_stream(limit=5, _content_type=None, _host_index=0)) == []
+        assert list(jobs_api.raw.list_jobs_stream(limit=5)) == []
+
+    assert [path for _, path, _, _ in fake_api.requests] == ["/v1/jobs?limit=5"] * 2
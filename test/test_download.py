@@ -0,0 +1,69 @@
+import gzip
+import io
+import mmap
+from uuid import uuid4
+
+import pytest
+import urllib3
+
+from bsubio import ApiClient, Configuration, OutputApi
+from bsubio.download import map_response, read_into
+from bsubio.exceptions import NotFoundException
+
+OUTPUT = bytes(range(256)) * 1024
+
+
+def serve_output(fake_api, body=OUTPUT):
+    job_id = uuid4()
+    fake_api.route(
+        "GET", "/v1/jobs/%s/output" % job_id,
+        lambda _: (200, {"Content-Type": "application/octet-stream"}, body),
+    )
+    return job_id
+
+
+def test_output_into_buffers(fake_api, tmp_path) -> None:
+    job_id = serve_output(fake_api)
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        api = OutputApi(client)
+        target = bytearray(len(OUTPUT) + 10)
+        assert api.get_job_output_into(job_id, memoryview(target)[5:]) == len(OUTPUT)
+        assert target[5:-5] == OUTPUT
+
+        with open(tmp_path / "out.bin", "w+b") as file:
+            file.truncate(len(OUTPUT))
+            with mmap.mmap(file.fileno(), len(OUTPUT)) as mapped:
+                api.get_job_output_into(job_id, mapped)
+                assert mapped[:] == OUTPUT
+
+        with pytest.raises(ValueError):
+            api.get_job_output_into(job_id, bytearray(10))
+        with pytest.raises(TypeError):
+            api.get_job_output_into(job_id, b"read-only")
+
+        view = api.get_job_output_mmap(job_id, str(tmp_path / "mapped.bin"))
+        assert view.readonly and view == OUTPUT
+        assert (tmp_path / "mapped.bin").read_bytes() == OUTPUT
+        assert api.get_job_output_mmap(job_id) == OUTPUT
+
+        with pytest.raises(NotFoundException):
+            api.get_job_output_into(uuid4(), bytearray(10))
+        # the connection was released after each download
+        assert api.get_job_output(job_id) == OUTPUT
+
+
+def response(body, headers):
+    return urllib3.HTTPResponse(body=io.BytesIO(body), headers=headers, preload_content=False)
+
+
+def test_compressed_and_unsized_bodies() -> None:
+    compressed = response(gzip.compress(OUTPUT), {"Content-Encoding": "gzip"})
+    target = bytearray(len(OUTPUT))
+    assert read_into(compressed, target) == len(OUTPUT) and target == OUTPUT
+
+    with pytest.raises(ValueError):
+        read_into(response(gzip.compress(OUTPUT), {"Content-Encoding": "gzip"}), bytearray(100))
+
+    assert map_response(response(OUTPUT, {})) == OUTPUT
+    assert map_response(response(b"", {"Content-Length": "0"})).nbytes == 0
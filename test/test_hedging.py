@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+from typing import Any, List
+from uuid import uuid4
+
+from bsubio import ApiClient, Configuration, JobsApi
+from bsubio.hedging import HedgingPolicy
+from bsubio.operations import OPERATIONS_BY_NAME
+
+
+def test_slow_read_is_hedged_and_first_response_wins(fake_api) -> None:
+    job_id = uuid4()
+    calls = []
+    lock = threading.Lock()
+    payload = json.dumps({"success": True, "data": {"id": str(job_id), "status": "pending"}})
+
+    def handler(_):
+        with lock:
+            calls.append(1)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.5)
+        return 200, {}, payload
+
+    fake_api.route("GET", "/v1/jobs/%s" % job_id, handler)
+    config = Configuration(host=fake_api.host)
+    config.hedging = HedgingPolicy(initial_delay=0.02, budget_percent=100)
+
+    with ApiClient(config) as client:
+        started = time.monotonic()
+        job = JobsApi(client).get_job(job_id)
+        elapsed = time.monotonic() - started
+
+    assert job.data is not None and job.data.status == "pending"
+    assert elapsed < 0.4
+    assert config.hedging.hedges_sent == 1
+    assert config.hedging.hedges_won == 1
+
+
+def test_saturated_pool_does_not_cap_concurrency(fake_api) -> None:
+    job_id = uuid4()
+    payload = json.dumps({"success": True, "data": {"id": str(job_id), "status": "pending"}})
+    # every request waits until all callers are in flight at once
+    barrier = threading.Barrier(6, timeout=5)
+
+    def handler(_):
+        barrier.wait()
+        return 200, {}, payload
+
+    fake_api.route("GET", "/v1/jobs/%s" % job_id, handler)
+    config = Configuration(host=fake_api.host)
+    config.hedging = HedgingPolicy(initial_delay=1.0, max_workers=2)
+    statuses: List[Any] = []
+
+    with ApiClient(config) as client:
+        def call() -> None:
+            job = JobsApi(client).get_job(job_id)
+            statuses.append(job.data and job.data.status)
+
+        threads = [threading.Thread(target=call) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert statuses == ["pending"] * 6
+    assert config.hedging.hedges_sent == 0
+
+
+def test_hedging_respects_budget() -> None:
+    policy = HedgingPolicy(initial_delay=0.0, min_delay=0.0, budget_percent=1)
+    policy.budget.try_withdraw()  # spend the single saved-up token
+    get_job = OPERATIONS_BY_NAME["get_job"]
+
+    def send():
+        time.sleep(0.01)
+        return "response"
+
+    assert policy.call(get_job, send) == "response"
+    assert policy.hedges_sent == 0
+
+
+def test_zero_budget_disables_hedging() -> None:
+    policy = HedgingPolicy(initial_delay=0.0, min_delay=0.0, budget_percent=0)
+    get_job = OPERATIONS_BY_NAME["get_job"]
+
+    assert not policy.applies_to(get_job)
+    assert not policy.budget.try_withdraw()
+
+
+class _Response:
+    def __init__(self) -> None:
+        self.closed = threading.Event()
+        self.read_called = False
+
+    def read(self, amt=None) -> bytes:
+        self.read_called = True
+        return b""
+
+    def close(self) -> None:
+        self.closed.set()
+
+
+class _RESTResponse:
+    def __init__(self) -> None:
+        self.response = _Response()
+
+
+def test_losing_attempt_is_closed_unread() -> None:
+    policy = HedgingPolicy(initial_delay=0.01, min_delay=0.0, budget_percent=100)
+    get_job = OPERATIONS_BY_NAME["get_job"]
+    responses = [_RESTResponse(), _RESTResponse()]
+    attempts = iter(range(2))
+
+    def send():
+        index = next(attempts)
+        if index == 0:
+            time.sleep(0.2)
+        return responses[index]
+
+    assert policy.call(get_job, send) is responses[1]
+    loser = responses[0].response
+    assert loser.closed.wait(1)
+    assert not loser.read_called
+
+
+def test_hedged_attempts_get_a_timeout(fake_api) -> None:
+    job_id = uuid4()
+    payload = json.dumps({"success": True, "data": {"id": str(job_id), "status": "pending"}})
+    fake_api.route("GET", "/v1/jobs/%s" % job_id, lambda _: (200, {}, payload))
+    timeouts: List[Any] = []
+    config = Configuration(host=fake_api.host)
+    config.hedging = HedgingPolicy(attempt_timeout=7.0)
+
+    with ApiClient(config) as client:
+        request = client.rest_client.request
+
+        def recording_request(*args, **kwargs):
+            timeouts.append(kwargs["_request_timeout"])
+            return request(*args, **kwargs)
+
+        client.rest_client.request = recording_request
+        JobsApi(client).get_job(job_id)
+        JobsApi(client).get_job(job_id, _request_timeout=3.0)
+
+    assert timeouts == [7.0, 3.0]
+
+
+def test_hedging_only_applies_to_idempotent_operations() -> None:
+    policy = HedgingPolicy(operations=("get_job", "create_job"))
+
+    assert policy.applies_to(OPERATIONS_BY_NAME["get_job"])
+    assert not policy.applies_to(OPERATIONS_BY_NAME["create_job"])
+
+
+def test_delay_tracks_latency_quantile() -> None:
+    policy = HedgingPolicy(quantile=0.9, min_samples=10, min_delay=0.0)
+    get_job = OPERATIONS_BY_NAME["get_job"]
+
+    for ms in range(1, 101):
+        policy.record_latency(get_job, ms / 1000.0)
+
+    assert 0.085 <= policy.delay_for(get_job) <= 0.095
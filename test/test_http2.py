@@ -0,0 +1,98 @@
+import time
+from typing import Any
+
+import pytest
+
+from bsubio import ApiClient, Configuration, SystemApi
+
+pytest.importorskip("httpx")
+pytest.importorskip("h2")
+
+
+def test_http2_client_falls_back_to_http11(fake_api) -> None:
+    fake_api.json("GET", "/v1/version", {"version": "1.2.3", "server": "bsubio"})
+    config = Configuration(host=fake_api.host)
+    config.http2 = True
+
+    with ApiClient(config) as client:
+        version = SystemApi(client).get_version()
+        raw = SystemApi(client).get_version_without_preload_content()
+
+    assert version.version == "1.2.3"
+    assert raw.status == 200
+    assert raw.version == 11
+
+
+def test_http2_client_raises_api_exception_on_error_status(fake_api) -> None:
+    from bsubio.exceptions import NotFoundException
+
+    config = Configuration(host=fake_api.host)
+    config.http2 = True
+
+    with ApiClient(config) as client:
+        with pytest.raises(NotFoundException):
+            SystemApi(client).get_types()
+
+
+def test_http2_transport_errors_are_urllib3_errors(fake_api) -> None:
+    import urllib3
+
+    from bsubio.retry import RetryEngine, RetryPolicy
+
+    config = Configuration(host="http://127.0.0.1:9")
+    config.http2 = True
+    config.retry_engine = engine = RetryEngine(
+        RetryPolicy(max_attempts=2, backoff_factor=0, jitter=False), sleep=lambda _: None
+    )
+    with ApiClient(config) as client:
+        with pytest.raises(urllib3.exceptions.NewConnectionError):
+            SystemApi(client).get_version()
+    # retried like a refused connection of the urllib3 transport
+    assert engine.budget is not None and engine.budget.available < engine.budget.max_tokens
+
+    def slow(_):
+        time.sleep(0.5)
+        return 200, {}, '{"version": "1.2.3"}'
+
+    fake_api.route("GET", "/v1/version", slow)
+    config = Configuration(host=fake_api.host)
+    config.http2 = True
+    with ApiClient(config) as client:
+        with pytest.raises(urllib3.exceptions.ReadTimeoutError):
+            SystemApi(client).get_version(_request_timeout=0.05)
+
+
+def test_http2_proxy_mount_keeps_socket_options() -> None:
+    import inspect
+    import socket
+
+    import httpx
+
+    if "socket_options" not in inspect.signature(httpx.HTTPTransport).parameters:
+        pytest.skip("socket_options requires httpx >= 0.25")
+
+    config = Configuration(host="http://127.0.0.1:9")
+    config.http2 = True
+    config.proxy = "http://127.0.0.1:3128"
+    config.socket_options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
+    with ApiClient(config) as client:
+        (proxy,) = client.rest_client.pool_manager._mounts.values()
+        pool: Any = proxy._pool  # httpcore internals
+
+    assert pool._socket_options == config.socket_options
+
+
+def test_http2_transport_takes_urllib3_retry_counts() -> None:
+    import urllib3
+
+    config = Configuration(host="http://127.0.0.1:9")
+    config.http2 = True
+    # urllib3 takes a Retry as well as a count
+    retries: Any = urllib3.Retry(total=5, connect=2)
+    config.retries = retries
+
+    with ApiClient(config) as client:
+        pool: Any = client.rest_client.pool_manager._transport._pool  # httpcore internals
+
+    assert pool._retries == 2
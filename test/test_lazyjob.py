@@ -0,0 +1,142 @@
+import datetime
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+from uuid import UUID, uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from bsubio import ApiClient, Configuration, JobsApi, LazyJob
+from bsubio.coalescing import RequestCoalescer
+from bsubio.exceptions import NotFoundException
+from bsubio.lazyjob import job_builder
+from bsubio.middleware import Middleware
+from bsubio.models.job import Job
+from bsubio.predictor import DurationPredictor
+from bsubio.waiter import JobWaiter
+
+
+def raw_job(status="finished"):
+    return {
+        "id": str(uuid4()), "status": status, "type": "passthru", "data_size": 2048,
+        "created_at": "2025-01-01T00:00:00Z", "claimed_at": "2025-01-01T00:00:01Z",
+        "finished_at": "2025-01-01T00:00:03Z", "error_message": None,
+    }
+
+
+def test_lazy_job_validates_fields_on_access() -> None:
+    raw = raw_job()
+    job = LazyJob(raw)
+
+    assert job._values == {}
+    assert job.status == "finished"
+    assert set(job._values) == {"status"}
+    assert job.id == UUID(raw["id"])
+    assert job.finished_at == datetime.datetime(2025, 1, 1, 0, 0, 3, tzinfo=datetime.timezone.utc)
+    assert job.error_message is None and job.user_id is None
+    assert job.to_job() == Job.from_dict(raw)
+    assert job.to_dict() == raw
+    with pytest.raises(AttributeError):
+        job.no_such_field
+
+    broken = LazyJob({**raw, "status": "exploded"})
+    assert broken.type == "passthru"
+    with pytest.raises(ValidationError):
+        broken.status
+
+    projected = LazyJob(raw, fields=("id", "status"))
+    assert projected.status == "finished" and projected.created_at is None
+
+
+def test_projection_builds_only_the_given_fields() -> None:
+    raw = raw_job()
+    job = job_builder(("id", "status"))(raw)
+
+    assert isinstance(job, Job)
+    assert job.model_fields_set == {"id", "status"}
+    assert job.created_at is None
+    assert job_builder()(raw) == Job.from_dict(raw)
+    assert isinstance(job_builder(lazy=True)(raw), LazyJob)
+    with pytest.raises(ValueError):
+        job_builder(("id", "state"))
+
+
+def test_projected_api_calls(fake_api) -> None:
+    running = raw_job("processing")
+    finished = {**running, "status": "finished"}
+    replies = iter([running, running, finished])
+    fake_api.route("GET", "/v1/jobs/%s" % running["id"], lambda _: (
+        200, {}, json.dumps({"success": True, "data": next(replies, finished)})
+    ))
+    listing = {"jobs": [running, finished], "total": 2}
+    fake_api.json("GET", "/v1/jobs", {"success": True, "data": listing})
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        api = JobsApi(client)
+        job = api.get_job_projected(running["id"], ("status",))
+        assert isinstance(job, Job)
+        assert job.model_fields_set == {"status"} and job.status == "processing"
+        lazy = api.get_job_projected(running["id"], lazy=True)
+        assert isinstance(lazy, LazyJob) and lazy.data_size == 2048
+        with pytest.raises(NotFoundException):
+            api.get_job_projected(uuid4())
+
+        listed = list(api.list_jobs_stream(fields=("id", "status")))
+        assert [job.status for job in listed] == ["processing", "finished"]
+        assert all(job.model_fields_set == {"id", "status"} for job in listed)
+        assert all(isinstance(job, LazyJob) for job in api.list_jobs_stream(lazy=True))
+
+        waiter = JobWaiter(api, min_interval=0.01, fields=("status",))
+        assert waiter.fields == ("status", "id")
+        done = waiter.wait(running["id"], timeout=5)
+        assert done.status == "finished" and done.model_fields_set == {"id", "status"}
+
+    with_predictor = JobWaiter(api, DurationPredictor(), fields=("status",))
+    required = {"id", "status", "type", "data_size", "claimed_at", "finished_at"}
+    assert set(with_predictor.fields or ()) >= required
+
+
+class Deserialized(Middleware):
+    def __init__(self) -> None:
+        self.seen: List[Any] = []
+
+    def deserialize(self, response_data, response_types_map, call_next):
+        api_response = call_next(response_data, response_types_map)
+        self.seen.append(api_response.data.data)
+        return api_response
+
+
+def test_projected_calls_go_through_hooks_and_coalescing(fake_api) -> None:
+    raw = raw_job("processing")
+    release = threading.Event()
+
+    def reply(_):
+        release.wait(5)
+        return 200, {}, json.dumps({"success": True, "data": raw})
+
+    fake_api.route("GET", "/v1/jobs/%s" % raw["id"], reply)
+    hook = Deserialized()
+    config = Configuration(host=fake_api.host)
+    config.middleware = [hook]
+    config.coalescing = RequestCoalescer()
+
+    with ApiClient(config) as client:
+        api = JobsApi(client)
+        with ThreadPoolExecutor(6) as pool:
+            calls = [
+                pool.submit(api.get_job_projected, raw["id"], fields, lazy)
+                for fields, lazy in [(("status",), False), (None, True), (None, False)] * 2
+            ]
+            time.sleep(0.2)
+            release.set()
+            status_only, lazy, full, *again = [call.result(5) for call in calls]
+
+    # one request per distinct projection, each deserialized once through the hooks
+    assert len(fake_api.requests) == 3 and len(hook.seen) == 3
+    assert isinstance(status_only, Job) and status_only.model_fields_set == {"status"}
+    assert isinstance(lazy, LazyJob) and lazy.status == "processing"
+    assert isinstance(full, Job) and full.created_at is not None
+    assert again == [status_only, lazy, full]
@@ -0,0 +1,108 @@
+import itertools
+import json
+from typing import Any
+from uuid import uuid4
+
+import urllib3
+
+from bsubio import ApiClient, Configuration, OutputApi, SystemApi
+from bsubio.metrics import LogHistogram, MetricsRegistry
+from bsubio.retry import RetryEngine, RetryPolicy
+
+
+def test_log_histogram_quantiles_are_within_one_bucket() -> None:
+    histogram = LogHistogram()
+    values = [i / 1000.0 for i in range(1, 1001)]
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.count == 1000
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        estimate = histogram.quantile(q)
+        assert estimate is not None
+        assert exact <= estimate <= exact * histogram.growth
+    assert histogram.quantile(1.0) == 1.0
+    assert histogram.cumulative(stride=4)[-1] == (float("inf"), 1000)
+
+
+def test_registry_counts_statuses_and_retries(fake_api) -> None:
+    body = json.dumps({"version": "1.0.0"})
+    statuses = itertools.chain([503], itertools.repeat(200))
+    fake_api.route("GET", "/v1/version", lambda _: (next(statuses), {}, body))
+    metrics = MetricsRegistry()
+    config = Configuration(host=fake_api.host)
+    config.metrics = metrics
+    config.retry_engine = RetryEngine(
+        RetryPolicy(backoff_factor=0, jitter=False), sleep=lambda _: None
+    )
+
+    with ApiClient(config) as client:
+        SystemApi(client).get_version()
+        SystemApi(client).get_version()
+        snapshot = metrics.snapshot()
+        text = metrics.to_prometheus()
+
+    assert snapshot["latency"][("get_version", "503")]["count"] == 1
+    assert snapshot["latency"][("get_version", "200")]["count"] == 2
+    assert snapshot["retries"] == {("get_version", "client"): 1}
+    assert snapshot["bytes_received"]["get_version"] == 3 * len(body)
+    (pool,) = snapshot["pools"].values()
+    assert pool["opened"] == 1 and pool["requests"] == 3
+    assert 'bsubio_client_requests_total{operation="get_version",status="200"} 2' in text
+    assert (
+        'bsubio_client_request_duration_seconds_bucket'
+        '{operation="get_version",status="200",le="+Inf"} 2'
+    ) in text
+    assert 'bsubio_client_retries_total{operation="get_version",layer="client"} 1' in text
+
+
+def test_registry_counts_urllib3_retries_and_errors(fake_api) -> None:
+    body = json.dumps({"version": "1.0.0"})
+    statuses = itertools.chain([503], itertools.repeat(200))
+    fake_api.route("GET", "/v1/version", lambda _: (next(statuses), {}, body))
+    metrics = MetricsRegistry()
+    config = Configuration(host=fake_api.host)
+    config.metrics = metrics
+    # the urllib3 transport takes a Retry as well as a count
+    retries: Any = urllib3.Retry(total=2, status_forcelist=[503], backoff_factor=0)
+    config.retries = retries
+
+    with ApiClient(config) as client:
+        SystemApi(client).get_version()
+
+    assert metrics.snapshot()["retries"] == {("get_version", "transport"): 1}
+
+    config = Configuration(host="http://127.0.0.1:9")
+    config.metrics = metrics
+    config.retries = 0
+    with ApiClient(config) as client:
+        try:
+            SystemApi(client).get_version()
+        except Exception:
+            pass
+
+    snapshot = metrics.snapshot()
+    assert snapshot["latency"][("get_version", "error")]["count"] == 1
+    assert sum(snapshot["errors"].values()) == 1
+
+
+def test_unread_responses_stay_urllib3_responses(fake_api) -> None:
+    job_id = uuid4()
+    output = b"line\n" * 20000
+    fake_api.route("GET", "/v1/jobs/%s/output" % job_id, lambda _: (200, {}, output))
+    metrics = MetricsRegistry()
+    config = Configuration(host=fake_api.host)
+    config.metrics = metrics
+
+    with ApiClient(config) as client:
+        api = OutputApi(client)
+        response = api.get_job_output_without_preload_content(job_id)
+        assert isinstance(response, urllib3.HTTPResponse)
+        with response:
+            assert b"".join(response) == output
+        assert metrics.snapshot()["bytes_received"]["get_job_output"] == len(output)
+
+        # reading through .data completes the record as well
+        assert api.get_job_output_without_preload_content(job_id).data == output
+        assert metrics.snapshot()["bytes_received"]["get_job_output"] == 2 * len(output)
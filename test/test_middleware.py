@@ -0,0 +1,109 @@
+import asyncio
+import json
+from typing import Any, List, Optional, Tuple
+
+from bsubio import ApiClient, Configuration, SystemApi
+from bsubio.middleware import Middleware
+from bsubio.retry import RetryEngine, RetryPolicy
+
+
+class Recorder(Middleware):
+    def __init__(self, name, calls) -> None:
+        self.name = name
+        self.calls = calls
+
+    def handle(self, request, call_next):
+        self.calls.append((self.name, request.operation.name, request.attempt))
+        request.headers["X-Middleware"] = self.name
+        response = call_next(request)
+        self.calls.append((self.name, response.status))
+        return response
+
+
+class Deserialized(Middleware):
+    def __init__(self) -> None:
+        self.seen: List[Tuple[str, str]] = []
+
+    def deserialize(self, response_data, response_types_map, call_next):
+        api_response = call_next(response_data, response_types_map)
+        self.seen.append((response_data.request.operation.name, api_response.data.version))
+        return api_response
+
+
+class AsyncRecorder(Middleware):
+    def __init__(self, calls) -> None:
+        self.calls = calls
+
+    async def handle_async(self, request, call_next):
+        self.calls.append("async")
+        return await call_next(request)
+
+
+def test_empty_chain_calls_transport_directly() -> None:
+    client = ApiClient(Configuration())
+    assert client.middleware == [] and client._chain is None
+
+
+def test_middleware_wraps_builtins_in_order(fake_api) -> None:
+    statuses = iter([503, 200])
+    body = json.dumps({"version": "1.0.0"})
+    fake_api.route("GET", "/v1/version", lambda _: (next(statuses), {}, body))
+    calls: List[Any] = []
+    deserialized = Deserialized()
+    config = Configuration(host=fake_api.host)
+    config.middleware = [Recorder("outer", calls), deserialized]
+    config.retry_engine = RetryEngine(
+        RetryPolicy(backoff_factor=0, jitter=False), sleep=lambda _: None
+    )
+
+    with ApiClient(config) as client:
+        assert SystemApi(client).get_version().version == "1.0.0"
+
+    # the user middleware is outside the retry loop: it sees one call
+    assert calls == [("outer", "get_version", 1), ("outer", 200)]
+    sent = [headers.get("X-Middleware") for _, _, headers, _ in fake_api.requests]
+    assert sent == ["outer", "outer"]
+    assert deserialized.seen == [("get_version", "1.0.0")]
+
+
+def test_async_chain_runs_sync_middleware_in_thread(fake_api) -> None:
+    fake_api.json("GET", "/v1/version", {"version": "1.0.0"})
+    calls: List[Any] = []
+    config = Configuration(host=fake_api.host)
+    config.middleware = [AsyncRecorder(calls), Recorder("sync", calls)]
+
+    async def main(client):
+        response = await client.call_api_async("GET", fake_api.host + "/v1/version")
+        response.read()
+        return response
+
+    with ApiClient(config) as client:
+        response = asyncio.run(main(client))
+
+    assert response.status == 200
+    assert calls == ["async", ("sync", "get_version", 1), ("sync", 200)]
+
+
+class RawData(Middleware):
+    def __init__(self) -> None:
+        self.seen: List[Tuple[Optional[bytes], Optional[bytes]]] = []
+
+    def deserialize(self, response_data, response_types_map, call_next):
+        api_response = call_next(response_data, response_types_map)
+        self.seen.append((api_response.raw_data, response_data.data))
+        return api_response
+
+
+def test_plain_methods_release_the_body(fake_api) -> None:
+    fake_api.json("GET", "/v1/version", {"version": "1.0.0"})
+    raw = RawData()
+    config = Configuration(host=fake_api.host)
+    config.middleware = [raw]
+
+    with ApiClient(config) as client:
+        api = SystemApi(client)
+        assert api.get_version().version == "1.0.0"
+        assert api.get_version_with_http_info().raw_data == b'{"version": "1.0.0"}'
+
+    assert raw.seen[0] == (b"", None)
+    assert raw.seen[1][0] is raw.seen[1][1]
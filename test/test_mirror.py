@@ -0,0 +1,138 @@
+import datetime
+import json
+import sqlite3
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlsplit
+from uuid import uuid4
+
+import pytest
+
+from bsubio import ApiClient, Configuration, JobMirror, JobsApi
+
+T0 = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def at(minutes):
+    return (T0 + datetime.timedelta(minutes=minutes)).isoformat().replace("+00:00", "Z")
+
+
+class FakeJobs:
+    """Serves `list_jobs` and `get_job` from a dict of job payloads."""
+
+    def __init__(self, fake_api) -> None:
+        self.fake_api = fake_api
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        fake_api.route("GET", "/v1/jobs", self.list)
+
+    def add(self, status, job_type="passthru", minutes=0, size=1024):
+        job_id = str(uuid4())
+        self.set(job_id, status=status, type=job_type, data_size=size,
+                 created_at=at(minutes), updated_at=at(minutes))
+        return job_id
+
+    def set(self, job_id, **fields):
+        job = self.jobs.setdefault(job_id, {"id": job_id})
+        job.update(fields)
+        self.fake_api.route("GET", "/v1/jobs/%s" % job_id, lambda _: (
+            (200, {}, json.dumps({"success": True, "data": self.jobs[job_id]}))
+            if job_id in self.jobs else (404, {}, '{"error": "not found"}')
+        ))
+
+    def list(self, request):
+        query = parse_qs(urlsplit(request.path).query)
+        status, limit = query["status"][0], int(query["limit"][0])
+        jobs = sorted(
+            (job for job in self.jobs.values() if job["status"] == status),
+            key=lambda job: job["updated_at"], reverse=True,
+        )
+        data = {"jobs": jobs[:limit], "total": len(jobs)}
+        return 200, {}, json.dumps({"success": True, "data": data})
+
+    def listed(self):
+        return sum(1 for _, path, _, _ in self.fake_api.requests if path.startswith("/v1/jobs?"))
+
+    def fetched(self):
+        return sum(1 for _, path, _, _ in self.fake_api.requests if path.startswith("/v1/jobs/"))
+
+
+def test_incremental_sync_and_queries(fake_api, tmp_path) -> None:
+    server = FakeJobs(fake_api)
+    failed = [server.add("failed", "pdf-extract", minutes=i, size=1 << (10 + i)) for i in range(3)]
+    server.add("finished", "passthru", minutes=5)
+    running = server.add("processing", "transcode", minutes=6)
+    pending = server.add("pending", "transcode", minutes=7)
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        mirror = JobMirror(str(tmp_path / "jobs.db"), JobsApi(client))
+        assert mirror.sync() == (6, 0, (), 0)
+        assert len(mirror) == 6
+        assert mirror.sync().changed == 0
+
+        # the running job finishes; the pending one is deleted without
+        # ever showing up in a listing we request
+        server.set(running, status="finished", updated_at=at(20), finished_at=at(20))
+        del server.jobs[pending]
+        mirror.statuses = ("pending", "finished", "failed")
+        fetched = server.fetched()
+        result = mirror.sync()
+        assert (result.changed, result.removed) == (1, 1)
+        # only the running job was unaccounted for by the listings
+        assert server.fetched() - fetched == 1
+        finished = mirror.get(running)
+        assert finished is not None and finished.status == "finished"
+        assert mirror.get(pending) is None
+
+        assert [str(job.id) for job in mirror.query(status="failed")] == failed[::-1]
+        assert len(mirror.query(status="failed", since=T0 + datetime.timedelta(minutes=1))) == 2
+        assert len(mirror.query(since=T0.timestamp(), until=T0.timestamp() + 60)) == 1
+        assert len(mirror.query(min_size=2048, max_size=2048)) == 1
+        assert len(mirror.query(time_column="finished_at", since=T0)) == 1
+        assert mirror.counts("type", status="failed") == {"pdf-extract": 3}
+        assert mirror.counts("status") == {"failed": 3, "finished": 2}
+        with pytest.raises(ValueError):
+            mirror.query(time_column="claimed_at; DROP TABLE jobs")
+        mirror.close()
+
+    # readable from another connection while in WAL mode, without an API
+    with sqlite3.connect(str(tmp_path / "jobs.db")) as db:
+        assert db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with JobMirror(str(tmp_path / "jobs.db")) as reader:
+        assert len(reader) == 5
+        with pytest.raises(ValueError):
+            reader.sync()
+
+
+def test_truncated_pages_are_reported(fake_api) -> None:
+    server = FakeJobs(fake_api)
+    for minute in range(3):
+        server.add("finished", minutes=minute)
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        mirror = JobMirror(":memory:", JobsApi(client), statuses=("finished",), page_size=2)
+        assert mirror.sync().truncated == ("finished",)
+        assert mirror.sync().truncated == ()
+        for minute in range(10, 13):
+            server.add("finished", minutes=minute)
+        result = mirror.sync()
+        assert result.truncated == ("finished",) and result.changed == 2
+
+
+def test_refreshes_per_sync_are_limited(fake_api) -> None:
+    server = FakeJobs(fake_api)
+    pending = [server.add("pending", minutes=minute) for minute in range(5)]
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        mirror = JobMirror(":memory:", JobsApi(client), statuses=("pending",), max_refreshes=2)
+        mirror.sync()
+        # the jobs leave the listings without changing
+        mirror.statuses = ()
+        refreshed = []
+        for _ in range(3):
+            fetched = len(fake_api.requests)
+            assert mirror.sync().deferred == 3
+            refreshed.append([
+                path.rsplit("/", 1)[1] for _, path, _, _ in fake_api.requests[fetched:]
+            ])
+
+    # oldest updated_at first, then the jobs not refreshed for longest
+    assert refreshed == [pending[:2], pending[2:4], [pending[4], pending[0]]]
@@ -0,0 +1,118 @@
+import mmap
+from email.parser import BytesParser
+from email.policy import HTTP
+from typing import Any, List
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from bsubio import ApiClient, Configuration, JobsApi
+from bsubio.multipart import MultipartBody, map_file
+
+DATA = bytes(range(256)) * 512
+
+
+def serve_upload(fake_api):
+    job_id = uuid4()
+    fake_api.json("POST", "/v1/upload/%s" % job_id, {"success": True, "message": "uploaded"})
+    return job_id
+
+
+def uploaded(fake_api):
+    """Returns the headers and the uploaded file part of the last request."""
+    _, _, headers, body = fake_api.requests[-1]
+    message = BytesParser(policy=HTTP).parsebytes(
+        b"Content-Type: %s\r\n\r\n" % headers["Content-Type"].encode() + body
+    )
+    (part,) = message.iter_parts()
+    return headers, part
+
+
+def test_body_references_caller_buffers() -> None:
+    data = bytearray(DATA)
+    body = MultipartBody([("file", ("data.bin", data, "application/octet-stream"))], boundary="b")
+
+    assert any(isinstance(chunk, memoryview) and chunk.obj is data for chunk in body)
+    assert len(body) == sum(len(chunk) for chunk in body)
+    assert body.headers() == {
+        "Content-Type": "multipart/form-data; boundary=b",
+        "Content-Length": str(len(body)),
+    }
+    # small parts are inlined into the surrounding headers
+    small = MultipartBody([("file", ("data.bin", b"tiny", "text/plain"))], boundary="b")
+    assert len(small.chunks) == 1 and b"\r\n\r\ntiny\r\n--b--\r\n" in small.chunks[0]
+
+
+def test_upload_buffers_without_copies(fake_api, tmp_path) -> None:
+    job_id = serve_upload(fake_api)
+    path = tmp_path / "input.bin"
+    path.write_bytes(DATA)
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        api = JobsApi(client)
+        with open(path, "rb") as file, \
+                mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            api.upload_job_data(job_id, "token", ("input.bin", memoryview(mapped)[256:]))
+        headers, part = uploaded(fake_api)
+        assert part.get_filename() == "input.bin"
+        assert part.get_payload(decode=True) == DATA[256:]
+        assert "Transfer-Encoding" not in headers
+
+        api.upload_job_data(job_id, "token", bytearray(DATA))
+        assert uploaded(fake_api)[1].get_payload(decode=True) == DATA
+
+        api.upload_job_data(job_id, "token", str(path))
+        _, part = uploaded(fake_api)
+        assert part.get_filename() == "input.bin"
+        assert part.get_payload(decode=True) == DATA
+
+        api.upload_job_data(job_id, "token", ("empty.txt", b""))
+        assert uploaded(fake_api)[1].get_payload(decode=True) == b""
+
+        not_a_buffer: Any = 12345
+        with pytest.raises(ValidationError):
+            api.upload_job_data(job_id, "token", not_a_buffer)
+
+
+def test_mapped_paths_are_closed_after_the_upload(fake_api, tmp_path, monkeypatch) -> None:
+    from bsubio import api_client
+
+    job_id = serve_upload(fake_api)
+    path = tmp_path / "input.bin"
+    path.write_bytes(DATA)
+    mapped: List[Any] = []
+
+    def record(name):
+        mapped.append(map_file(name))
+        return mapped[-1]
+
+    monkeypatch.setattr(api_client, "map_file", record)
+    caller_map = mmap.mmap(-1, len(DATA))
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        api = JobsApi(client)
+        api.upload_job_data(job_id, "token", str(path))
+        api.upload_job_data(job_id, "token", ("input.bin", caller_map))
+
+    assert uploaded(fake_api)[1].get_payload(decode=True) == bytes(len(DATA))
+    (upload,) = mapped
+    assert upload.closed
+    # mappings passed in by the caller are left open
+    assert not caller_map.closed
+    caller_map.close()
+
+
+def test_upload_over_http2_client(fake_api) -> None:
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    job_id = serve_upload(fake_api)
+    config = Configuration(host=fake_api.host)
+    config.http2 = True
+
+    with ApiClient(config) as client:
+        JobsApi(client).upload_job_data(job_id, "token", ("input.bin", memoryview(DATA)))
+
+    headers, part = uploaded(fake_api)
+    assert part.get_payload(decode=True) == DATA
+    assert "Transfer-Encoding" not in headers
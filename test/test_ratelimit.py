@@ -0,0 +1,143 @@
+import asyncio
+import itertools
+import multiprocessing
+import threading
+import time
+
+from bsubio import ApiClient, Configuration, SystemApi
+from bsubio.operations import OPERATIONS_BY_NAME
+from bsubio.ratelimit import FileTokenBucket, RateLimiter, TokenBucket
+from bsubio.retry import RetryEngine, RetryPolicy
+
+from test.conftest import FakeClock
+
+
+def test_token_bucket_spaces_waiters_evenly() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+
+    waits = [bucket.reserve() for _ in range(5)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert [round(w, 3) for w in waits[2:]] == [0.1, 0.2, 0.3]
+
+
+def test_token_bucket_refills_over_time() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=1, clock=clock)
+
+    assert bucket.reserve() == 0.0
+    clock.now = 0.1
+    assert bucket.reserve() == 0.0
+
+
+def _reserve_many(path, count, queue) -> None:
+    bucket = FileTokenBucket(path, rate=1, capacity=10, clock=lambda: 1000.0)
+    queue.put([bucket.reserve() for _ in range(count)])
+    bucket.close()
+
+
+def test_file_token_bucket_is_shared_between_processes(tmp_path) -> None:
+    path = str(tmp_path / "bucket")
+    queue = multiprocessing.get_context("fork").Queue()
+    procs = [
+        multiprocessing.get_context("fork").Process(target=_reserve_many, args=(path, 5, queue))
+        for _ in range(4)
+    ]
+    for proc in procs:
+        proc.start()
+    waits = sorted(w for _ in procs for w in queue.get(timeout=10))
+    for proc in procs:
+        proc.join()
+
+    # 10 burst tokens for the whole host, the other 10 are queued 1s apart
+    assert waits == [0.0] * 10 + [float(n) for n in range(1, 11)]
+
+
+def _slow_clock() -> float:
+    time.sleep(0.001)  # widen the read-modify-write window
+    return 1000.0
+
+
+def _reserve_inherited(bucket, count, queue) -> None:
+    queue.put([bucket.reserve() for _ in range(count)])
+
+
+def test_file_token_bucket_built_before_fork(tmp_path) -> None:
+    context = multiprocessing.get_context("fork")
+    bucket = FileTokenBucket(str(tmp_path / "bucket"), rate=1, capacity=10, clock=_slow_clock)
+    assert bucket.reserve() == 0.0
+    queue = context.Queue()
+    procs = [
+        context.Process(target=_reserve_inherited, args=(bucket, 50, queue)) for _ in range(4)
+    ]
+    for proc in procs:
+        proc.start()
+    waits = sorted(w for _ in procs for w in queue.get(timeout=30))
+    for proc in procs:
+        proc.join()
+
+    # each child locks its own open file, so no reservation is lost
+    assert waits == [0.0] * 9 + [float(n) for n in range(1, 192)]
+    assert bucket.reserve() == 192.0
+    bucket.close()
+
+
+def test_rate_limiter_is_applied_per_family(fake_api) -> None:
+    fake_api.json("GET", "/v1/version", {"version": "1"})
+    reservations = []
+
+    class RecordingBucket:
+        def reserve(self, amount=1.0):
+            reservations.append(amount)
+            return 0.0
+
+    config = Configuration(host=fake_api.host)
+    config.rate_limiter = RateLimiter({"create": TokenBucket(rate=1), "poll": RecordingBucket()})
+
+    with ApiClient(config) as client:
+        SystemApi(client).get_version()
+        SystemApi(client).get_version()
+
+    assert reservations == [1.0, 1.0]
+
+
+def test_async_calls_wait_on_the_event_loop(fake_api) -> None:
+    statuses = itertools.chain([503], itertools.repeat(200))
+    fake_api.route("GET", "/v1/version", lambda _: (next(statuses), {}, '{"version": "1"}'))
+    threads = []
+
+    class RecordingBucket:
+        def reserve(self, amount=1.0):
+            threads.append(threading.current_thread())
+            return 0.0
+
+    config = Configuration(host=fake_api.host)
+    config.rate_limiter = RateLimiter({"poll": RecordingBucket()})
+    config.retry_engine = RetryEngine(
+        RetryPolicy(backoff_factor=0, jitter=False), sleep=lambda _: None
+    )
+
+    async def main(client):
+        response = await client.call_api_async("GET", fake_api.host + "/v1/version")
+        response.read()
+        return response
+
+    with ApiClient(config) as client:
+        assert asyncio.run(main(client)).status == 200
+
+    # the first attempt waited on the loop, the retry on the worker thread
+    assert threads[0] is threading.main_thread()
+    assert len(threads) == 2 and threads[1] is not threading.main_thread()
+
+
+def test_rate_limiter_acquire_async() -> None:
+    limiter = RateLimiter({"upload": TokenBucket(rate=1000, capacity=1)})
+    upload = OPERATIONS_BY_NAME["upload_job_data"]
+
+    async def run():
+        return [await limiter.acquire_async(upload) for _ in range(2)]
+
+    first, second = asyncio.run(run())
+    assert first == 0.0
+    assert 0 < second <= 0.001
@@ -0,0 +1,31 @@
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from pydantic import ValidationError
+
+from bsubio import ApiClient, Configuration, JobsApi, SystemApi
+
+
+def test_raw_methods_skip_validation(fake_api) -> None:
+    job_id = uuid4()
+    payload = {"success": True, "data": {"id": str(job_id), "status": "pending"}}
+    fake_api.json("GET", "/v1/jobs/%s" % job_id, payload)
+    fake_api.json("GET", "/v1/jobs/legacy-id", payload)
+    fake_api.json("GET", "/v1/version", {"version": "1.0.0"})
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        jobs_api = JobsApi(client)
+        legacy_id: Any = "legacy-id"
+        with pytest.raises(ValidationError):
+            jobs_api.get_job(legacy_id)
+        # nothing is checked: the id is sent as given
+        assert jobs_api.raw.get_job("legacy-id").data.id == job_id
+        assert jobs_api.raw.get_job(str(job_id), _request_timeout=5.0).data.id == job_id
+        assert jobs_api.raw.get_job_with_http_info(job_id).status_code == 200
+        assert SystemApi(client).raw.get_version().version == "1.0.0"
+
+    assert jobs_api.raw is jobs_api.raw
+    assert "get_job" in dir(jobs_api.raw)
+    with pytest.raises(AttributeError):
+        jobs_api.raw._get_job_serialize
@@ -0,0 +1,90 @@
+import itertools
+import json
+import logging
+from uuid import uuid4
+
+from bsubio import ApiClient, Configuration, JobsApi, SystemApi
+from bsubio.requestlog import RequestLogger
+
+
+def test_requests_are_logged_without_tokens(fake_api, caplog) -> None:
+    job_id = uuid4()
+    fake_api.json("POST", "/v1/upload/%s" % job_id, {"success": True, "data_size": 3})
+    config = Configuration(host=fake_api.host)
+    config.request_logger = RequestLogger()
+
+    with caplog.at_level(logging.INFO, logger="bsubio.requests"):
+        with ApiClient(config) as client:
+            JobsApi(client).upload_job_data(job_id, "secret-token", ("a.txt", b"abc"))
+
+    (record,) = caplog.records
+    assert record.bsubio["operation"] == "upload_job_data"
+    assert record.bsubio["status"] == 200
+    assert record.bsubio["job_id"] == str(job_id)
+    assert record.bsubio["bytes_sent"] > 3
+    assert "secret-token" not in record.getMessage()
+    assert "abc" not in record.getMessage()
+
+
+def test_sampling_and_slow_only(fake_api, caplog) -> None:
+    statuses = itertools.chain([200, 503], itertools.repeat(200))
+    body = json.dumps({"version": "1.0.0"})
+    fake_api.route("GET", "/v1/version", lambda _: (next(statuses), {}, body))
+    config = Configuration(host=fake_api.host)
+    config.request_logger = RequestLogger(slow_only=True, slow_threshold=60.0)
+
+    with caplog.at_level(logging.INFO, logger="bsubio.requests"):
+        with ApiClient(config) as client:
+            api = SystemApi(client)
+            api.get_version()
+            try:
+                api.get_version()
+            except Exception:
+                pass
+        config.request_logger = RequestLogger(sample_rate=0.5, random=iter([0.9, 0.1]).__next__)
+        with ApiClient(config) as client:
+            api = SystemApi(client)
+            api.get_version()
+            api.get_version()
+
+    assert [r.bsubio["status"] for r in caplog.records] == [503, 200]
+
+
+def test_disabled_logger_collects_nothing(fake_api) -> None:
+    fake_api.json("GET", "/v1/version", {"version": "1.0.0"})
+    logger = logging.getLogger("bsubio.test.disabled")
+    logger.setLevel(logging.WARNING)
+    config = Configuration(host=fake_api.host)
+    config.request_logger = RequestLogger(logger)
+
+    assert not config.request_logger.active()
+    with ApiClient(config) as client:
+        assert SystemApi(client).get_version().version == "1.0.0"
+
+
+def test_failures_are_gated_on_their_own_level(fake_api, caplog) -> None:
+    statuses = itertools.chain([503], itertools.repeat(200))
+    body = json.dumps({"version": "1.0.0"})
+    fake_api.route("GET", "/v1/version", lambda _: (next(statuses), {}, body))
+    logger = logging.getLogger("bsubio.test.failures")
+    logger.setLevel(logging.WARNING)
+    config = Configuration(host=fake_api.host)
+    config.request_logger = RequestLogger(logger, failure_level=logging.ERROR)
+
+    # neither level is enabled: nothing is collected
+    logger.setLevel(logging.CRITICAL)
+    assert not config.request_logger.active()
+    assert not RequestLogger(logger, log_failures=False).active()
+
+    logger.setLevel(logging.WARNING)
+    assert config.request_logger.active()
+    with caplog.at_level(logging.WARNING, logger="bsubio.test.failures"):
+        with ApiClient(config) as client:
+            api = SystemApi(client)
+            try:
+                api.get_version()
+            except Exception:
+                pass
+            api.get_version()
+
+    assert [(r.levelno, r.bsubio["status"]) for r in caplog.records] == [(logging.ERROR, 503)]
@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List
+from uuid import uuid4
+
+import pytest
+
+from bsubio import ApiClient, CachedProcessor, Configuration, JobsApi, OutputApi, ResultCache
+from bsubio import resultcache
+from bsubio.models.job import Job
+from bsubio.multipart import map_file
+from bsubio.resultcache import content_digest
+from bsubio.waiter import JobWaiter
+
+
+class FakeBackend:
+    """Registers the routes of every job created through `fake_api`."""
+
+    def __init__(self, fake_api, status="finished") -> None:
+        self.fake_api = fake_api
+        self.status = status
+        self.created = 0
+        self.submitted = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+        fake_api.route("POST", "/v1/jobs", self.create)
+
+    def create(self, _):
+        self.created += 1
+        job_id = str(uuid4())
+        job = {"id": job_id, "type": "pdf-extract", "status": "created", "upload_token": "token"}
+        done = {**job, "status": self.status}
+        fake = self.fake_api
+        fake.json("POST", "/v1/upload/%s" % job_id, {"success": True, "message": "uploaded"})
+        fake.route("POST", "/v1/jobs/%s/submit" % job_id, self.submit)
+        fake.json("GET", "/v1/jobs/%s" % job_id, {"success": True, "data": done})
+        output = b"output %d" % self.created
+        fake.route(
+            "GET", "/v1/jobs/%s/output" % job_id,
+            lambda _: (200, {"Content-Type": "application/octet-stream"}, output),
+        )
+        fake.route(
+            "GET", "/v1/jobs/%s/logs" % job_id,
+            lambda _: (200, {"Content-Type": "text/plain"}, "logs"),
+        )
+        return 201, {}, json.dumps({"success": True, "data": job})
+
+    def submit(self, _):
+        self.submitted.set()
+        self.release.wait(10)
+        return 200, {}, '{"success": true, "message": "submitted"}'
+
+
+def processor(client, cache):
+    jobs_api = JobsApi(client)
+    waiter = JobWaiter(jobs_api, min_interval=0.01)
+    return CachedProcessor(jobs_api, OutputApi(client), cache, waiter)
+
+
+def test_hits_skip_the_api(fake_api, tmp_path) -> None:
+    backend = FakeBackend(fake_api)
+    path = tmp_path / "invoice.pdf"
+    path.write_bytes(b"%PDF-1.7 invoice")
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        cache = ResultCache(str(tmp_path / "cache"))
+        first = processor(client, cache).process("pdf-extract", str(path))
+        assert not first.cached and first.output == b"output 1" and first.logs == "logs"
+        requests = len(fake_api.requests)
+
+        # a new cache on the same directory, fed the same bytes another way
+        cache = ResultCache(str(tmp_path / "cache"))
+        copy = ("copy.pdf", bytearray(b"%PDF-1.7 invoice"))
+        again = processor(client, cache).process("pdf-extract", copy)
+        assert again.cached and again.output == b"output 1" and again.job.id == first.job.id
+        assert len(fake_api.requests) == requests
+
+        other = processor(client, cache).process("passthru", str(path))
+        assert not other.cached and backend.created == 2
+
+
+def test_failed_jobs_are_not_cached(fake_api, tmp_path) -> None:
+    backend = FakeBackend(fake_api, status="failed")
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        runner = processor(client, ResultCache(str(tmp_path)))
+        result = runner.process("pdf-extract", b"input")
+        assert result.job.status == "failed" and result.output is None
+        runner.process("pdf-extract", b"input")
+    assert backend.created == 2
+
+
+def test_concurrent_calls_share_one_job(fake_api, tmp_path) -> None:
+    backend = FakeBackend(fake_api)
+    backend.release.clear()
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        runner = processor(client, ResultCache(str(tmp_path)))
+        with ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(runner.process, "pdf-extract", b"same input") for _ in range(4)]
+            assert backend.submitted.wait(10)
+            time.sleep(0.05)
+            backend.release.set()
+            results = [future.result(10) for future in futures]
+
+    assert backend.created == 1
+    assert {result.job.id for result in results} == {results[0].job.id}
+
+
+def test_joined_call_times_out_with_builtin_error(fake_api, tmp_path) -> None:
+    backend = FakeBackend(fake_api)
+    backend.release.clear()
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        runner = processor(client, ResultCache(str(tmp_path)))
+        with ThreadPoolExecutor(1) as pool:
+            leader = pool.submit(runner.process, "pdf-extract", b"same input")
+            assert backend.submitted.wait(10)
+            with pytest.raises(TimeoutError) as raised:
+                runner.process("pdf-extract", b"same input", timeout=0.05)
+            backend.release.set()
+            assert leader.result(10).job.status == "finished"
+
+    assert type(raised.value) is TimeoutError
+
+
+def test_corrupt_entries_are_evicted(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path))
+    digest = content_digest(b"input")
+    cache.put("passthru", digest, Job(id=uuid4()), b"output", "")
+    (tmp_path / "passthru" / digest / "job.json").write_text('{"id": ')
+
+    assert cache.get("passthru", digest) is None
+    assert not (tmp_path / "passthru" / digest).exists()
+    assert cache.size == 0
+
+
+def test_lru_eviction(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path), max_bytes=3000)
+    for name in ("a", "b", "c"):
+        cache.put("passthru", content_digest(name.encode()), Job(id=uuid4()), b"x" * 1000, "")
+    assert cache.get("passthru", content_digest(b"a")) is None
+    # b is used again, so c is evicted next
+    assert cache.get("passthru", content_digest(b"b")) is not None
+    cache.put("passthru", content_digest(b"d"), Job(id=uuid4()), b"x" * 1000, "")
+    assert cache.get("passthru", content_digest(b"c")) is None
+    assert cache.get("passthru", content_digest(b"b")) is not None
+    assert cache.size <= 3000
+
+    # recency survives reopening the directory
+    reopened = ResultCache(str(tmp_path), max_bytes=3000)
+    assert reopened.size == cache.size
+    assert sorted(os.listdir(tmp_path / "passthru")) == sorted(
+        content_digest(name) for name in (b"b", b"d")
+    )
+    cache.put("passthru", content_digest(b"huge"), Job(id=uuid4()), b"x" * 4000, "")
+    assert cache.get("passthru", content_digest(b"huge")) is None
+
+
+def test_types_stay_inside_the_cache(tmp_path) -> None:
+    cache = ResultCache(str(tmp_path / "cache"))
+    for job_type in ("..", ".", "../..", "a/../.."):
+        cache.put(job_type, content_digest(b"input"), Job(id=uuid4()), b"output", "")
+        assert cache.get(job_type, content_digest(b"input")) is not None
+
+    assert sorted(os.listdir(tmp_path)) == ["cache"]
+    assert len(os.listdir(tmp_path / "cache")) == 4
+    assert ResultCache(str(tmp_path / "cache")).size == cache.size
+
+
+def test_digest_of_a_path_closes_the_mapping(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "input"
+    path.write_bytes(b"input")
+    mappings: List[Any] = []
+
+    def recording_map_file(name):
+        mapped = map_file(name)
+        mappings.append(mapped)
+        return mapped
+
+    monkeypatch.setattr(resultcache, "map_file", recording_map_file)
+
+    assert content_digest(str(path)) == content_digest(b"input")
+    assert [mapped.closed for mapped in mappings] == [True]
@@ -0,0 +1,102 @@
+import json
+from typing import List
+from uuid import uuid4
+
+from bsubio import ApiClient, Configuration, CreateJobRequest, JobsApi
+from bsubio.exceptions import ServiceException
+from bsubio.retry import RetryBudget, RetryEngine, RetryPolicy, parse_retry_after
+
+import pytest
+
+
+def _job_payload(job_id):
+    return json.dumps({"success": True, "data": {"id": str(job_id), "status": "pending"}})
+
+
+def _flaky(statuses, payload, headers=None):
+    """Handler answering with `statuses` in turn, then 200 with `payload`."""
+    remaining = list(statuses)
+
+    def handler(_):
+        if remaining:
+            return remaining.pop(0), headers or {}, '{"error": "busy"}'
+        return 200, {}, payload
+
+    return handler
+
+
+def _client(host, engine):
+    config = Configuration(host=host)
+    config.retry_engine = engine
+    return ApiClient(config)
+
+
+def _engine(sleeps, **kwargs):
+    return RetryEngine(
+        default_policy=RetryPolicy(max_attempts=3, jitter=False),
+        sleep=sleeps.append,
+        **kwargs,
+    )
+
+
+def test_idempotent_operation_is_retried_on_503(fake_api) -> None:
+    job_id = uuid4()
+    fake_api.route("GET", "/v1/jobs/%s" % job_id, _flaky([503, 502], _job_payload(job_id)))
+    sleeps: List[float] = []
+
+    with _client(fake_api.host, _engine(sleeps)) as client:
+        job = JobsApi(client).get_job(job_id)
+
+    assert job.data is not None
+    assert job.data.status == "pending"
+    assert len(fake_api.requests) == 3
+    assert sleeps == [0.2, 0.4]
+
+
+def test_unsafe_operation_is_not_retried_without_idempotency_key(fake_api) -> None:
+    fake_api.route("POST", "/v1/jobs", _flaky([503], _job_payload(uuid4())))
+
+    with _client(fake_api.host, _engine([])) as client:
+        with pytest.raises(ServiceException):
+            JobsApi(client).create_job(CreateJobRequest(type="passthru"))
+
+    assert len(fake_api.requests) == 1
+
+
+def test_create_job_is_retried_with_idempotency_key(fake_api) -> None:
+    fake_api.route("POST", "/v1/jobs", _flaky([503], _job_payload(uuid4())))
+
+    with _client(fake_api.host, _engine([], idempotency_keys=True)) as client:
+        JobsApi(client).create_job(CreateJobRequest(type="passthru"))
+
+    keys = {headers["Idempotency-Key"] for _, _, headers, _ in fake_api.requests}
+    assert len(fake_api.requests) == 2
+    assert len(keys) == 1
+
+
+def test_429_honours_retry_after_for_unsafe_operations(fake_api) -> None:
+    fake_api.route("POST", "/v1/jobs", _flaky([429], _job_payload(uuid4()), {"Retry-After": "2"}))
+    sleeps: List[float] = []
+
+    with _client(fake_api.host, _engine(sleeps)) as client:
+        JobsApi(client).create_job(CreateJobRequest(type="passthru"))
+
+    assert sleeps == [2.0]
+
+
+def test_exhausted_budget_stops_retries(fake_api) -> None:
+    job_id = uuid4()
+    fake_api.route("GET", "/v1/jobs/%s" % job_id, _flaky([503, 503], _job_payload(job_id)))
+    budget = RetryBudget(ratio=0.0, min_retries_per_second=0.0, max_tokens=0.0)
+
+    with _client(fake_api.host, _engine([], budget=budget)) as client:
+        with pytest.raises(ServiceException):
+            JobsApi(client).get_job(job_id)
+
+    assert len(fake_api.requests) == 1
+
+
+def test_parse_retry_after() -> None:
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480.0) == 10.0
+    assert parse_retry_after("soon") is None
@@ -0,0 +1,141 @@
+import json
+from typing import Any, List
+from uuid import uuid4
+
+import pytest
+
+from bsubio import ApiClient, Configuration, JobsApi
+from bsubio.exceptions import UnauthorizedException
+from bsubio.streaming import JobStream
+from bsubio.timing import RequestTiming
+from bsubio.tracing import JobTracer, NoOpTracer
+
+
+def job(index):
+    return {
+        "id": str(uuid4()), "status": "failed", "type": "pdf-extract", "data_size": index,
+        "error_message": "ошибка %d – é€" % index, "created_at": "2025-01-01T00:00:00Z",
+    }
+
+
+class ChunkedResponse:
+    """Stands in for an unread urllib3 response, served in small chunks."""
+
+    def __init__(self, body, size) -> None:
+        self.chunks = [body[i:i + size] for i in range(0, len(body), size)]
+        self.read = 0
+        self.released = self.closed = False
+
+    def stream(self, _amount):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def release_conn(self) -> None:
+        self.released = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.parametrize("size", [1, 7, 1 << 16])
+def test_parses_across_chunk_boundaries(size) -> None:
+    jobs = [job(index) for index in range(20)]
+    data = {"total": 12345, "jobs": jobs, "extra": [1, {"a": 2}]}
+    body = json.dumps(
+        {"success": True, "message": None, "data": data}, ensure_ascii=False, indent=1,
+    ).encode()
+    response = ChunkedResponse(body, size)
+    stream = JobStream(response)
+
+    parsed = list(stream)
+    assert [str(item.id) for item in parsed] == [item["id"] for item in jobs]
+    assert parsed[3].error_message == jobs[3]["error_message"]
+    assert stream.total == 12345 and response.released and not response.closed
+
+
+def test_first_job_arrives_before_the_body_is_complete() -> None:
+    jobs = [job(index) for index in range(100)]
+    body = json.dumps({"data": {"jobs": jobs, "total": 100}}).encode()
+    response = ChunkedResponse(body, 256)
+    stream = JobStream(response)
+
+    first = next(stream)
+    assert first.data_size == 0
+    assert response.read < len(response.chunks) / 10
+    assert stream.total is None  # after the array in this body
+    assert sum(1 for _ in stream) == 99 and stream.total == 100
+
+    early = ChunkedResponse(body, 256)
+    with JobStream(early) as stream:
+        next(stream)
+    assert early.closed and not early.released
+
+
+@pytest.mark.parametrize("body", [
+    {"success": True, "data": None},
+    {"success": True, "data": {"jobs": None, "total": 0}},
+    {"success": True, "data": {"jobs": [], "total": 0}},
+    {"success": True},
+])
+def test_empty_listings(body) -> None:
+    stream = JobStream(ChunkedResponse(json.dumps(body).encode(), 3))
+    assert list(stream) == []
+
+
+def test_truncated_body_raises() -> None:
+    body = json.dumps({"data": {"jobs": [job(1), job(2)]}}).encode()
+    response = ChunkedResponse(body[:-40], 16)
+    with pytest.raises(ValueError):
+        list(JobStream(response))
+    assert response.closed
+
+
+def test_list_jobs_stream(fake_api) -> None:
+    jobs = [job(index) for index in range(50)]
+    fake_api.json("GET", "/v1/jobs", {"success": True, "data": {"jobs": jobs, "total": 75}})
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        api = JobsApi(client)
+        with api.list_jobs_stream(status="failed", limit=50) as stream:
+            streamed = list(stream)
+        assert stream.total == 75
+        listed = api.list_jobs(status="failed", limit=50).data
+        assert listed is not None and streamed == listed.jobs
+
+        fake_api.json("GET", "/v1/jobs", {"error": "unauthorized"}, status=401)
+        with pytest.raises(UnauthorizedException):
+            api.list_jobs_stream()
+
+    assert fake_api.requests[0][1] == "/v1/jobs?status=failed&limit=50"
+
+
+class ObservingTracer(JobTracer):
+    def __init__(self) -> None:
+        super().__init__(NoOpTracer())
+        self.observed: List[Any] = []
+
+    def observe(self, job, create: bool = True) -> None:
+        self.observed.append((job.status, create))
+        super().observe(job, create)
+
+
+def test_list_jobs_stream_is_observed_like_list_jobs(fake_api) -> None:
+    jobs = [job(index) for index in range(3)]
+    fake_api.json("GET", "/v1/jobs", {"success": True, "data": {"jobs": jobs, "total": 3}})
+    records: List[RequestTiming] = []
+    tracer = ObservingTracer()
+    config = Configuration(host=fake_api.host)
+    config.tracer = tracer
+    config.timing_callback = records.append
+
+    with ApiClient(config) as client:
+        api = JobsApi(client)
+        list(api.list_jobs_stream(lazy=True))
+        streamed = list(tracer.observed)
+        api.list_jobs()
+
+    assert streamed == [("failed", False)] * 3
+    assert tracer.observed == streamed * 2
+    assert [record.operation for record in records] == ["list_jobs"] * 2
+    assert records[0].bytes_received == records[1].bytes_received > 0
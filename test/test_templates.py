@@ -0,0 +1,67 @@
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from bsubio import ApiClient, Configuration, CreateJobRequest
+from bsubio.templates import TEMPLATES
+
+
+def make_client() -> ApiClient:
+    config = Configuration(host="https://api.example.test", access_token="secret")
+    client = ApiClient(config, header_name="X-Extra", header_value="1")
+    client.cookie = "session=1"
+    return client
+
+
+def test_templates_match_param_serialize() -> None:
+    client = make_client()
+    job_id = uuid4()
+    cases: List[Tuple[str, List[str], Optional[str], Dict[str, Any]]] = [
+        ("get_job", ["application/json"], None, {"path_params": {"jobId": job_id}}),
+        ("get_job_output", ["application/octet-stream", "text/plain", "application/json"], None,
+         {"path_params": {"jobId": "a b/c"}}),
+        ("list_jobs", ["application/json"], None,
+         {"query_params": [("status", "pending"), ("limit", 10)]}),
+        ("create_job", ["application/json"], "application/json",
+         {"body": CreateJobRequest(type="passthru")}),
+        ("upload_job_data", ["application/json"], "multipart/form-data",
+         {"path_params": {"jobId": job_id}, "query_params": [("token", "t&k")],
+          "files": {"file": ("a.txt", b"abc")}}),
+        ("get_version", ["application/json"], None, {}),
+    ]
+    for name, accepts, content_type, kwargs in cases:
+        template = TEMPLATES[name]
+        headers = {"Accept": client.select_header_accept(accepts), "X-Caller": "yes"}
+        if content_type:
+            headers["Content-Type"] = content_type
+        expected = client.param_serialize(
+            method=template.method,
+            resource_path=template.path,
+            path_params=dict(kwargs.get("path_params", {})),
+            query_params=list(kwargs.get("query_params", [])),
+            header_params=headers,
+            body=kwargs.get("body"),
+            post_params=[],
+            files=kwargs.get("files", {}),
+            auth_settings=list(template.auth_settings),
+        )
+        actual = client.serialize_template(template, header_params={"X-Caller": "yes"}, **kwargs)
+        assert actual == expected, name
+
+
+def test_caller_headers_and_request_auth() -> None:
+    client = make_client()
+    caller_headers = {"Accept": "text/plain"}
+    _, _, headers, _, _ = client.serialize_template(
+        TEMPLATES["get_types"],
+        header_params=caller_headers,
+        _request_auth={
+            "in": "header", "type": "bearer", "key": "Authorization", "value": "Bearer other",
+        },
+    )
+    assert headers["Accept"] == "text/plain"
+    assert headers["Authorization"] == "Bearer other"
+    assert caller_headers == {"Accept": "text/plain"}
+
+    client.configuration.access_token = "rotated"
+    _, _, headers, _, _ = client.serialize_template(TEMPLATES["get_types"])
+    assert headers["Authorization"] == "Bearer rotated"
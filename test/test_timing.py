@@ -0,0 +1,130 @@
+import json
+from typing import List
+from uuid import uuid4
+
+from bsubio import ApiClient, Configuration, JobsApi, OutputApi, SystemApi
+from bsubio.timing import RequestTiming
+
+
+def test_timing_records_are_delivered_per_call(fake_api) -> None:
+    body = json.dumps({"version": "1.0.0"})
+    fake_api.route("GET", "/v1/version", lambda _: (200, {}, body))
+    records: List[RequestTiming] = []
+    config = Configuration(host=fake_api.host)
+    config.timing_callback = records.append
+
+    with ApiClient(config) as client:
+        SystemApi(client).get_version()
+        SystemApi(client).get_version()
+
+    first, second = records
+    assert first.operation == "get_version"
+    assert first.status == 200
+    assert first.reused_connection is False
+    assert first.connect is not None and first.connect > 0
+    assert second.reused_connection is True
+    assert second.connect == 0.0
+    for record in records:
+        assert record.bytes_received == len(body)
+        assert record.bytes_sent > 0
+        assert record.pool_wait is not None
+        assert record.ttfb is not None and record.transfer is not None
+        assert record.total is not None and record.total >= record.ttfb
+
+
+def test_timing_record_for_upload_counts_bytes_and_job_id(fake_api) -> None:
+    job_id = uuid4()
+    fake_api.json("POST", "/v1/upload/%s" % job_id, {"success": True, "data_size": 4096})
+    records: List[RequestTiming] = []
+    config = Configuration(host=fake_api.host)
+    config.timing_callback = records.append
+
+    with ApiClient(config) as client:
+        JobsApi(client).upload_job_data(job_id, "secret-token", ("a.bin", b"x" * 4096))
+
+    (record,) = records
+    assert record.operation == "upload_job_data"
+    assert record.job_id == str(job_id)
+    assert record.bytes_sent > 4096
+    assert "secret-token" not in record.path
+
+
+def test_failed_attempts_are_reported() -> None:
+    records: List[RequestTiming] = []
+    config = Configuration(host="http://127.0.0.1:9")
+    config.retries = 0
+    config.timing_callback = records.append
+
+    with ApiClient(config) as client:
+        try:
+            SystemApi(client).get_version()
+        except Exception:
+            pass
+
+    (record,) = records
+    assert record.error is not None
+    assert record.status is None
+
+
+def test_pool_classes_are_untouched_without_callback() -> None:
+    from urllib3.connectionpool import HTTPConnectionPool
+
+    with ApiClient(Configuration()) as client:
+        assert client.rest_client.pool_manager.pool_classes_by_scheme["http"] is HTTPConnectionPool
+
+
+def test_unread_responses_are_timed_until_released(fake_api, tmp_path) -> None:
+    job_id = uuid4()
+    job = {"id": str(job_id), "status": "finished", "type": "passthru"}
+    job_body = json.dumps({"success": True, "data": job})
+    list_body = json.dumps({"success": True, "data": {"jobs": [job] * 20, "total": 20}})
+    output = b"o" * 100000
+    fake_api.route("GET", "/v1/jobs/%s" % job["id"], lambda _: (200, {}, job_body))
+    fake_api.route("GET", "/v1/jobs", lambda _: (200, {}, list_body))
+    fake_api.route("GET", "/v1/jobs/%s/output" % job["id"], lambda _: (200, {}, output))
+    records: List[RequestTiming] = []
+    config = Configuration(host=fake_api.host)
+    config.timing_callback = records.append
+
+    with ApiClient(config) as client:
+        jobs = JobsApi(client)
+        outputs = OutputApi(client)
+
+        response = jobs.get_job_without_preload_content(job_id)
+        assert records == []
+        response.drain_conn()
+        (record,) = records
+        assert record.operation == "get_job" and record.bytes_received == 0
+        response = jobs.get_job_without_preload_content(job_id)
+        response.read(10)
+        response.close()
+        assert records[-1].bytes_received == 10
+        assert record.total is not None
+
+        response = jobs.get_job_without_preload_content(job_id)
+        response.read()
+        assert records[-1].bytes_received == len(job_body)
+
+        assert len(records) == 3
+
+        with jobs.list_jobs_stream() as stream:
+            next(stream)
+        assert records[-1].operation == "list_jobs"
+        assert len(list(jobs.list_jobs_stream())) == 20
+        assert records[-1].bytes_received == len(list_body)
+
+        jobs.get_job_projected(job_id, ("status",))
+        assert records[-1].operation == "get_job"
+        assert records[-1].bytes_received == len(job_body)
+
+        assert outputs.get_job_output_into(job_id, bytearray(len(output))) == len(output)
+        assert records[-1].operation == "get_job_output"
+        assert records[-1].bytes_received == len(output)
+        assert records[-1].transfer is not None
+
+        outputs.get_job_output_mmap(job_id, str(tmp_path / "output"))
+        assert records[-1].operation == "get_job_output"
+        assert records[-1].bytes_received == len(output)
+
+    assert len(records) == 8
+    assert all(record.total is not None and record.error is None for record in records)
@@ -0,0 +1,118 @@
+import json
+from typing import Any, Dict, List, Tuple
+from uuid import uuid4
+
+from bsubio import ApiClient, Configuration, CreateJobRequest, JobsApi, SystemApi
+from bsubio.tracing import JobTracer, NoOpTracer, otel_trace
+
+
+class RecordingSpan:
+    def __init__(self, name, parent, attributes) -> None:
+        self.name = name
+        self.parent = parent
+        self.attributes = dict(attributes or {})
+        self.events: List[Tuple[str, Dict[str, Any]]] = []
+        self.ended = False
+
+    def set_attribute(self, key, value) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name, attributes=None, timestamp=None) -> None:
+        self.events.append((name, dict(attributes or {})))
+
+    def record_exception(self, exception, attributes=None, timestamp=None, escaped=False) -> None:
+        self.events.append(("exception", {"type": type(exception).__name__}))
+
+    def set_status(self, status, description=None) -> None:
+        pass
+
+    def end(self, end_time=None) -> None:
+        self.ended = True
+
+    def get_span_context(self):
+        # called by the propagator when OpenTelemetry is installed
+        return otel_trace.INVALID_SPAN_CONTEXT
+
+
+if otel_trace is not None:
+    # OpenTelemetry keeps only Span instances in a Context
+    otel_trace.Span.register(RecordingSpan)
+
+
+class RecordingTracer:
+    def __init__(self) -> None:
+        self.spans: List[RecordingSpan] = []
+
+    def start_span(self, name, context=None, kind=None, attributes=None, **kwargs):
+        # with OpenTelemetry installed the parent span comes in a Context
+        if otel_trace is not None and context is not None:
+            context = otel_trace.get_current_span(context)
+        parent = context if isinstance(context, RecordingSpan) else None
+        span = RecordingSpan(name, parent, attributes)
+        self.spans.append(span)
+        return span
+
+
+def job_payload(job_id, status):
+    return {"success": True, "data": {"id": str(job_id), "status": status, "type": "passthru"}}
+
+
+def test_job_spans_parent_calls_and_record_transitions(fake_api) -> None:
+    job_id = uuid4()
+    statuses = iter(["pending", "pending", "processing", "finished"])
+    fake_api.route(
+        "GET", "/v1/jobs/%s" % job_id,
+        lambda _: (200, {}, json.dumps(job_payload(job_id, next(statuses)))),
+    )
+    tracer = RecordingTracer()
+    config = Configuration(host=fake_api.host)
+    config.tracer = JobTracer(tracer)
+
+    with ApiClient(config) as client:
+        for _ in range(4):
+            JobsApi(client).get_job(job_id)
+
+    job_span = tracer.spans[0]
+    calls = tracer.spans[1:]
+    assert job_span.name == "bsubio.job"
+    assert job_span.attributes["bsubio.job_id"] == str(job_id)
+    assert [span.name for span in calls] == ["bsubio.get_job"] * 4
+    assert all(span.parent is job_span and span.ended for span in calls)
+    assert calls[0].attributes["http.response.status_code"] == 200
+    transitions = [attrs["bsubio.job.status"] for _, attrs in job_span.events]
+    assert transitions == ["pending", "processing", "finished"]
+    assert job_span.ended
+
+
+def test_explicit_job_scope_adopts_created_job(fake_api) -> None:
+    job_id = uuid4()
+    fake_api.json("POST", "/v1/jobs", job_payload(job_id, "created"), status=201)
+    fake_api.json("POST", "/v1/jobs/%s/submit" % job_id, {"success": True})
+    tracer = RecordingTracer()
+    config = Configuration(host=fake_api.host)
+    config.tracer = JobTracer(tracer)
+
+    with ApiClient(config) as client:
+        api = JobsApi(client)
+        with config.tracer.job(batch="nightly") as job_span:
+            api.create_job(CreateJobRequest(type="passthru"))
+            api.submit_job(job_id)
+            assert not job_span.ended
+
+    assert job_span.ended
+    assert job_span.attributes == {"batch": "nightly", "bsubio.job_id": str(job_id)}
+    create, submit = tracer.spans[1:]
+    assert create.name == "bsubio.create_job" and create.parent is job_span
+    assert submit.name == "bsubio.submit_job" and submit.parent is job_span
+    assert job_span.events == [("bsubio.job.status", {
+        "bsubio.job.status": "created", "bsubio.job.type": "passthru",
+    })]
+
+
+def test_noop_shim_is_used_without_a_tracer(fake_api) -> None:
+    fake_api.json("GET", "/v1/version", {"version": "1.0.0"})
+    config = Configuration(host=fake_api.host)
+    config.tracer = JobTracer(NoOpTracer())
+
+    with ApiClient(config) as client:
+        assert SystemApi(client).get_version().version == "1.0.0"
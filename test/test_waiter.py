@@ -0,0 +1,88 @@
+import datetime
+import json
+from uuid import uuid4
+
+import pytest
+
+from bsubio import ApiClient, Configuration, JobsApi
+from bsubio.predictor import DurationPredictor
+from bsubio.waiter import JobWaiter
+
+from test.conftest import FakeClock
+
+T0 = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def finished_job(job_type, data_size, seconds):
+    from bsubio.models.job import Job
+
+    return Job(
+        id=uuid4(), type=job_type, status="finished", data_size=data_size,
+        created_at=T0, claimed_at=T0, finished_at=T0 + datetime.timedelta(seconds=seconds),
+    )
+
+
+def test_predictor_learns_size_dependency() -> None:
+    predictor = DurationPredictor()
+    for size in (1 << 10, 1 << 14, 1 << 18, 1 << 22):
+        predictor.observe(finished_job("transcode", size, size / 1e5))
+    predictor.observe(finished_job("passthru", 10, 0.05))
+
+    expected = pytest.approx((1 << 20) / 1e5, rel=0.05)
+    assert predictor.processing_time("transcode", 1 << 20) == expected
+    assert predictor.processing_time("transcode", 3 << 30) > 10000
+    # too few passthru samples: falls back to the model across all types
+    assert predictor.processing_time("passthru", 10) != pytest.approx(0.05)
+    assert predictor.queue_wait("transcode") == pytest.approx(1e-3)
+
+
+def serve_job(fake_api, clock, job_id, claimed_at, duration, data_size):
+    def handler(_):
+        status = "finished" if clock() >= claimed_at + duration else "processing"
+        data = {
+            "id": str(job_id), "type": "transcode", "status": status, "data_size": data_size,
+            "created_at": T0.isoformat(),
+            "claimed_at": datetime.datetime.fromtimestamp(
+                claimed_at, datetime.timezone.utc
+            ).isoformat(),
+        }
+        if status == "finished":
+            data["finished_at"] = datetime.datetime.fromtimestamp(
+                claimed_at + duration, datetime.timezone.utc
+            ).isoformat()
+        return 200, {}, json.dumps({"success": True, "data": data})
+
+    fake_api.route("GET", "/v1/jobs/%s" % job_id, handler)
+
+
+def test_waiter_schedules_first_poll_at_prediction(fake_api) -> None:
+    clock = FakeClock(T0.timestamp())
+    predictor = DurationPredictor()
+    for _ in range(5):
+        predictor.observe(finished_job("transcode", 1 << 30, 600.0))
+    job_id = uuid4()
+    serve_job(fake_api, clock, job_id, T0.timestamp(), 600.0, 1 << 30)
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        waiter = JobWaiter(JobsApi(client), predictor, clock=clock, sleep=clock.sleep)
+        job = waiter.wait(job_id)
+
+    assert job.status == "finished"
+    # one poll to learn the job, one at the predicted completion
+    assert waiter.polls == 2
+    assert clock.now - T0.timestamp() == pytest.approx(600.0)
+
+
+def test_waiter_without_predictor_backs_off_and_times_out(fake_api) -> None:
+    clock = FakeClock(T0.timestamp())
+    job_id = uuid4()
+    serve_job(fake_api, clock, job_id, T0.timestamp(), 600.0, 1 << 30)
+
+    with ApiClient(Configuration(host=fake_api.host)) as client:
+        waiter = JobWaiter(JobsApi(client), clock=clock, sleep=clock.sleep, max_interval=30.0)
+        with pytest.raises(TimeoutError):
+            waiter.wait(job_id, timeout=60.0)
+
+    # t = 0, then intervals of 0.5s growing by 1.5x up to t = 56.6s
+    assert waiter.polls == 11
+    assert clock.now - T0.timestamp() == pytest.approx(60.0)